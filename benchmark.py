@@ -0,0 +1,370 @@
+"""
+Benchmark senza display né camera.
+
+Misura le parti del gioco che incidono sul frame time: rilevamento mani,
+riconoscimento e smoothing del gesto, rendering di ogni schermata e
+operazioni sulla classifica. Usa il driver video "dummy" di SDL e frame
+sintetici oppure registrati (video o .npz, vedi gesture/frame_source.py).
+
+Uso:
+    python benchmark.py                       # frame sintetici
+    python benchmark.py --frames sessione.npz # frame registrati
+    python benchmark.py --save-baseline       # salva i risultati come riferimento
+
+Se esiste il file di baseline, ogni misura viene confrontata con quella
+salvata e il comando termina con codice 1 se il p50 peggiora oltre la
+tolleranza.
+"""
+
+import os
+
+# Nessuna finestra né audio: va impostato prima di importare pygame
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pygame
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, CAMERA_WIDTH, CAMERA_HEIGHT
+from gesture.hand_detector import HandDetector, NUM_LANDMARKS
+from gesture.frame_source import FileFrameSource
+from game.game_logic import GameLogic, Move
+from game.game_state import GameState, StateManager
+from game.highscore import HighScoreManager
+from game.highscore_db import SQLiteHighScoreManager
+from ui.renderer import Renderer
+from ui.screens import ScreenManager
+from ui.profiler import summarize
+
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+MIN_REGRESSION_MS = 0.01  # Sotto questa differenza assoluta il rumore di misura prevale
+
+# Dati di stato plausibili per le schermate che li leggono
+STATE_DATA = {
+    GameState.COUNTDOWN: {'duration': 3.0, 'player_move': 'rock'},
+    GameState.TIMED_CPU_MOVE: {'duration': 2.0, 'cpu_move': 'paper'},
+    GameState.TIMED_PLAYER_TURN: {'duration': 4.0, 'cpu_move': 'paper', 'player_move': 'scissors'},
+    GameState.SHOWING_RESULT: {'duration': 2.5, 'player_move': 'rock',
+                               'cpu_move': 'scissors', 'result': 'player'},
+}
+
+
+# =========================================================================
+# DATI SINTETICI
+# =========================================================================
+
+def synthetic_frames(count: int, width: int = CAMERA_WIDTH, height: int = CAMERA_HEIGHT,
+                     seed: int = 0) -> List[np.ndarray]:
+    """
+    Genera frame BGR con rumore e una sagoma color pelle in movimento.
+
+    Args:
+        count: Numero di frame
+        width: Larghezza in pixel
+        height: Altezza in pixel
+        seed: Seme per frame ripetibili
+    """
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    frames = []
+    for i in range(count):
+        frame = rng.integers(20, 60, size=(height, width, 3), dtype=np.uint8)
+        cx = width * (0.35 + 0.3 * np.sin(i / 15.0))
+        cy = height * 0.55
+        mask = ((xx - cx) / (width * 0.12)) ** 2 + ((yy - cy) / (height * 0.22)) ** 2 <= 1.0
+        frame[mask] = (120, 160, 210)  # BGR, tono pelle
+        frames.append(frame)
+    return frames
+
+
+def synthetic_hand(extended: tuple, seed: int = 0) -> np.ndarray:
+    """
+    Costruisce 21 landmark normalizzati per una mano con le dita indicate estese.
+
+    Args:
+        extended: Cinque booleani (pollice, indice, medio, anulare, mignolo)
+        seed: Seme del piccolo rumore aggiunto ai punti
+
+    Returns:
+        Array (21, 3) float32 come quelli prodotti da find_hands
+    """
+    rng = np.random.default_rng(seed)
+    points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    wrist = np.array([0.5, 0.8])
+    points[0, :2] = wrist
+    angles = np.radians([-60, -25, -5, 15, 35])  # Direzione di ogni dito dalla verticale
+    for finger, (angle, is_extended) in enumerate(zip(angles, extended)):
+        direction = np.array([np.sin(angle), -np.cos(angle)])
+        # Distanze dal polso di MCP, PIP, DIP e punta
+        reach = (0.12, 0.2, 0.26, 0.32) if is_extended else (0.12, 0.16, 0.13, 0.1)
+        for joint, distance in enumerate(reach):
+            points[1 + finger * 4 + joint, :2] = wrist + direction * distance
+    points[:, :2] += rng.normal(0.0, 0.003, size=(NUM_LANDMARKS, 2))
+    return points
+
+
+def synthetic_hands(count: int) -> List[np.ndarray]:
+    """Alterna le pose di sasso, carta, forbice e indice puntato."""
+    poses = [
+        (False, False, False, False, False),  # Sasso
+        (True, True, True, True, True),       # Carta
+        (False, True, True, False, False),    # Forbice
+        (False, True, False, False, False),   # Indice
+    ]
+    return [synthetic_hand(poses[i % len(poses)], seed=i) for i in range(count)]
+
+
+def load_frames(path: str, count: int) -> List[np.ndarray]:
+    """Legge fino a count frame da un video o da un .npz registrato."""
+    source = FileFrameSource(path, realtime=False, loop=True)
+    frames = []
+    try:
+        while len(frames) < count:
+            ok, frame = source.read(flip=False)
+            if not ok or frame is None:
+                break
+            frames.append(frame.copy())
+    finally:
+        source.release()
+    if not frames:
+        raise RuntimeError(f"Nessun frame letto da {path}")
+    return frames
+
+
+# =========================================================================
+# MISURE
+# =========================================================================
+
+class Benchmark:
+    """Esegue le misure e raccoglie le statistiche per nome."""
+
+    def __init__(self, iterations: int, warmup: int = 5):
+        """
+        Args:
+            iterations: Ripetizioni misurate per ogni operazione
+            warmup: Ripetizioni iniziali escluse (cache, allocazioni)
+        """
+        self.iterations = iterations
+        self.warmup = warmup
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def measure(self, name: str, func: Callable[[int], object],
+                iterations: Optional[int] = None):
+        """
+        Misura func(i) per ogni iterazione i.
+
+        Args:
+            name: Nome della misura nel report
+            func: Operazione da misurare, riceve l'indice dell'iterazione
+            iterations: Ripetizioni (default: quelle del benchmark)
+        """
+        iterations = iterations or self.iterations
+        for i in range(self.warmup):
+            func(i)
+
+        durations = np.empty(iterations, dtype=np.float64)
+        for i in range(iterations):
+            start = time.perf_counter()
+            func(i)
+            durations[i] = time.perf_counter() - start
+
+        stats = summarize(durations)
+        stats['throughput'] = iterations / durations.sum() if durations.sum() > 0 else 0.0
+        self.results[name] = stats
+        print(f"  {name:<36} {stats['p50']:8.3f} {stats['p95']:8.3f} {stats['p99']:8.3f}"
+              f" {stats['throughput']:10.1f}")
+
+
+def bench_gesture(bench: Benchmark, frames: List[np.ndarray]):
+    """Rilevamento mani, riconoscimento e smoothing del gesto."""
+    detector = HandDetector(max_hands=1, detection_confidence=0.7, tracking_confidence=0.7)
+    try:
+        if detector.is_ready():
+            bench.measure('find_hands',
+                          lambda i: detector.find_hands(frames[i % len(frames)], draw=False))
+            bench.measure('find_hands_draw',
+                          lambda i: detector.find_hands(frames[i % len(frames)].copy(), draw=True))
+        else:
+            print(f"  find_hands saltato: modello non disponibile ({detector.load_error})")
+
+        hands = synthetic_hands(64)
+        shape = frames[0].shape
+        bench.measure('recognize_gesture',
+                      lambda i: detector.recognize_gesture(hands[i % len(hands)], shape))
+        bench.measure('recognize_gestures_batch[64]',
+                      lambda i: detector.recognize_gestures_batch(np.stack(hands)))
+
+        gestures = ['rock'] * 6 + ['none', 'rock', 'paper', 'paper', 'paper', 'scissors']
+        bench.measure('apply_temporal_smoothing',
+                      lambda i: detector._apply_temporal_smoothing(
+                          gestures[i % len(gestures)], 0.9))
+    finally:
+        detector.release()
+
+
+def bench_screens(bench: Benchmark, frames: List[np.ndarray], highscore: HighScoreManager):
+    """Rendering di ogni schermata con lo ScreenManager a schermo intero."""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    renderer = Renderer(screen)
+    state = StateManager()
+    game = GameLogic()
+    for move in (Move.ROCK, Move.PAPER, Move.SCISSORS):
+        game.play_round(move)
+    manager = ScreenManager(renderer, state, game, highscore)
+    manager.retained = False
+
+    for game_state in GameState:
+        state.change_state(game_state, **STATE_DATA.get(game_state, {}))
+
+        def render(i, game_state=game_state):
+            manager.update(1 / 60)
+            manager.render(game_state, frames[i % len(frames)], 'rock', (i % 60) / 60)
+
+        bench.measure(f'render.{game_state.name}', render)
+
+    manager.retained = True
+    for game_state in (GameState.MENU, GameState.HIGHSCORE, GameState.SETTINGS):
+        state.change_state(game_state)
+
+        def render_retained(i, game_state=game_state):
+            manager.update(1 / 60)
+            manager.render(game_state, frames[i % len(frames)], 'none', 0.0)
+
+        bench.measure(f'render_retained.{game_state.name}', render_retained)
+
+
+def bench_highscore(bench: Benchmark, manager, prefix: str = 'highscore'):
+    """Operazioni sulla classifica (JSON o SQLite) su un file temporaneo."""
+    rng = np.random.default_rng(1)
+    modes = [('classic', None), ('timed', 'easy'), ('timed', 'medium'), ('timed', 'hard')]
+
+    def add(i):
+        mode, difficulty = modes[i % len(modes)]
+        manager.add_score(f"P{i % 1000}", int(rng.integers(0, 50)),
+                          {'wins': 3}, game_mode=mode, difficulty=difficulty)
+
+    bench.measure(f'{prefix}.add_score', add)
+    bench.measure(f'{prefix}.get_scores', lambda i: manager.get_scores(limit=10))
+    bench.measure(f'{prefix}.get_scores_filtered',
+                  lambda i: manager.get_scores(limit=10, mode='timed', difficulty='medium'))
+    bench.measure(f'{prefix}.get_scores_by_mode', lambda i: manager.get_scores_by_mode())
+    bench.measure(f'{prefix}.get_view', lambda i: manager.get_view('timed_medium'))
+    bench.measure(f'{prefix}.count_scores', lambda i: manager.count_scores('all'))
+    # Pagine in sequenza come nella schermata classifica (ricomincia dalla prima a fine elenco)
+    pages = max(1, (manager.count_scores('all') + 7) // 8)
+    bench.measure(f'{prefix}.get_page', lambda i: manager.get_page('all', (i % pages) * 8, 8))
+    bench.measure(f'{prefix}.is_high_score', lambda i: manager.is_high_score(i % 50))
+    bench.measure(f'{prefix}.get_rank', lambda i: manager.get_rank(i % 50))
+    bench.measure(f'{prefix}.get_stats', lambda i: manager.get_stats())
+    bench.measure(f'{prefix}.save', lambda i: manager.save())
+    bench.measure(f'{prefix}.load', lambda i: manager.load())
+
+
+# =========================================================================
+# BASELINE
+# =========================================================================
+
+def compare_with_baseline(results: Dict[str, Dict[str, float]], baseline: Dict,
+                          tolerance: float) -> List[str]:
+    """
+    Confronta i p50 con quelli della baseline.
+
+    Returns:
+        Nomi delle misure peggiorate oltre la tolleranza
+    """
+    reference = baseline.get('results', {})
+    regressions = []
+    print()
+    print(f"  {'confronto con baseline':<36} {'base':>8} {'ora':>8} {'delta':>8}")
+    for name, stats in results.items():
+        if name not in reference or reference[name]['p50'] <= 0:
+            continue
+        before = reference[name]['p50']
+        change = stats['p50'] / before - 1.0
+        flag = ''
+        if change > tolerance and stats['p50'] - before > MIN_REGRESSION_MS:
+            flag = '  << REGRESSIONE'
+            regressions.append(name)
+        print(f"  {name:<36} {before:8.3f} {stats['p50']:8.3f} {change:+8.0%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    """Esegue il benchmark e restituisce il codice di uscita."""
+    parser = argparse.ArgumentParser(description="Benchmark headless di Morra Cinese")
+    parser.add_argument('--frames', help="Video o .npz registrato (default: frame sintetici)")
+    parser.add_argument('--iterations', type=int, default=200, help="Ripetizioni per misura")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="File JSON di riferimento")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Salva i risultati come nuova baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Peggioramento del p50 tollerato (0.2 = +20%%)")
+    parser.add_argument('--output', help="Salva i risultati anche in questo file JSON")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    if args.frames:
+        frames = load_frames(args.frames, 120)
+        print(f"Frame registrati: {len(frames)} da {args.frames}")
+    else:
+        frames = synthetic_frames(120)
+        print(f"Frame sintetici: {len(frames)}")
+
+    bench = Benchmark(args.iterations)
+    print(f"  {'misura':<36} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'op/s':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        highscore = HighScoreManager(os.path.join(directory, 'highscores.json'), max_entries=100)
+        bench_highscore(bench, highscore)
+        database = SQLiteHighScoreManager(os.path.join(directory, 'highscores.db'), max_entries=10)
+        bench_highscore(bench, database, 'highscore_sqlite')
+        database.release()
+
+        bench_gesture(bench, frames)
+        bench_screens(bench, frames, highscore)
+
+    pygame.quit()
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'frames': args.frames or 'synthetic',
+        'iterations': args.iterations,
+        'results': bench.results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline salvata in {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(bench.results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} misure peggiorate oltre il {args.tolerance:.0%}")
+            return 1
+    else:
+        print(f"\nNessuna baseline in {args.baseline} (crearla con --save-baseline)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
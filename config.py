@@ -9,6 +9,10 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 FULLSCREEN = False
+TEXT_CACHE_SIZE = 256  # Superfici di testo pre-renderizzate conservate in cache (LRU)
+GLOW_CACHE_SIZE = 256  # Sprite di bagliore (glow/alone) conservati in cache (LRU)
+PARTICLE_CAPACITY = 4096  # Particelle attive al massimo (le emissioni oltre il limite vengono scartate)
+RETAINED_RENDERING = False  # Ridisegna solo le zone animate di menu, classifica, impostazioni ed errore camera
 
 # =====================
 # CONFIGURAZIONE CAMERA
@@ -17,6 +21,16 @@ CAMERA_INDEX = 0  # Indice della webcam (0 = default)
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 CAMERA_FLIP = True  # Specchia l'immagine orizzontalmente
+CAMERA_THREADED = False  # Acquisisce i frame in un thread dedicato (consigliato su Raspberry Pi)
+PIPELINED_LOOP = False  # Acquisizione e inferenza in thread separati: il rendering non attende mai il modello
+CAMERA_HOTPLUG = True  # Su Linux osserva /dev/video* invece di riaprire periodicamente le camera
+CAMERA_HOTPLUG_FALLBACK_INTERVAL = 30.0  # Ricerca di sicurezza (s) quando l'hotplug è attivo
+
+# Riproduzione/registrazione (test e benchmark senza webcam)
+CAMERA_REPLAY_FILE = None  # Video o .npz da usare al posto della camera (None = camera dal vivo)
+CAMERA_REPLAY_REALTIME = True  # False = frame alla massima velocità
+CAMERA_REPLAY_LOOP = True  # Ricomincia a fine file
+CAMERA_RECORD_FILE = None  # Registra la camera in un video o .npz (None = disattivato)
 
 # =====================
 # CONFIGURAZIONE GIOCO
@@ -32,6 +46,10 @@ COUNTDOWN_TIME = 3  # Secondi di countdown prima della mossa
 GESTURE_DETECTION = {
     'min_detection_confidence': 0.7,  # Soglia minima per rilevare la mano
     'min_tracking_confidence': 0.7,   # Soglia minima per tracking continuo
+    'inference_backend': 'inline',     # 'inline' (thread principale) o 'process' (worker separato)
+    'roi_tracking': False,             # Elabora solo il riquadro attorno alla mano già trovata
+    'roi_padding': 0.35,               # Margine del riquadro (frazione del lato della mano)
+    'roi_refresh_frames': 30,          # Frame tra un rilevamento completo e il successivo
     'temporal_smoothing_frames': 5,    # Numero di frame per smoothing temporale
     
     # Parametri FORBICI
@@ -44,6 +62,21 @@ GESTURE_DETECTION = {
     'wrist_distance_ratio': 1.3,       # Ratio distanza punta-polso vs base-polso
 }
 
+# Frequenza di inferenza (Hz) per stato del gioco:
+# None = ogni frame, 0 = sospesa, altrimenti inferenze al secondo
+INFERENCE_RATES = {
+    'PLAYING': None,
+    'COUNTDOWN': None,
+    'TIMED_PLAYER_TURN': None,
+    'TIMED_CPU_MOVE': 10,   # Mantiene il tracking pronto per il turno del giocatore
+    'SHOWING_RESULT': 0,
+    'GAME_OVER': 0,
+    'ENTER_NAME': 0,
+    'PAUSED': 0,
+    'CAMERA_ERROR': 0,
+}
+INFERENCE_IDLE_RATE = 5  # Stati non elencati (menu, classifica, impostazioni)
+
 # =====================
 # MODALITÀ A TEMPO
 # =====================
@@ -234,6 +267,13 @@ SFX_VOLUME = 0.5
 # =====================
 HIGHSCORE_FILE = 'highscores.json'
 MAX_HIGHSCORES = 10
+HIGHSCORE_PAGE_SIZE = 8  # Righe per pagina nella schermata classifica (↑↓ per sfogliare)
+HIGHSCORE_ASYNC_SAVE = True  # Salva il file JSON da un thread dedicato (nessun blocco del frame)
+HIGHSCORE_BACKEND = 'json'  # 'json' (file unico) oppure 'sqlite' (una classifica per modalità)
+HIGHSCORE_DB_FILE = 'highscores.db'  # Database del backend 'sqlite' (importa HIGHSCORE_FILE al primo avvio)
+HIGHSCORE_DB_CAPACITY = 5000  # Punteggi conservati per classifica (modalità + difficoltà) con 'sqlite'
+GAME_JOURNAL_FILE = 'games.jsonl'  # Registro di tutte le partite concluse (una riga per partita)
+GAME_JOURNAL_SNAPSHOT_EVERY = 10  # Partite tra due salvataggi delle statistiche aggregate
 
 # =====================
 # DEBUG
@@ -241,6 +281,9 @@ MAX_HIGHSCORES = 10
 DEBUG_MODE = False
 SHOW_FPS = True
 SHOW_HAND_LANDMARKS = True
+PROFILER_ENABLED = False  # Misura la durata di ogni fase del game loop (F3 mostra p50/p95/p99)
+PROFILER_HISTORY = 600  # Campioni conservati per fase (buffer circolare)
+PROFILER_DUMP_FILE = 'profile.json'  # Salvato in uscita: .json o .csv ('' = nessun file)
 
 # =====================
 # IMPOSTAZIONI RUNTIME (modificabili in-game)
@@ -275,6 +318,12 @@ class GameSettings:
         """Restituisce il tempo di risposta del giocatore per la difficoltà corrente."""
         return PLAYER_RESPONSE_TIMES.get(self.timed_difficulty, 4.0)
     
+    def get_highscore_board(self) -> tuple:
+        """Restituisce (modalità, difficoltà) della classifica della partita corrente."""
+        if self.game_mode == GameMode.TIMED:
+            return 'timed', self.timed_difficulty.value
+        return 'classic', None
+    
     def get_camera_name(self) -> str:
         """Restituisce il nome della camera attualmente selezionata."""
         for idx, name in self.available_cameras:
@@ -3,7 +3,8 @@ Logica del gioco Morra Cinese
 """
 
 import random
-from typing import Tuple, Optional
+import time
+from typing import Tuple, Optional, List
 from enum import Enum
 
 class Move(Enum):
@@ -80,6 +81,15 @@ class GameLogic:
         self.cpu_score = 0
         self.round_count = 0
         self.history = []  # Lista di (player_move, cpu_move, result)
+        self.round_times: List[float] = []  # Secondi dall'inizio della partita alla fine di ogni round
+        self.start_time = time.time()
+        
+        # Statistiche aggiornate a ogni round (get_stats non scorre la storia)
+        self.player_wins = 0
+        self.cpu_wins = 0
+        self.draws = 0
+        self.win_streak = 0
+        self.best_streak = 0
     
     def get_cpu_move(self) -> Move:
         """
@@ -118,17 +128,35 @@ class GameLogic:
         """
         cpu_move = self.get_cpu_move()
         result = self.determine_winner(player_move, cpu_move)
+        self.record_round(player_move, cpu_move, result)
         
-        # Aggiorna i punteggi
+        return cpu_move, result
+    
+    def record_round(self, player_move: Optional[Move], cpu_move: Move, result: RoundResult):
+        """
+        Registra un round già deciso, aggiornando punteggi e statistiche.
+        
+        Args:
+            player_move: Mossa del giocatore (None se il tempo è scaduto)
+            cpu_move: Mossa della CPU
+            result: Risultato del round
+        """
         if result == RoundResult.PLAYER_WIN:
             self.player_score += 1
-        elif result == RoundResult.CPU_WIN:
-            self.cpu_score += 1
+            self.player_wins += 1
+            self.win_streak += 1
+            self.best_streak = max(self.best_streak, self.win_streak)
+        else:
+            if result == RoundResult.CPU_WIN:
+                self.cpu_score += 1
+                self.cpu_wins += 1
+            else:
+                self.draws += 1
+            self.win_streak = 0
         
         self.round_count += 1
         self.history.append((player_move, cpu_move, result))
-        
-        return cpu_move, result
+        self.round_times.append(time.time() - self.start_time)
     
     def is_game_over(self) -> bool:
         """
@@ -161,13 +189,7 @@ class GameLogic:
         Returns:
             Numero di vittorie consecutive
         """
-        streak = 0
-        for _, _, result in reversed(self.history):
-            if result == RoundResult.PLAYER_WIN:
-                streak += 1
-            else:
-                break
-        return streak
+        return self.win_streak
     
     def get_stats(self) -> dict:
         """
@@ -176,23 +198,11 @@ class GameLogic:
         Returns:
             Dizionario con le statistiche
         """
-        if not self.history:
-            return {
-                'rounds_played': 0,
-                'player_wins': 0,
-                'cpu_wins': 0,
-                'draws': 0,
-                'win_rate': 0.0
-            }
-        
-        player_wins = sum(1 for _, _, r in self.history if r == RoundResult.PLAYER_WIN)
-        cpu_wins = sum(1 for _, _, r in self.history if r == RoundResult.CPU_WIN)
-        draws = sum(1 for _, _, r in self.history if r == RoundResult.DRAW)
-        
+        rounds = len(self.history)
         return {
-            'rounds_played': len(self.history),
-            'player_wins': player_wins,
-            'cpu_wins': cpu_wins,
-            'draws': draws,
-            'win_rate': player_wins / len(self.history) if self.history else 0.0
+            'rounds_played': rounds,
+            'player_wins': self.player_wins,
+            'cpu_wins': self.cpu_wins,
+            'draws': self.draws,
+            'win_rate': self.player_wins / rounds if rounds else 0.0
         }
@@ -4,26 +4,80 @@ Sistema di gestione della classifica (High Score)
 
 import json
 import os
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+from game.persistence import BackgroundWriter, atomic_write, backup_path
+
+
+# Schede della schermata classifica: filtro -> (modalità, difficoltà)
+LEADERBOARD_FILTERS = {
+    'all': (None, None),
+    'classic': ('classic', None),
+    'timed_easy': ('timed', 'easy'),
+    'timed_medium': ('timed', 'medium'),
+    'timed_hard': ('timed', 'hard'),
+}
+
+
+def format_score_date(date_str: str) -> str:
+    """Formatta la data ISO di un punteggio per la tabella (gg/mm, '-' se assente)."""
+    if not date_str:
+        return "-"
+    try:
+        return datetime.fromisoformat(date_str).strftime("%d/%m")
+    except (TypeError, ValueError):
+        return "-"
+
+
+def build_view(scores: List[dict], first_rank: int = 1) -> List[dict]:
+    """
+    Prepara le righe della tabella classifica.
+    
+    Args:
+        scores: Punteggi già ordinati e filtrati
+        first_rank: Posizione in classifica della prima riga
+        
+    Returns:
+        Righe con posizione, nome, punteggio e data già formattata ('date_display')
+    """
+    return [
+        {
+            'rank': first_rank + i,
+            'name': s.get('name', '???'),
+            'score': s.get('score', 0),
+            'date_display': format_score_date(s.get('date', '')),
+        }
+        for i, s in enumerate(scores)
+    ]
+
 
 class HighScoreManager:
     """
     Gestisce il salvataggio e caricamento dei punteggi.
     """
     
-    def __init__(self, filename: str = 'highscores.json', max_entries: int = 10):
+    # Conserva solo le voci mostrate: si registrano solo i punteggi da record
+    records_all_games = False
+    
+    def __init__(self, filename: str = 'highscores.json', max_entries: int = 10,
+                 async_save: bool = False):
         """
         Inizializza il gestore dei punteggi.
         
         Args:
             filename: Nome del file per salvare i punteggi
             max_entries: Numero massimo di voci nella classifica
+            async_save: Se True, i salvataggi vengono scritti da un thread
+                        dedicato (vedi flush() e release())
         """
         self.filename = filename
         self.max_entries = max_entries
         self.scores: List[dict] = []
+        self.revision = 0  # Incrementato a ogni modifica dei punteggi
+        self._views: Dict[str, List[dict]] = {}  # Righe pronte per la tabella, per filtro
+        self._indexes: Dict[str, List[dict]] = {}  # Punteggi ordinati di ogni filtro (per le pagine)
+        self.writer = BackgroundWriter() if async_save else None
         self.load()
     
     def load(self) -> bool:
@@ -33,33 +87,79 @@ class HighScoreManager:
         Returns:
             True se il caricamento e' riuscito
         """
-        try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        self.revision += 1
+        self._invalidate_views()
+        if self.writer is not None:
+            self.writer.flush()
+        
+        # Se il file è danneggiato (o manca a metà di un salvataggio) si riparte dal .bak
+        for path in (self.filename, backup_path(self.filename)):
+            try:
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                     self.scores = data.get('scores', [])
-                return True
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Errore caricamento classifica: {e}")
+                    if path != self.filename:
+                        print(f"Classifica recuperata dalla copia di sicurezza {path}")
+                        self._set_aside_damaged_file()
+                    return True
+            except (json.JSONDecodeError, IOError, AttributeError) as e:
+                print(f"Errore caricamento classifica ({path}): {e}")
         
         self.scores = []
         return False
     
+    def _set_aside_damaged_file(self):
+        """
+        Sposta il file danneggiato in .corrupt.
+        
+        Altrimenti il prossimo salvataggio lo ruoterebbe in .bak al posto
+        della copia buona appena recuperata.
+        """
+        if os.path.exists(self.filename):
+            try:
+                os.replace(self.filename, self.filename + '.corrupt')
+            except OSError as e:
+                print(f"Errore spostamento classifica danneggiata: {e}")
+    
     def save(self) -> bool:
         """
         Salva i punteggi su file.
         
+        Il file viene sostituito in modo atomico e la versione precedente
+        resta in .bak. Con async_save la scrittura è solo accodata.
+        
         Returns:
-            True se il salvataggio e' riuscito
+            True se il salvataggio e' riuscito (o è stato accodato)
         """
+        # Copia della lista: le voci non vengono mai modificate dopo l'inserimento
+        scores = list(self.scores)
+        
+        def serialize() -> bytes:
+            return json.dumps({'scores': scores}, indent=2, ensure_ascii=False).encode('utf-8')
+        
+        if self.writer is not None:
+            self.writer.submit(self.filename, serialize)
+            return True
+        
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump({'scores': self.scores}, f, indent=2, ensure_ascii=False)
+            atomic_write(self.filename, serialize())
             return True
-        except IOError as e:
+        except OSError as e:
             print(f"Errore salvataggio classifica: {e}")
             return False
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attende che i salvataggi accodati siano su disco.
+        
+        Returns:
+            True se non restano scritture in sospeso
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+    
     def add_score(self, name: str, score: int, stats: Optional[dict] = None, game_mode: str = 'classic', difficulty: str = None) -> int:
         """
         Aggiunge un nuovo punteggio alla classifica.
@@ -98,6 +198,8 @@ class HighScoreManager:
             self.scores.insert(position, entry)
             # Limita a max_entries
             self.scores = self.scores[:self.max_entries]
+            self.revision += 1
+            self._invalidate_views()
             self.save()
             return position + 1  # 1-indexed
         
@@ -129,6 +231,66 @@ class HighScoreManager:
             return filtered_scores[:limit]
         return filtered_scores
     
+    def _invalidate_views(self):
+        """Scarta viste e indici dei filtri dopo una modifica dei punteggi."""
+        self._views.clear()
+        self._indexes.clear()
+    
+    def _get_index(self, filter_id: str) -> List[dict]:
+        """Punteggi ordinati di un filtro, calcolati una volta per revisione."""
+        index = self._indexes.get(filter_id)
+        if index is None:
+            mode, difficulty = LEADERBOARD_FILTERS.get(filter_id, (None, None))
+            index = self.get_scores(mode=mode, difficulty=difficulty)
+            self._indexes[filter_id] = index
+        return index
+    
+    def get_view(self, filter_id: str) -> List[dict]:
+        """
+        Restituisce le righe della tabella per una scheda della classifica.
+        
+        Le righe vengono preparate alla prima richiesta e riusate finché
+        add_score(), clear() o load() non cambiano i punteggi.
+        
+        Args:
+            filter_id: Chiave di LEADERBOARD_FILTERS (sconosciuta = 'all')
+            
+        Returns:
+            Righe con 'rank', 'name', 'score' e 'date_display' (da non modificare)
+        """
+        view = self._views.get(filter_id)
+        if view is None:
+            view = self.get_page(filter_id, 0, self.max_entries)
+            self._views[filter_id] = view
+        return view
+    
+    def get_page(self, filter_id: str, offset: int, limit: int) -> List[dict]:
+        """
+        Restituisce una pagina della classifica di una scheda.
+        
+        Il costo dipende solo da limit: l'elenco ordinato del filtro resta
+        in memoria fino alla prossima modifica dei punteggi.
+        
+        Args:
+            filter_id: Chiave di LEADERBOARD_FILTERS (sconosciuta = 'all')
+            offset: Indice della prima voce (0 = primo classificato)
+            limit: Numero massimo di voci
+            
+        Returns:
+            Righe come get_view(), con 'rank' relativo all'intera classifica
+        """
+        index = self._get_index(filter_id)
+        return build_view(index[offset:offset + limit], first_rank=offset + 1)
+    
+    def count_scores(self, filter_id: str) -> int:
+        """
+        Restituisce il numero di voci di una scheda della classifica.
+        
+        Args:
+            filter_id: Chiave di LEADERBOARD_FILTERS (sconosciuta = 'all')
+        """
+        return len(self._get_index(filter_id))
+    
     def get_scores_by_mode(self) -> dict:
         """
         Restituisce i punteggi raggruppati per modalità.
@@ -171,12 +333,17 @@ class HighScoreManager:
         """
         return [(s['name'], s['score']) for s in self.scores[:count]]
     
-    def is_high_score(self, score: int) -> bool:
+    def is_high_score(self, score: int, mode: str = 'classic', difficulty: Optional[str] = None) -> bool:
         """
         Verifica se un punteggio entra in classifica.
         
+        La classifica JSON è unica per tutte le modalità: mode e difficulty
+        sono accettati per compatibilità con SQLiteHighScoreManager.
+        
         Args:
             score: Punteggio da verificare
+            mode: Modalità della partita
+            difficulty: Difficoltà della partita
             
         Returns:
             True se il punteggio e' abbastanza alto per la classifica
@@ -185,12 +352,14 @@ class HighScoreManager:
             return True
         return score > self.scores[-1]['score']
     
-    def get_rank(self, score: int) -> int:
+    def get_rank(self, score: int, mode: str = 'classic', difficulty: Optional[str] = None) -> int:
         """
         Calcola la posizione che avrebbe un punteggio in classifica.
         
         Args:
             score: Punteggio da verificare
+            mode: Modalità della partita (ignorata, classifica unica)
+            difficulty: Difficoltà della partita (ignorata, classifica unica)
             
         Returns:
             Posizione (1-indexed) o -1 se non entrerebbe
@@ -207,6 +376,8 @@ class HighScoreManager:
     def clear(self):
         """Cancella tutti i punteggi."""
         self.scores = []
+        self.revision += 1
+        self._invalidate_views()
         self.save()
     
     def get_stats(self) -> dict:
@@ -230,3 +401,9 @@ class HighScoreManager:
             'average_score': sum(s['score'] for s in self.scores) / len(self.scores),
             'unique_players': len(set(s['name'] for s in self.scores))
         }
+    
+    def release(self):
+        """Scrive i salvataggi in sospeso e ferma il thread di scrittura."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -0,0 +1,440 @@
+"""
+Classifica su database SQLite.
+
+Alternativa a HighScoreManager (stessa interfaccia) pensata per le postazioni
+che accumulano migliaia di partite: ogni classifica (modalità + difficoltà)
+ha la propria capacità, le query "migliori k" usano un indice ordinato per
+punteggio e un nuovo punteggio è un singolo INSERT invece della riscrittura
+dell'intero file.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Dict, List, Tuple, Optional
+from datetime import datetime
+
+from game.highscore import LEADERBOARD_FILTERS, build_view
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    stats TEXT NOT NULL DEFAULT '{}',
+    mode TEXT NOT NULL DEFAULT 'classic',
+    difficulty TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scores_board
+    ON scores (mode, difficulty, score DESC, id);
+CREATE INDEX IF NOT EXISTS idx_scores_score
+    ON scores (score DESC, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Ordine di classifica: a parità di punteggio resta davanti chi è arrivato prima
+ORDER = "ORDER BY score DESC, id ASC"
+
+
+class SQLiteHighScoreManager:
+    """
+    Gestisce la classifica su un database SQLite.
+
+    max_entries indica quante voci mostra ogni classifica (e quindi cosa
+    conta come "record"), capacity quante ne conserva il database per ogni
+    coppia modalità/difficoltà: ogni partita conclusa viene registrata, e la
+    schermata classifica le sfoglia a pagine.
+    """
+
+    # Il gioco registra ogni partita, non solo quelle da record
+    records_all_games = True
+
+    def __init__(self, filename: str = 'highscores.db', max_entries: int = 10,
+                 capacity: int = 5000, import_json: Optional[str] = None):
+        """
+        Apre (o crea) il database dei punteggi.
+
+        Args:
+            filename: Percorso del database SQLite
+            max_entries: Voci mostrate per classifica
+            capacity: Voci conservate per classifica (modalità + difficoltà)
+            import_json: File JSON di HighScoreManager da importare alla prima apertura
+        """
+        self.filename = filename
+        self.max_entries = max_entries
+        self.capacity = capacity
+        self.revision = 0  # Incrementato a ogni modifica dei punteggi
+        self._views: Dict[str, List[dict]] = {}  # Righe pronte per la tabella, per filtro
+        self._counts: Dict[str, int] = {}  # Voci di ogni filtro
+        # Chiave (score, id) dell'ultima riga prima di una pagina: (filtro, offset) -> chiave
+        self._cursors: Dict[Tuple[str, int], Tuple[int, int]] = {}
+
+        self.conn = sqlite3.connect(filename)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        if import_json:
+            self.import_json(import_json)
+        self.load()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        """Converte una riga nel dizionario usato da HighScoreManager."""
+        return {
+            'name': row['name'],
+            'score': row['score'],
+            'date': row['date'],
+            'stats': json.loads(row['stats']) if row['stats'] else {},
+            'mode': row['mode'],
+            'difficulty': row['difficulty']
+        }
+
+    def _select(self, where: str = "", params: tuple = (), limit: Optional[int] = None) -> List[dict]:
+        query = f"SELECT * FROM scores {where} {ORDER}"
+        if limit:
+            query += " LIMIT ?"
+            params = params + (limit,)
+        return [self._to_dict(row) for row in self.conn.execute(query, params)]
+
+    def import_json(self, json_file: str) -> int:
+        """
+        Importa i punteggi da un file JSON di HighScoreManager (una sola volta).
+
+        Args:
+            json_file: Percorso del file JSON
+
+        Returns:
+            Numero di punteggi importati
+        """
+        key = f"imported:{os.path.abspath(json_file)}"
+        if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+            return 0
+        if not os.path.exists(json_file):
+            return 0
+
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                scores = json.load(f).get('scores', [])
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Errore importazione classifica JSON: {e}")
+            return 0
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO scores (name, score, date, stats, mode, difficulty) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (s.get('name', '?'), int(s.get('score', 0)),
+                     s.get('date') or datetime.now().isoformat(),
+                     json.dumps(s.get('stats') or {}, ensure_ascii=False),
+                     s.get('mode', 'classic'), s.get('difficulty'))
+                    for s in scores
+                ]
+            )
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)",
+                              (key, datetime.now().isoformat()))
+        print(f"Importati {len(scores)} punteggi da {json_file}")
+        return len(scores)
+
+    def load(self) -> bool:
+        """
+        Ricarica la classifica (i dati sono già nel database).
+
+        Returns:
+            True se il database è accessibile
+        """
+        self.revision += 1
+        self._invalidate_views()
+        try:
+            self.conn.execute("SELECT 1 FROM scores LIMIT 1")
+            return True
+        except sqlite3.Error as e:
+            print(f"Errore caricamento classifica: {e}")
+            return False
+
+    def save(self) -> bool:
+        """
+        Conferma le modifiche in sospeso.
+
+        Returns:
+            True se il salvataggio è riuscito
+        """
+        try:
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Errore salvataggio classifica: {e}")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Le scritture SQLite sono già sincrone: equivale a save()."""
+        return self.save()
+
+    def add_score(self, name: str, score: int, stats: Optional[dict] = None, game_mode: str = 'classic', difficulty: str = None) -> int:
+        """
+        Aggiunge un nuovo punteggio alla sua classifica.
+
+        Args:
+            name: Nome del giocatore (max 5 caratteri)
+            score: Punteggio ottenuto
+            stats: Statistiche aggiuntive opzionali
+            game_mode: Modalità di gioco ('classic' o 'timed')
+            difficulty: Difficoltà per modalità timed ('easy', 'medium', 'hard')
+
+        Returns:
+            Posizione nella classifica della modalità (1-indexed) o -1 se
+            oltre la capacità
+        """
+        name = name.upper()[:5]
+        board = (game_mode, difficulty)
+
+        try:
+            with self.conn:
+                cursor = self.conn.execute(
+                    "INSERT INTO scores (name, score, date, stats, mode, difficulty) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, score, datetime.now().isoformat(),
+                     json.dumps(stats or {}, ensure_ascii=False), game_mode, difficulty)
+                )
+                row_id = cursor.lastrowid
+
+                # Posizione: punteggi migliori + pari arrivati prima
+                position = self.conn.execute(
+                    "SELECT COUNT(*) FROM scores WHERE mode = ? AND difficulty IS ? "
+                    "AND (score > ? OR (score = ? AND id < ?))",
+                    board + (score, score, row_id)
+                ).fetchone()[0] + 1
+
+                # Capacità per classifica: elimina le voci in eccesso
+                self.conn.execute(
+                    "DELETE FROM scores WHERE id IN ("
+                    f"SELECT id FROM scores WHERE mode = ? AND difficulty IS ? {ORDER} "
+                    "LIMIT -1 OFFSET ?)",
+                    board + (self.capacity,)
+                )
+        except sqlite3.Error as e:
+            print(f"Errore salvataggio classifica: {e}")
+            return -1
+
+        if position > self.capacity:
+            return -1
+        self.revision += 1
+        self._invalidate_views()
+        return position
+
+    def get_scores(self, limit: Optional[int] = None, mode: Optional[str] = None, difficulty: Optional[str] = None) -> List[dict]:
+        """
+        Restituisce la lista dei punteggi filtrati per modalità e difficoltà.
+
+        Args:
+            limit: Numero massimo di voci da restituire
+            mode: Filtra per modalità ('classic' o 'timed'), None per tutte
+            difficulty: Filtra per difficoltà ('easy', 'medium', 'hard'), None per tutte
+
+        Returns:
+            Lista di dizionari con i punteggi
+        """
+        conditions, params = [], ()
+        if mode:
+            conditions.append("mode = ?")
+            params += (mode,)
+        if difficulty:
+            conditions.append("difficulty = ?")
+            params += (difficulty,)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self._select(where, params, limit)
+
+    def _invalidate_views(self):
+        """Scarta viste, conteggi e cursori dei filtri dopo una modifica dei punteggi."""
+        self._views.clear()
+        self._counts.clear()
+        self._cursors.clear()
+
+    @staticmethod
+    def _filter_conditions(filter_id: str) -> Tuple[List[str], tuple]:
+        """
+        Condizioni SQL di una scheda della classifica.
+
+        Le schede con una modalità corrispondono a una classifica precisa
+        (anche la classica, con difficoltà NULL), così la query segue
+        l'indice idx_scores_board senza ordinamenti temporanei.
+        """
+        mode, difficulty = LEADERBOARD_FILTERS.get(filter_id, (None, None))
+        if mode is None:
+            return [], ()
+        return ["mode = ?", "difficulty IS ?"], (mode, difficulty)
+
+    def _select_rows(self, conditions: List[str], params: tuple, limit: int, offset: int = 0) -> List[sqlite3.Row]:
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.conn.execute(f"SELECT * FROM scores {where} {ORDER} LIMIT ? OFFSET ?",
+                                 params + (limit, offset)).fetchall()
+
+    def get_view(self, filter_id: str) -> List[dict]:
+        """
+        Restituisce le righe della tabella per una scheda della classifica.
+
+        Le righe vengono lette dal database alla prima richiesta e riusate
+        finché add_score(), clear() o load() non cambiano i punteggi.
+
+        Args:
+            filter_id: Chiave di LEADERBOARD_FILTERS (sconosciuta = 'all')
+
+        Returns:
+            Righe con 'rank', 'name', 'score' e 'date_display' (da non modificare)
+        """
+        view = self._views.get(filter_id)
+        if view is None:
+            view = self.get_page(filter_id, 0, self.max_entries)
+            self._views[filter_id] = view
+        return view
+
+    def get_page(self, filter_id: str, offset: int, limit: int) -> List[dict]:
+        """
+        Restituisce una pagina della classifica di una scheda.
+
+        OFFSET in SQLite scorre tutte le righe saltate: quando la pagina
+        precedente è già stata letta si riparte invece dalla sua ultima riga
+        (paginazione per chiave sull'indice), così sfogliare costa solo le
+        righe della pagina.
+
+        Args:
+            filter_id: Chiave di LEADERBOARD_FILTERS (sconosciuta = 'all')
+            offset: Indice della prima voce (0 = primo classificato)
+            limit: Numero massimo di voci
+
+        Returns:
+            Righe come get_view(), con 'rank' relativo all'intera classifica
+        """
+        conditions, params = self._filter_conditions(filter_id)
+        cursor = self._cursors.get((filter_id, offset)) if offset else None
+        if cursor is None:
+            rows = self._select_rows(conditions, params, limit, offset)
+        else:
+            # Prima i pari merito successivi alla riga di riferimento, poi i punteggi
+            # inferiori: due ricerche per intervallo sull'indice, senza righe scartate
+            score, row_id = cursor
+            rows = self._select_rows(conditions + ["score = ?", "id > ?"], params + (score, row_id), limit)
+            if len(rows) < limit:
+                rows += self._select_rows(conditions + ["score < ?"], params + (score,), limit - len(rows))
+
+        if rows:
+            self._cursors[(filter_id, offset + len(rows))] = (rows[-1]['score'], rows[-1]['id'])
+        return build_view([self._to_dict(row) for row in rows], first_rank=offset + 1)
+
+    def count_scores(self, filter_id: str) -> int:
+        """
+        Restituisce il numero di voci di una scheda della classifica.
+
+        Args:
+            filter_id: Chiave di LEADERBOARD_FILTERS (sconosciuta = 'all')
+        """
+        count = self._counts.get(filter_id)
+        if count is None:
+            conditions, params = self._filter_conditions(filter_id)
+            where = "WHERE " + " AND ".join(conditions) if conditions else ""
+            count = self.conn.execute(f"SELECT COUNT(*) FROM scores {where}", params).fetchone()[0]
+            self._counts[filter_id] = count
+        return count
+
+    def get_scores_by_mode(self) -> dict:
+        """
+        Restituisce i punteggi raggruppati per modalità.
+
+        Returns:
+            Dizionario con chiavi 'classic' e 'timed' (suddiviso per difficoltà)
+        """
+        return {
+            'classic': self.get_scores(mode='classic'),
+            'timed': {
+                'easy': self.get_scores(mode='timed', difficulty='easy'),
+                'medium': self.get_scores(mode='timed', difficulty='medium'),
+                'hard': self.get_scores(mode='timed', difficulty='hard'),
+                'all': self.get_scores(mode='timed')
+            }
+        }
+
+    def get_top_scores(self, count: int = 5) -> List[Tuple[str, int]]:
+        """
+        Restituisce i migliori punteggi come tuple (nome, punteggio).
+
+        Args:
+            count: Numero di punteggi da restituire
+
+        Returns:
+            Lista di tuple (nome, punteggio)
+        """
+        rows = self.conn.execute(f"SELECT name, score FROM scores {ORDER} LIMIT ?", (count,))
+        return [(row['name'], row['score']) for row in rows]
+
+    def is_high_score(self, score: int, mode: str = 'classic', difficulty: Optional[str] = None) -> bool:
+        """
+        Verifica se un punteggio entra tra le voci mostrate della sua classifica.
+
+        Args:
+            score: Punteggio da verificare
+            mode: Modalità della classifica
+            difficulty: Difficoltà della classifica (None per la classica)
+
+        Returns:
+            True se il punteggio e' abbastanza alto per la classifica
+        """
+        rank = self.get_rank(score, mode, difficulty)
+        return 0 < rank <= self.max_entries
+
+    def get_rank(self, score: int, mode: str = 'classic', difficulty: Optional[str] = None) -> int:
+        """
+        Calcola la posizione che avrebbe un punteggio nella sua classifica.
+
+        Args:
+            score: Punteggio da verificare
+            mode: Modalità della classifica
+            difficulty: Difficoltà della classifica (None per la classica)
+
+        Returns:
+            Posizione (1-indexed) o -1 se non entrerebbe
+        """
+        better = self.conn.execute(
+            "SELECT COUNT(*) FROM scores WHERE mode = ? AND difficulty IS ? AND score >= ?",
+            (mode, difficulty, score)
+        ).fetchone()[0]
+        if better >= self.capacity:
+            return -1
+        return better + 1
+
+    def clear(self):
+        """Cancella tutti i punteggi."""
+        with self.conn:
+            self.conn.execute("DELETE FROM scores")
+        self.revision += 1
+        self._invalidate_views()
+
+    def get_stats(self) -> dict:
+        """
+        Calcola statistiche globali dalla classifica.
+
+        Returns:
+            Dizionario con statistiche
+        """
+        row = self.conn.execute(
+            "SELECT COUNT(*), MAX(score), AVG(score), COUNT(DISTINCT name) FROM scores"
+        ).fetchone()
+        return {
+            'total_games': row[0],
+            'highest_score': row[1] or 0,
+            'average_score': row[2] or 0,
+            'unique_players': row[3]
+        }
+
+    def release(self):
+        """Chiude il database."""
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,301 @@
+"""
+Registro delle partite giocate.
+
+Ogni partita conclusa viene aggiunta in fondo a un file JSON Lines (una riga
+compatta per partita, mai riscritto), mentre le statistiche di sempre sono
+aggregati aggiornati a ogni riga. Gli aggregati vengono salvati periodicamente
+in un'istantanea che ricorda fin dove è arrivata la lettura del registro:
+all'avvio si carica l'istantanea e si rileggono solo le righe successive,
+e le schermate leggono le statistiche senza scorrere le partite.
+"""
+
+import json
+import os
+import time
+from typing import Optional
+
+from game.game_logic import GameLogic, Move, RoundResult
+from game.persistence import BackgroundWriter, atomic_write
+
+JOURNAL_VERSION = 1
+
+
+def _empty_aggregates() -> dict:
+    """Aggregati iniziali (registro vuoto)."""
+    return {
+        'version': JOURNAL_VERSION,
+        'offset': 0,  # Byte del registro già inclusi negli aggregati
+        'games': 0,
+        'rounds': 0,
+        'player_wins': 0,
+        'cpu_wins': 0,
+        'draws': 0,
+        'timeouts': 0,
+        'play_time': 0.0,
+        'streak_total': 0,
+        'best_streak': 0,
+        'moves': {move.value: {'played': 0, 'won': 0, 'lost': 0} for move in Move},
+        'boards': {},  # 'classic' / 'timed:easy' ... -> {'games', 'best'}
+        'players': {},  # Nome -> miglior punteggio
+    }
+
+
+def board_key(mode: str, difficulty: Optional[str]) -> str:
+    """Chiave della classifica di una partita (es. 'classic', 'timed:hard')."""
+    return f"{mode}:{difficulty}" if difficulty else mode
+
+
+class GameJournal:
+    """
+    Registro append-only delle partite con statistiche incrementali.
+
+    Righe del registro:
+        {"type": "game", "id": 12, "ts": ..., "mode": "timed", "difficulty": "easy",
+         "score": 3, "streak": 2, "time": 41.2, "rounds": [["rock", "paper", "cpu", 6.1], ...]}
+        {"type": "name", "game": 12, "name": "ABC", "score": 3}
+
+    Nei round la mossa del giocatore è null se il tempo è scaduto; l'ultimo
+    valore è l'istante di fine round in secondi dall'inizio della partita.
+    """
+
+    def __init__(self, filename: str = 'games.jsonl', snapshot_file: Optional[str] = None,
+                 snapshot_every: int = 10, async_save: bool = True):
+        """
+        Apre il registro e ricostruisce gli aggregati.
+
+        Args:
+            filename: File del registro (JSON Lines)
+            snapshot_file: File dell'istantanea degli aggregati (default: filename + '.stats.json')
+            snapshot_every: Partite tra due istantanee
+            async_save: Scrive le istantanee da un thread dedicato
+        """
+        self.filename = filename
+        self.snapshot_file = snapshot_file or filename + '.stats.json'
+        self.snapshot_every = snapshot_every
+        self.writer = BackgroundWriter(backup=False) if async_save else None
+
+        self.aggregates = _empty_aggregates()
+        self._unsnapshotted = 0
+        self._load()
+        self._file = open(self.filename, 'a', encoding='utf-8', newline='\n')
+
+    # =========================================================================
+    # CARICAMENTO
+    # =========================================================================
+
+    def _load(self):
+        """Carica l'istantanea e applica le righe aggiunte dopo di essa."""
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') == JOURNAL_VERSION:
+                self.aggregates = snapshot
+        except (OSError, json.JSONDecodeError):
+            pass
+
+        if not os.path.exists(self.filename):
+            self.aggregates = _empty_aggregates()
+            return
+
+        # Registro più corto dell'istantanea (es. interruzione prima della scrittura
+        # su disco): si ricalcola tutto da capo
+        size = os.path.getsize(self.filename)
+        if self.aggregates['offset'] > size:
+            self.aggregates = _empty_aggregates()
+
+        replayed = 0
+        with open(self.filename, 'rb') as f:
+            f.seek(self.aggregates['offset'])
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Riga troncata da un'interruzione: la si chiude e la si ignora
+                    with open(self.filename, 'ab') as fix:
+                        fix.write(b'\n')
+                    self.aggregates['offset'] += len(line) + 1
+                    break
+                self.aggregates['offset'] += len(line)
+                try:
+                    self._apply(json.loads(line))
+                    replayed += 1
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Riga del registro partite ignorata: {e}")
+
+        self._unsnapshotted = replayed
+        if replayed >= self.snapshot_every:
+            self.snapshot()
+
+    def _apply(self, record: dict):
+        """Aggiorna gli aggregati con una riga del registro."""
+        agg = self.aggregates
+        if record.get('type') == 'name':
+            name = record['name']
+            agg['players'][name] = max(agg['players'].get(name, 0), record['score'])
+            return
+
+        agg['games'] += 1
+        agg['play_time'] += record.get('time', 0.0)
+        agg['streak_total'] += record.get('streak', 0)
+        agg['best_streak'] = max(agg['best_streak'], record.get('streak', 0))
+
+        board = agg['boards'].setdefault(board_key(record['mode'], record.get('difficulty')),
+                                         {'games': 0, 'best': 0})
+        board['games'] += 1
+        board['best'] = max(board['best'], record['score'])
+
+        for player_move, _, result, _ in record['rounds']:
+            agg['rounds'] += 1
+            if result == RoundResult.PLAYER_WIN.value:
+                agg['player_wins'] += 1
+            elif result == RoundResult.CPU_WIN.value:
+                agg['cpu_wins'] += 1
+            else:
+                agg['draws'] += 1
+
+            if player_move is None:
+                agg['timeouts'] += 1
+                continue
+            move = agg['moves'][player_move]
+            move['played'] += 1
+            if result == RoundResult.PLAYER_WIN.value:
+                move['won'] += 1
+            elif result == RoundResult.CPU_WIN.value:
+                move['lost'] += 1
+
+    # =========================================================================
+    # SCRITTURA
+    # =========================================================================
+
+    def _append(self, record: dict):
+        """Aggiunge una riga al registro e la applica agli aggregati."""
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+        try:
+            self._file.write(line)
+            self._file.flush()
+        except OSError as e:
+            print(f"Errore scrittura registro partite: {e}")
+            return
+        self.aggregates['offset'] += len(line.encode('utf-8'))
+        self._apply(record)
+
+    def record_game(self, game: GameLogic, mode: str, difficulty: Optional[str] = None) -> int:
+        """
+        Registra una partita conclusa.
+
+        Args:
+            game: Logica della partita appena finita
+            mode: Modalità ('classic' o 'timed')
+            difficulty: Difficoltà per la modalità a tempo
+
+        Returns:
+            Identificativo della partita (per record_name)
+        """
+        game_id = self.aggregates['games'] + 1
+        rounds = [
+            [player_move.value if player_move else None, cpu_move.value, result.value, round(t, 2)]
+            for (player_move, cpu_move, result), t in zip(game.history, game.round_times)
+        ]
+        self._append({
+            'type': 'game',
+            'id': game_id,
+            'ts': round(time.time(), 3),
+            'mode': mode,
+            'difficulty': difficulty,
+            'score': game.player_score,
+            'streak': game.best_streak,
+            'time': round(game.round_times[-1], 2) if game.round_times else 0.0,
+            'rounds': rounds,
+        })
+
+        self._unsnapshotted += 1
+        if self._unsnapshotted >= self.snapshot_every:
+            self.snapshot()
+        return game_id
+
+    def record_name(self, game_id: int, name: str, score: int):
+        """
+        Associa un nome a una partita già registrata (record personale).
+
+        Args:
+            game_id: Identificativo restituito da record_game
+            name: Nome inserito dal giocatore
+            score: Punteggio della partita
+        """
+        self._append({'type': 'name', 'game': game_id, 'name': name.upper()[:5], 'score': score})
+
+    def snapshot(self):
+        """Salva l'istantanea degli aggregati (in background se possibile)."""
+        self._unsnapshotted = 0
+        data = json.dumps(self.aggregates, ensure_ascii=False).encode('utf-8')
+        journal = self.filename
+
+        def produce() -> bytes:
+            # Le righe contate nell'istantanea devono essere su disco prima di essa
+            try:
+                fd = os.open(journal, os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass
+            return data
+
+        if self.writer is not None:
+            self.writer.submit(self.snapshot_file, produce)
+        else:
+            try:
+                atomic_write(self.snapshot_file, produce(), backup=False)
+            except OSError as e:
+                print(f"Errore salvataggio statistiche: {e}")
+
+    def release(self):
+        """Salva l'istantanea finale e chiude il registro."""
+        if self._unsnapshotted:
+            self.snapshot()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+    # =========================================================================
+    # STATISTICHE
+    # =========================================================================
+
+    def get_stats(self) -> dict:
+        """
+        Restituisce le statistiche di tutte le partite registrate.
+
+        Il costo non dipende dal numero di partite: sono calcoli su contatori.
+
+        Returns:
+            Dizionario con totali, percentuale di vittorie per mossa, serie
+            media e migliore, migliori punteggi per classifica e per giocatore
+        """
+        agg = self.aggregates
+        games = agg['games']
+        decided = agg['player_wins'] + agg['cpu_wins']
+        return {
+            'total_games': games,
+            'total_rounds': agg['rounds'],
+            'player_wins': agg['player_wins'],
+            'cpu_wins': agg['cpu_wins'],
+            'draws': agg['draws'],
+            'timeouts': agg['timeouts'],
+            'win_rate': agg['player_wins'] / decided if decided else 0.0,
+            'win_rate_by_move': {
+                move: counts['won'] / counts['played'] if counts['played'] else 0.0
+                for move, counts in agg['moves'].items()
+            },
+            'average_streak': agg['streak_total'] / games if games else 0.0,
+            'best_streak': agg['best_streak'],
+            'average_game_time': agg['play_time'] / games if games else 0.0,
+            'boards': agg['boards'],
+            'player_bests': agg['players'],
+        }
+
+    def get_player_best(self, name: str) -> int:
+        """Restituisce il miglior punteggio registrato per un giocatore (0 se nessuno)."""
+        return self.aggregates['players'].get(name.upper()[:5], 0)
@@ -0,0 +1,151 @@
+"""
+Scrittura sicura dei file di salvataggio.
+
+atomic_write() scrive su un file temporaneo nella stessa cartella, lo
+sincronizza su disco e lo rinomina sopra l'originale: un'interruzione di
+corrente lascia il file vecchio o quello nuovo, mai uno troncato. La versione
+precedente resta in un file .bak da cui il caricamento può ripartire.
+
+BackgroundWriter esegue queste scritture in un thread dedicato: il game loop
+accoda il salvataggio e prosegue, e più salvataggi dello stesso file arrivati
+nel frattempo vengono fusi in uno solo (vince l'ultimo).
+"""
+
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Optional
+
+
+def backup_path(filename: str) -> str:
+    """Restituisce il percorso della copia di sicurezza di un file."""
+    return filename + '.bak'
+
+
+def _fsync_directory(directory: str):
+    """Rende persistente la rinomina (dove il sistema operativo lo consente)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return  # Windows: la rinomina non richiede fsync della cartella
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(filename: str, data: bytes, backup: bool = True):
+    """
+    Sostituisce il contenuto di un file in modo atomico.
+
+    Args:
+        filename: File di destinazione
+        data: Contenuto completo del file
+        backup: Se True, la versione precedente diventa filename.bak
+
+    Raises:
+        OSError: Se la scrittura non riesce (il file originale resta intatto)
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(filename) + '.',
+                                    suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # La versione precedente resta disponibile finché la nuova non è al suo posto
+        if backup and os.path.exists(filename):
+            os.replace(filename, backup_path(filename))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(directory)
+
+
+class BackgroundWriter:
+    """
+    Thread di scrittura con coalescenza dei salvataggi.
+
+    submit() registra una funzione che produce il contenuto del file: viene
+    chiamata nel thread di scrittura, quindi serializzazione e I/O non pesano
+    sul frame. Se lo stesso file viene accodato più volte prima della
+    scrittura, resta solo l'ultima richiesta.
+    """
+
+    def __init__(self, backup: bool = True):
+        """
+        Args:
+            backup: Mantiene la versione precedente di ogni file in .bak
+        """
+        self.backup = backup
+        self.writes = 0  # Scritture effettivamente eseguite
+        self.coalesced = 0  # Richieste assorbite da una successiva
+
+        self._pending: Dict[str, Callable[[], bytes]] = {}
+        self._busy = False
+        self._running = True
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='save-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, filename: str, producer: Callable[[], bytes]):
+        """
+        Accoda il salvataggio di un file.
+
+        Args:
+            filename: File di destinazione
+            producer: Funzione senza argomenti che restituisce il contenuto
+        """
+        with self._cond:
+            if filename in self._pending:
+                self.coalesced += 1
+            self._pending[filename] = producer
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attende che tutti i salvataggi accodati siano su disco.
+
+        Returns:
+            True se non restano scritture in sospeso
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Scrive i salvataggi in sospeso e ferma il thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._pending:
+                    return
+                filename, producer = self._pending.popitem()
+                self._busy = True
+
+            try:
+                atomic_write(filename, producer(), self.backup)
+                self.writes += 1
+            except Exception as e:
+                print(f"Errore salvataggio {filename}: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
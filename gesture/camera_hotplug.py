@@ -0,0 +1,108 @@
+"""
+Rilevamento del collegamento/scollegamento delle camera su Linux.
+
+Invece di riaprire periodicamente le camera con VideoCapture, si osservano i
+nodi /dev/video*: un controllo con os.stat() sulla directory è quasi gratuito,
+e l'elenco dei dispositivi viene riletto solo quando la directory cambia.
+"""
+
+import os
+import sys
+import time
+from typing import List, Optional, Set, Tuple
+
+
+class CameraHotplugWatcher:
+    """
+    Segnala quali indici /dev/videoN sono comparsi o scomparsi.
+
+    Su sistemi diversi da Linux (o senza /dev) supported è False e poll()
+    non segnala mai cambiamenti: il chiamante deve usare il polling classico.
+    """
+
+    def __init__(self,
+                 device_dir: str = '/dev',
+                 prefix: str = 'video',
+                 poll_interval: float = 0.2,
+                 settle_time: float = 0.3):
+        """
+        Inizializza il watcher con l'elenco attuale dei dispositivi.
+
+        Args:
+            device_dir: Directory dei nodi dei dispositivi
+            prefix: Prefisso dei nodi video (videoN -> indice N)
+            poll_interval: Intervallo minimo tra due controlli della directory
+            settle_time: Attesa dopo l'ultimo cambiamento prima di segnalarlo,
+                         per dare tempo al driver di rendere la camera utilizzabile
+        """
+        self.device_dir = device_dir
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+
+        self.supported = sys.platform.startswith('linux') and os.path.isdir(device_dir)
+
+        self._devices: Set[int] = self._list_devices() if self.supported else set()
+        self._dir_mtime = self._stat_mtime()
+        self._last_poll_time = 0.0
+        self._change_time: Optional[float] = None
+
+    def _stat_mtime(self) -> Optional[int]:
+        """Restituisce la data di modifica della directory dei dispositivi."""
+        try:
+            return os.stat(self.device_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _list_devices(self) -> Set[int]:
+        """Legge gli indici dei nodi video presenti."""
+        devices = set()
+        try:
+            for name in os.listdir(self.device_dir):
+                suffix = name[len(self.prefix):]
+                if name.startswith(self.prefix) and suffix.isdigit():
+                    devices.add(int(suffix))
+        except OSError as e:
+            print(f"Errore durante lettura di {self.device_dir}: {e}")
+        return devices
+
+    @property
+    def devices(self) -> List[int]:
+        """Indici dei dispositivi video attualmente noti."""
+        return sorted(self._devices)
+
+    def poll(self, now: Optional[float] = None) -> Tuple[List[int], List[int]]:
+        """
+        Controlla se l'insieme dei dispositivi video è cambiato.
+
+        Args:
+            now: Timestamp corrente (default: time.time())
+
+        Returns:
+            Tupla (indici aggiunti, indici rimossi); entrambe vuote se nulla è cambiato
+        """
+        if not self.supported:
+            return [], []
+
+        if now is None:
+            now = time.time()
+        if now - self._last_poll_time < self.poll_interval:
+            return [], []
+        self._last_poll_time = now
+
+        # La directory cambia quando un nodo viene creato o rimosso
+        mtime = self._stat_mtime()
+        if mtime != self._dir_mtime:
+            self._dir_mtime = mtime
+            self._change_time = now
+            return [], []
+
+        if self._change_time is None or now - self._change_time < self.settle_time:
+            return [], []
+        self._change_time = None
+
+        current = self._list_devices()
+        added = sorted(current - self._devices)
+        removed = sorted(self._devices - current)
+        self._devices = current
+        return added, removed
@@ -0,0 +1,444 @@
+"""
+Sorgenti di frame intercambiabili: camera dal vivo, file registrati e registrazione.
+
+Tutte le sorgenti rispettano lo stesso contratto di CameraManager
+(read()/read_stamped()/is_opened()/release()), così gioco, test e benchmark
+possono girare su un video o su un file .npz senza webcam, in modo ripetibile.
+"""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FrameSource(ABC):
+    """
+    Interfaccia comune delle sorgenti di frame.
+
+    Le sottoclassi devono implementare read_stamped(), is_opened() e release():
+    una sottoclasse incompleta non può essere istanziata.
+    """
+
+    width = 0
+    height = 0
+
+    def read(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Legge un frame dalla sorgente.
+
+        Args:
+            flip: Se True, specchia il frame orizzontalmente
+
+        Returns:
+            Tuple (success, frame)
+        """
+        ret, frame, _, _ = self.read_stamped(flip)
+        return ret, frame
+
+    @abstractmethod
+    def read_stamped(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray], float, int]:
+        """
+        Legge un frame insieme al suo timestamp e numero di sequenza.
+
+        Args:
+            flip: Se True, specchia il frame orizzontalmente
+
+        Returns:
+            Tuple (success, frame, timestamp_acquisizione, sequenza)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_opened(self) -> bool:
+        """Verifica se la sorgente è aperta."""
+        raise NotImplementedError
+
+    def is_disconnected(self) -> bool:
+        """Verifica se la sorgente sembra essere disconnessa."""
+        return not self.is_opened()
+
+    def switch_camera(self, new_index: int) -> bool:
+        """Cambia la camera attiva (non supportato dalle sorgenti non live)."""
+        return False
+
+    def try_reconnect(self) -> bool:
+        """Prova a riaprire la sorgente (non supportato dalle sorgenti non live)."""
+        return False
+
+    def get_health_status(self) -> dict:
+        """Restituisce lo stato della sorgente."""
+        return {
+            'is_opened': self.is_opened(),
+            'consecutive_failures': 0,
+            'is_disconnected': self.is_disconnected(),
+            'camera_index': -1,
+            'health_percent': 100 if self.is_opened() else 0
+        }
+
+    @abstractmethod
+    def release(self):
+        """Rilascia la sorgente."""
+        raise NotImplementedError
+
+
+class FileFrameSource(FrameSource):
+    """
+    Riproduce un video registrato o un file .npz di frame grezzi.
+
+    Il file .npz contiene 'frames' (N, H, W, 3) uint8 BGR e, opzionalmente,
+    'timestamps' (N,) con i tempi di acquisizione originali.
+    """
+
+    def __init__(self, path: str, realtime: bool = True, loop: bool = False,
+                 fps: Optional[float] = None):
+        """
+        Apre il file da riprodurre.
+
+        Args:
+            path: Percorso del video o del file .npz
+            realtime: Se True rispetta i tempi della registrazione (i frame
+                      "in ritardo" vengono saltati come con una camera vera);
+                      se False restituisce un frame nuovo a ogni lettura
+            loop: Se True ricomincia dall'inizio a fine file
+            fps: Frequenza da usare se il file non la indica
+
+        Raises:
+            RuntimeError: Se il file non può essere aperto
+        """
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+
+        self._cap = None
+        self._frames: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None  # Istante di ogni frame dall'inizio
+
+        if path.lower().endswith('.npz'):
+            self._open_npz(path, fps)
+        else:
+            self._open_video(path, fps)
+
+        self._index = -1  # Indice dell'ultimo frame restituito
+        self._frame: Optional[np.ndarray] = None
+        self._seq = 0
+        self._start_time: Optional[float] = None
+        self._opened = True
+        self.finished = False
+
+    def _open_npz(self, path: str, fps: Optional[float]):
+        """Carica in memoria i frame di un file .npz."""
+        try:
+            data = np.load(path)
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Impossibile aprire il file {path}: {e}")
+
+        self._frames = data['frames']
+        self.frame_count = len(self._frames)
+        self.height, self.width = self._frames.shape[1:3]
+
+        if 'timestamps' in data.files and len(data['timestamps']) == self.frame_count:
+            timestamps = np.asarray(data['timestamps'], dtype=np.float64)
+            self._offsets = timestamps - timestamps[0]
+            duration = self._offsets[-1] if self.frame_count > 1 else 0.0
+            self.fps = (self.frame_count - 1) / duration if duration > 0 else (fps or 30.0)
+        else:
+            self.fps = fps or 30.0
+
+    def _open_video(self, path: str, fps: Optional[float]):
+        """Apre un file video con OpenCV."""
+        if not os.path.exists(path):
+            raise RuntimeError(f"File video non trovato: {path}")
+
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Impossibile aprire il video {path}")
+
+        self.frame_count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self._cap.get(cv2.CAP_PROP_FPS) or fps or 30.0
+
+    def _target_index(self, now: float) -> int:
+        """Indice del frame da mostrare all'istante now (solo realtime)."""
+        elapsed = now - self._start_time
+        if self._offsets is not None:
+            # Dopo l'ultimo frame (più un intervallo) la registrazione è finita
+            if elapsed >= self._offsets[-1] + 1.0 / self.fps:
+                return self.frame_count
+            return int(np.searchsorted(self._offsets, elapsed, side='right')) - 1
+        return int(elapsed * self.fps)
+
+    def _rewind(self):
+        """Ricomincia la riproduzione dall'inizio."""
+        if self._cap is not None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self._index = -1
+        self._start_time = time.time()
+
+    def _decode_next(self) -> Optional[np.ndarray]:
+        """Decodifica il frame successivo, o None a fine file."""
+        if self._frames is not None:
+            if self._index + 1 >= self.frame_count:
+                return None
+            self._index += 1
+            return self._frames[self._index]
+
+        ret, frame = self._cap.read()
+        if not ret or frame is None:
+            return None
+        self._index += 1
+        return frame
+
+    def read_stamped(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray], float, int]:
+        """
+        Legge il frame corrente della riproduzione.
+
+        In modalità realtime, se non è ancora il momento del frame successivo,
+        restituisce di nuovo l'ultimo frame con lo stesso numero di sequenza.
+
+        Args:
+            flip: Se True, specchia il frame orizzontalmente
+
+        Returns:
+            Tuple (success, frame, timestamp_acquisizione, sequenza)
+        """
+        if not self._opened or self.finished:
+            return False, None, 0.0, self._seq
+
+        now = time.time()
+        if self._start_time is None:
+            self._start_time = now
+
+        target = self._target_index(now) if self.realtime else self._index + 1
+        target = max(target, 0)
+
+        # Decodifica fino al frame richiesto (in realtime salta quelli in ritardo)
+        while self._index < target:
+            frame = self._decode_next()
+            if frame is None:
+                if not self.loop or self._index < 0:
+                    self.finished = True
+                    break
+                self._rewind()
+                target = 0
+                continue
+            self._frame = frame
+            self._seq += 1
+
+        if self._frame is None or self.finished:
+            return False, None, 0.0, self._seq
+
+        frame = cv2.flip(self._frame, 1) if flip else self._frame.copy()
+        return True, frame, now, self._seq
+
+    def is_opened(self) -> bool:
+        """Verifica se la sorgente è aperta (anche a fine riproduzione)."""
+        return self._opened
+
+    def is_disconnected(self) -> bool:
+        """Un file non si disconnette: a fine riproduzione read() fallisce."""
+        return False
+
+    def get_health_status(self) -> dict:
+        """Restituisce lo stato della riproduzione."""
+        status = super().get_health_status()
+        status['frame_index'] = self._index
+        status['frame_count'] = self.frame_count
+        status['finished'] = self.finished
+        return status
+
+    def release(self):
+        """Chiude il file."""
+        self._opened = False
+        if self._cap is not None:
+            try:
+                self._cap.release()
+            except Exception as e:
+                print(f"Errore durante chiusura video: {e}")
+        self._frames = None
+
+
+class FrameRecorder:
+    """
+    Registra una sequenza di frame in un video o in un file .npz di frame grezzi.
+
+    Il formato .npz conserva i frame senza perdita e i timestamp originali,
+    ed è quello consigliato per benchmark e test ripetibili. I frame vengono
+    scritti su un file temporaneo man mano che arrivano e raccolti nel .npz
+    solo alla chiusura: la memoria non cresce con la durata della registrazione.
+    """
+
+    # Codec per estensione del file video
+    FOURCC = {
+        '.avi': 'MJPG',
+        '.mp4': 'mp4v',
+    }
+
+    def __init__(self, path: str, fps: float = 30.0):
+        """
+        Prepara la registrazione.
+
+        Args:
+            path: File di destinazione (.npz, .avi o .mp4)
+            fps: Frequenza dichiarata nel video
+        """
+        self.path = path
+        self.fps = fps
+        self.frame_count = 0
+
+        self._is_npz = path.lower().endswith('.npz')
+        self._raw_path = path + '.frames.tmp'  # Frame grezzi in attesa del .npz
+        self._raw = None
+        self._frame_shape: Optional[Tuple[int, ...]] = None
+        self._timestamps: List[float] = []
+        self._writer = None
+
+    def _fit_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Riporta il frame alla risoluzione del primo (es. dopo un cambio camera)."""
+        if self._frame_shape is None:
+            self._frame_shape = frame.shape
+        elif frame.shape != self._frame_shape:
+            height, width = self._frame_shape[:2]
+            frame = cv2.resize(frame, (width, height))
+        return frame
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None):
+        """
+        Aggiunge un frame BGR alla registrazione.
+
+        Args:
+            frame: Frame BGR da OpenCV
+            timestamp: Istante di acquisizione (default: time.time())
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        frame = self._fit_frame(frame)
+
+        if self._is_npz:
+            try:
+                if self._raw is None:
+                    self._raw = open(self._raw_path, 'wb')
+                np.ascontiguousarray(frame, dtype=np.uint8).tofile(self._raw)
+            except OSError as e:
+                print(f"Errore durante registrazione su {self._raw_path}: {e}")
+                return
+            self._timestamps.append(timestamp)
+        else:
+            if self._writer is None:
+                # Il writer si apre al primo frame, quando la risoluzione è nota
+                ext = os.path.splitext(self.path)[1].lower()
+                fourcc = cv2.VideoWriter_fourcc(*self.FOURCC.get(ext, 'MJPG'))
+                height, width = frame.shape[:2]
+                self._writer = cv2.VideoWriter(self.path, fourcc, self.fps, (width, height))
+                if not self._writer.isOpened():
+                    print(f"Impossibile creare il video {self.path}")
+            self._writer.write(frame)
+
+        self.frame_count += 1
+
+    def _save_npz(self):
+        """Raccoglie i frame del file temporaneo nel .npz finale."""
+        self._raw.close()
+        self._raw = None
+        count = len(self._timestamps)
+        if count:
+            # np.savez copia la memmap a blocchi: il file non viene caricato tutto in RAM
+            frames = np.memmap(self._raw_path, dtype=np.uint8, mode='r',
+                               shape=(count,) + tuple(self._frame_shape))
+            try:
+                np.savez(self.path, frames=frames,
+                         timestamps=np.array(self._timestamps, dtype=np.float64))
+            finally:
+                del frames
+        os.remove(self._raw_path)
+        self._timestamps = []
+
+    def close(self):
+        """Completa e salva la registrazione."""
+        try:
+            if self._is_npz:
+                if self._raw is None:
+                    return
+                self._save_npz()
+            elif self._writer is not None:
+                self._writer.release()
+                self._writer = None
+            else:
+                return
+            print(f"Registrazione salvata: {self.path} ({self.frame_count} frame)")
+        except Exception as e:
+            print(f"Errore durante salvataggio registrazione {self.path}: {e}")
+
+
+class RecordingFrameSource(FrameSource):
+    """
+    Inoltra i frame di un'altra sorgente registrandoli.
+
+    I frame vengono registrati prima dello specchiamento, così la
+    registrazione si riproduce con le stesse impostazioni della camera.
+    """
+
+    def __init__(self, source: FrameSource, recorder: FrameRecorder,
+                 close_recorder: bool = True):
+        """
+        Args:
+            source: Sorgente da registrare (es. CameraManager)
+            recorder: Destinazione della registrazione
+            close_recorder: Salva la registrazione al rilascio della sorgente
+                (False se il registratore è condiviso tra più connessioni)
+        """
+        self.source = source
+        self.recorder = recorder
+        self.close_recorder = close_recorder
+        self._last_seq = None
+
+    def __getattr__(self, name):
+        # Attributi specifici della sorgente (camera_index, threaded, ...)
+        return getattr(self.source, name)
+
+    @property
+    def width(self) -> int:
+        return self.source.width
+
+    @property
+    def height(self) -> int:
+        return self.source.height
+
+    def read_stamped(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray], float, int]:
+        """Legge dalla sorgente e registra i frame nuovi."""
+        ret, frame, timestamp, seq = self.source.read_stamped(flip=False)
+        if not ret or frame is None:
+            return ret, frame, timestamp, seq
+
+        if seq != self._last_seq:
+            self._last_seq = seq
+            self.recorder.write(frame, timestamp)
+
+        if flip:
+            frame = cv2.flip(frame, 1)
+        return ret, frame, timestamp, seq
+
+    def is_opened(self) -> bool:
+        return self.source.is_opened()
+
+    def is_disconnected(self) -> bool:
+        return self.source.is_disconnected()
+
+    def switch_camera(self, new_index: int) -> bool:
+        return self.source.switch_camera(new_index)
+
+    def try_reconnect(self) -> bool:
+        return self.source.try_reconnect()
+
+    def get_health_status(self) -> dict:
+        return self.source.get_health_status()
+
+    def release(self):
+        """Rilascia la sorgente e salva la registrazione."""
+        self.source.release()
+        if self.close_recorder:
+            self.recorder.close()
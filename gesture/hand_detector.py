@@ -3,12 +3,15 @@ Modulo di riconoscimento gesti della mano usando MediaPipe
 """
 
 import cv2
-import mediapipe as mp
 import numpy as np
 from typing import Optional, Tuple, List, Dict
 import time
+import threading
 from collections import deque
-import math
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from gesture.frame_source import FrameSource
+from gesture.roi_tracker import HandROITracker, ROI
 
 # Importa configurazioni
 try:
@@ -26,6 +29,243 @@ except ImportError:
         'finger_extension_distance_ratio': 1.15,
     }
 
+# =====================
+# RAPPRESENTAZIONE VETTORIALE DEI LANDMARK
+# =====================
+NUM_LANDMARKS = 21
+WRIST = 0
+
+# Dita escluso il pollice: punte, articolazioni intermedie e basi
+_TIPS = np.array([8, 12, 16, 20])
+_PIPS = np.array([6, 10, 14, 18])
+_MCPS = np.array([5, 9, 13, 17])
+
+# Coppie di punte per il raggruppamento, nello stesso ordine del doppio ciclo i < j
+_TIP_PAIRS = np.array([(i, j) for i in range(4) for j in range(i + 1, 4)])
+
+# Tutte le coppie di landmark di cui servono le distanze, raccolte in un'unica
+# operazione di gather: ogni gruppo occupa una fetta contigua
+_PAIR_GROUPS = [
+    ('thumb_tip_wrist', [4], [WRIST]),
+    ('thumb_ip_wrist', [3], [WRIST]),
+    ('tip_mcp', _TIPS, _MCPS),
+    ('pip_mcp', _PIPS, _MCPS),
+    ('tip_wrist', _TIPS, [WRIST] * 4),
+    ('mcp_wrist', _MCPS, [WRIST] * 4),
+    ('tip_pip', _TIPS, _PIPS),
+    ('mcp_pip', _MCPS, _PIPS),
+    ('inter_tip', _TIPS[_TIP_PAIRS[:, 0]], _TIPS[_TIP_PAIRS[:, 1]]),
+    ('index_middle_mcp', [5], [9]),
+]
+_PAIR_A = np.concatenate([np.asarray(a) for _, a, _ in _PAIR_GROUPS])
+_PAIR_B = np.concatenate([np.asarray(b) for _, _, b in _PAIR_GROUPS])
+_PAIR_SLICES: Dict[str, slice] = {}
+_offset = 0
+for _name, _a, _ in _PAIR_GROUPS:
+    _PAIR_SLICES[_name] = slice(_offset, _offset + len(_a))
+    _offset += len(_a)
+del _offset, _name, _a, _
+
+
+def landmarks_to_array(hand_landmarks) -> np.ndarray:
+    """
+    Converte i landmark di una mano in un array contiguo (21, 3) float32.
+    
+    Args:
+        hand_landmarks: Landmark MediaPipe oppure array già convertito
+        
+    Returns:
+        Array (21, 3) con le coordinate normalizzate x, y, z
+    """
+    if isinstance(hand_landmarks, np.ndarray):
+        return np.ascontiguousarray(hand_landmarks, dtype=np.float32)
+    return np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark],
+                    dtype=np.float32)
+
+
+def extract_hand_features(points: np.ndarray,
+                          extension_ratio: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """
+    Calcola in blocco tutte le feature usate dalle regole di riconoscimento.
+    
+    Funziona su un array (..., 21, 3): con una sola mano restituisce scalari
+    (array 0-d), con N mani array di lunghezza N.
+    
+    Args:
+        points: Landmark della mano (o delle mani)
+        extension_ratio: Rapporto punta/articolazione per il dito esteso
+                         (default: GESTURE_DETECTION['finger_extension_distance_ratio'])
+        
+    Returns:
+        Dizionario con 'fingers' (..., 5) e le feature geometriche del pugno
+        e della forbice
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    
+    # Tutti i vettori e le distanze necessarie in un colpo solo
+    diffs = pts[..., _PAIR_A, :] - pts[..., _PAIR_B, :]
+    dists = np.sqrt(np.einsum('...ij,...ij->...i', diffs, diffs))
+    
+    def group(name):
+        return dists[..., _PAIR_SLICES[name]]
+    
+    thumb_tip_wrist = group('thumb_tip_wrist')[..., 0]
+    thumb_ip_wrist = group('thumb_ip_wrist')[..., 0]
+    tip_wrist = group('tip_wrist')
+    mcp_wrist = group('mcp_wrist')
+    tip_pip = group('tip_pip')
+    mcp_pip = group('mcp_pip')
+    inter_tip = group('inter_tip')
+    
+    # === Stato delle dita ===
+    # Pollice: punta più lontana dal polso dell'articolazione (10% di tolleranza)
+    thumb_extended = thumb_tip_wrist > thumb_ip_wrist * 1.1
+    
+    # Metodo 1: distanze dalla base del dito
+    if extension_ratio is None:
+        extension_ratio = GESTURE_DETECTION.get('finger_extension_distance_ratio', 1.15)
+    dist_extended = group('tip_mcp') > group('pip_mcp') * extension_ratio
+    
+    # Metodo 2: distanze dal polso
+    wrist_extended = tip_wrist > mcp_wrist * 1.3
+    
+    # Metodo 3: angolo all'articolazione intermedia - dito esteso ha angolo > 140°
+    v1 = diffs[..., _PAIR_SLICES['tip_pip'], :]
+    v2 = diffs[..., _PAIR_SLICES['mcp_pip'], :]
+    cos_angle = np.einsum('...ij,...ij->...i', v1, v2) / (tip_pip * mcp_pip + 1e-6)
+    angle = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+    angle_extended = angle > 140
+    
+    # Dito esteso se almeno 2 metodi concordano
+    votes = (dist_extended.astype(np.int8) + wrist_extended.astype(np.int8)
+             + angle_extended.astype(np.int8))
+    fingers = np.concatenate([thumb_extended[..., None], votes >= 2], axis=-1)
+    
+    # === Feature del pugno ===
+    hand_size = mcp_wrist[..., 1]  # Polso - base del medio
+    bbox = pts.max(axis=-2) - pts.min(axis=-2)
+    bbox_volume = bbox[..., 0] * bbox[..., 1] * bbox[..., 2]
+    
+    return {
+        'fingers': fingers,
+        'hand_size': hand_size,
+        'compactness': bbox_volume / (hand_size ** 3 + 1e-6),
+        'avg_tip_distance': tip_wrist.mean(axis=-1),
+        'avg_inter_tip': inter_tip.mean(axis=-1),
+        # Forma a V: distanza tra le punte di indice e medio rispetto alle basi
+        'v_ratio': inter_tip[..., 0] / (group('index_middle_mcp')[..., 0] + 1e-6),
+    }
+
+
+# Etichette restituite dalla classificazione batch
+GESTURE_LABELS = np.array(['none', 'rock', 'paper', 'scissors'])
+
+
+def classify_features(features: Dict[str, np.ndarray],
+                      params: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Applica le regole di riconoscimento a un batch di feature, senza cicli Python.
+    
+    Le regole sono le stesse di HandDetector.recognize_gesture().
+    
+    Args:
+        features: Feature (N, ...) restituite da extract_hand_features
+        params: Soglie che sovrascrivono quelle di GESTURE_DETECTION
+        
+    Returns:
+        Tupla (etichette (N,), confidenze (N,) float64)
+    """
+    thresholds = dict(GESTURE_DETECTION)
+    if params:
+        thresholds.update(params)
+    excellent_ratio = thresholds.get('scissors_v_ratio_excellent', 1.3)
+    good_ratio = thresholds.get('scissors_v_ratio_good', 1.1)
+    
+    fingers = features['fingers']
+    extended_count = fingers.sum(axis=-1)
+    hand_size = features['hand_size']
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # === SASSO: stessi tre criteri di _fist_from_features ===
+        compactness = features['compactness']
+        compact_ok = compactness < 0.35
+        compact_score = np.minimum(1.0, (0.35 - compactness) / 0.35 * 1.5)
+        
+        distance_threshold = hand_size * 2.0
+        distance_ok = features['avg_tip_distance'] < distance_threshold
+        distance_score = 1.0 - features['avg_tip_distance'] / distance_threshold
+        
+        grouping_threshold = hand_size * 0.7
+        grouping_ok = features['avg_inter_tip'] < grouping_threshold
+        grouping_score = 1.0 - features['avg_inter_tip'] / grouping_threshold
+        
+        num_scores = (compact_ok.astype(np.int8) + distance_ok.astype(np.int8)
+                      + grouping_ok.astype(np.int8))
+        score_sum = (np.where(compact_ok, compact_score, 0.0)
+                     + np.where(distance_ok, distance_score, 0.0)
+                     + np.where(grouping_ok, grouping_score, 0.0))
+        fist_confidence = score_sum / np.maximum(num_scores, 1)
+    
+    fist_confidence = np.where(extended_count == 0,
+                               np.minimum(1.0, fist_confidence + 0.2),
+                               fist_confidence)
+    is_fist = (extended_count < 3) & (num_scores >= 2) & (fist_confidence >= 0.3)
+    
+    # === CARTA: almeno 4 dita estese ===
+    is_paper = ~is_fist & (extended_count >= 4)
+    paper_confidence = np.minimum(
+        1.0, 0.7 + (extended_count - 4) * 0.1 + np.where(fingers[..., 0], 0.15, 0.0)
+    )
+    
+    # === FORBICE: solo indice e medio estesi ===
+    is_scissors = (~is_fist & ~is_paper & fingers[..., 1] & fingers[..., 2]
+                   & ~fingers[..., 3] & ~fingers[..., 4])
+    v_ratio = features['v_ratio']
+    scissors_confidence = np.where(v_ratio > excellent_ratio, 0.9,
+                                   np.where(v_ratio > good_ratio, 0.75, 0.6))
+    
+    label_index = np.select([is_fist, is_paper, is_scissors], [1, 2, 3], default=0)
+    confidences = np.select(
+        [is_fist, is_paper, is_scissors],
+        [np.minimum(0.95, fist_confidence), paper_confidence, scissors_confidence],
+        default=0.0
+    )
+    return GESTURE_LABELS[label_index], confidences
+
+
+def recognize_gestures_batch(landmarks: np.ndarray,
+                             params: Optional[Dict] = None,
+                             chunk_size: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classifica N mani (o N frame) in un'unica chiamata vettoriale.
+    
+    Pensata per rivalutare sessioni registrate e tarare le soglie offline:
+    i campioni vengono elaborati a blocchi per limitare la memoria.
+    
+    Args:
+        landmarks: Array (N, 21, 3) di landmark normalizzati
+        params: Soglie che sovrascrivono quelle di GESTURE_DETECTION
+        chunk_size: Numero di campioni elaborati per blocco
+        
+    Returns:
+        Tupla (etichette (N,), confidenze (N,) float64)
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if landmarks.ndim != 3 or landmarks.shape[1:] != (NUM_LANDMARKS, 3):
+        raise ValueError(f"Attesi landmark (N, {NUM_LANDMARKS}, 3), ricevuto {landmarks.shape}")
+    
+    extension_ratio = (params or {}).get('finger_extension_distance_ratio')
+    labels = np.empty(len(landmarks), dtype=GESTURE_LABELS.dtype)
+    confidences = np.empty(len(landmarks), dtype=np.float64)
+    
+    for start in range(0, len(landmarks), chunk_size):
+        block = slice(start, start + chunk_size)
+        features = extract_hand_features(landmarks[block], extension_ratio)
+        labels[block], confidences[block] = classify_features(features, params)
+    
+    return labels, confidences
+
+
 class HandDetector:
     """
     Classe per il rilevamento e riconoscimento dei gesti della mano.
@@ -35,7 +275,11 @@ class HandDetector:
     def __init__(self, 
                  max_hands: int = 1,
                  detection_confidence: float = 0.7,
-                 tracking_confidence: float = 0.7):
+                 tracking_confidence: float = 0.7,
+                 backend: str = 'inline',
+                 frame_shape: Tuple[int, int] = (480, 640),
+                 roi_tracking: bool = False,
+                 background_load: bool = False):
         """
         Inizializza il rilevatore di mani.
         
@@ -43,17 +287,53 @@ class HandDetector:
             max_hands: Numero massimo di mani da rilevare
             detection_confidence: Soglia di confidenza per il rilevamento
             tracking_confidence: Soglia di confidenza per il tracking
+            backend: 'inline' esegue MediaPipe nel thread chiamante,
+                     'process' in un processo worker separato
+            frame_shape: (altezza, larghezza) dei frame per il backend 'process'
+            roi_tracking: Se True, dopo il primo rilevamento elabora solo il
+                          riquadro attorno alla mano (solo backend 'inline')
+            background_load: Se True, l'import di MediaPipe e la costruzione
+                             del modello avvengono in un thread in background;
+                             finché is_ready() è False find_hands() non trova mani
         """
-        self.mp_hands = mp.solutions.hands
-        self.mp_draw = mp.solutions.drawing_utils
-        self.mp_styles = mp.solutions.drawing_styles
-        
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=max_hands,
-            min_detection_confidence=detection_confidence,
-            min_tracking_confidence=tracking_confidence
-        )
+        # Moduli MediaPipe, disponibili dopo il caricamento del modello
+        self.mp_hands = None
+        self.mp_draw = None
+        self.mp_styles = None
+        
+        self.backend = backend
+        self.hands = None
+        self.roi_hands = None  # Istanza dedicata ai ritagli della ROI
+        self._roi_tracking = roi_tracking and backend != 'process'
+        self.worker = None
+        self.load_error: Optional[str] = None
+        self._ready = threading.Event()
+        self._load_thread: Optional[threading.Thread] = None
+        
+        load_args = (max_hands, detection_confidence, tracking_confidence, frame_shape)
+        if background_load:
+            self._load_thread = threading.Thread(
+                target=self._load_model,
+                args=load_args,
+                name='mediapipe-loader',
+                daemon=True
+            )
+            self._load_thread.start()
+        else:
+            self._load_model(*load_args)
+        
+        # Ritaglio attorno alla mano per i frame successivi al rilevamento
+        self.roi_tracker = None
+        if self._roi_tracking:
+            self.roi_tracker = HandROITracker(
+                padding=GESTURE_DETECTION.get('roi_padding', 0.35),
+                refresh_frames=GESTURE_DETECTION.get('roi_refresh_frames', 30)
+            )
+        
+        # Contatore dei risultati di inferenza: cambia solo quando arriva un risultato nuovo
+        self.result_id = 0
+        self.result_timestamp = 0.0  # Timestamp di acquisizione del frame dell'ultimo risultato
+        self._last_hands: List[Dict] = []
         
         # Indici dei landmark per ogni dito
         self.finger_tips = [4, 8, 12, 16, 20]  # Pollice, Indice, Medio, Anulare, Mignolo
@@ -69,202 +349,316 @@ class HandDetector:
         smoothing_frames = GESTURE_DETECTION.get('temporal_smoothing_frames', 5)
         self.gesture_history = deque(maxlen=smoothing_frames)
         self.confidence_history = deque(maxlen=smoothing_frames)
+        self.timestamp_history = deque(maxlen=smoothing_frames)  # (acquisizione, riconoscimento)
+        
+        # Latenza dall'acquisizione del frame alla decisione
+        self.frame_latency = 0.0  # Fase 'capture' dell'ultimo frame: acquisizione -> gesto riconosciuto
+        self.confirmation_latency: Optional[Dict[str, float]] = None
+        self._smoothed_gesture = None
+        self._smoothed_onset = None  # (gesto, acquisizione, riconoscimento, uscita dallo smoothing)
+        self._gesture_onset = None
+        
+    def _load_model(self, max_hands: int, detection_confidence: float,
+                    tracking_confidence: float, frame_shape: Tuple[int, int]):
+        """
+        Importa MediaPipe e costruisce il modello (o avvia il worker).
+        
+        Con background_load viene eseguito nel thread di caricamento: l'import
+        di MediaPipe e la costruzione del grafo richiedono alcuni secondi.
+        """
+        try:
+            import mediapipe as mp
+            
+            self.mp_hands = mp.solutions.hands
+            self.mp_draw = mp.solutions.drawing_utils
+            self.mp_styles = mp.solutions.drawing_styles
+            
+            if self.backend == 'process':
+                from gesture.inference_worker import InferenceWorker
+                self.worker = InferenceWorker(
+                    frame_shape=frame_shape,
+                    max_hands=max_hands,
+                    detection_confidence=detection_confidence,
+                    tracking_confidence=tracking_confidence
+                )
+            else:
+                self.hands = self.mp_hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=max_hands,
+                    min_detection_confidence=detection_confidence,
+                    min_tracking_confidence=tracking_confidence
+                )
+                if self._roi_tracking:
+                    # Ritagli e frame interi hanno geometrie diverse: con un'unica
+                    # istanza ogni alternanza invaliderebbe il tracking di MediaPipe
+                    self.roi_hands = self.mp_hands.Hands(
+                        static_image_mode=False,
+                        max_num_hands=max_hands,
+                        min_detection_confidence=detection_confidence,
+                        min_tracking_confidence=tracking_confidence
+                    )
+            self._ready.set()
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"Errore durante caricamento modello MediaPipe: {e}")
+    
+    def is_ready(self) -> bool:
+        """Verifica se il modello è caricato e pronto per il rilevamento."""
+        return self._ready.is_set()
+    
+    def is_loading(self) -> bool:
+        """Verifica se il caricamento in background è ancora in corso."""
+        return not self._ready.is_set() and self.load_error is None
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attende il termine del caricamento del modello.
         
-    def find_hands(self, frame: np.ndarray, draw: bool = True) -> Tuple[np.ndarray, List]:
+        Args:
+            timeout: Tempo massimo di attesa in secondi (None = illimitato)
+            
+        Returns:
+            True se il modello è pronto
+        """
+        if self._load_thread is not None:
+            self._load_thread.join(timeout)
+        return self._ready.is_set()
+    
+    def find_hands(self, frame: np.ndarray, draw: bool = True,
+                   timestamp: Optional[float] = None) -> Tuple[np.ndarray, List]:
         """
         Trova le mani nel frame e opzionalmente disegna i landmark.
         
+        Con il backend 'process' il frame viene solo accodato al worker e
+        vengono restituite le mani dell'ultimo risultato disponibile:
+        result_id indica se il risultato è nuovo.
+        
         Args:
             frame: Frame BGR da OpenCV
             draw: Se True, disegna i landmark sul frame
+            timestamp: Istante di acquisizione del frame (default: adesso);
+                       finisce in result_timestamp insieme al risultato
             
         Returns:
-            Tuple con il frame processato e la lista dei risultati
+            Tuple con il frame processato e la lista dei risultati; ogni mano
+            contiene sia i landmark MediaPipe ('landmarks') sia l'array
+            (21, 3) float32 già convertito ('points')
         """
+        # Modello ancora in caricamento: nessuna mano, result_id invariato
+        if not self._ready.is_set():
+            return frame, []
+        
+        if timestamp is None:
+            timestamp = time.time()
+        
+        if self.worker is not None:
+            all_hands = self._find_hands_worker(frame, timestamp)
+        else:
+            all_hands = self._find_hands_inline(frame)
+            self._last_hands = all_hands
+            self.result_timestamp = timestamp
+            self.result_id += 1
+        
+        # Disegna i landmark
+        if draw:
+            self.draw_hands(frame, all_hands)
+        
+        return frame, all_hands
+    
+    def _process_region(self, frame: np.ndarray, roi: Optional[ROI]):
+        """
+        Esegue MediaPipe sul frame intero o solo sul ritaglio indicato
+        (i ritagli usano l'istanza dedicata roi_hands).
+        
+        Args:
+            frame: Frame BGR da OpenCV
+            roi: Riquadro in pixel (x0, y0, x1, y1) oppure None
+            
+        Returns:
+            Risultati di MediaPipe, normalizzati rispetto alla regione elaborata
+        """
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            frame = frame[y0:y1, x0:x1]
+        
         # Converti in RGB per MediaPipe
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
+        hands = self.roi_hands if roi is not None else self.hands
+        return hands.process(rgb_frame)
+    
+    def _find_hands_inline(self, frame: np.ndarray) -> List[Dict]:
+        """
+        Rileva le mani nel thread chiamante, usando il ritaglio della ROI se attivo.
+        
+        Args:
+            frame: Frame BGR da OpenCV
+            
+        Returns:
+            Lista delle mani con landmark in coordinate del frame intero
+        """
+        roi = None
+        if self.roi_tracker is not None:
+            roi = self.roi_tracker.get_roi(frame.shape)
+        
+        # Se la mano è uscita dal ritaglio il frame resta senza mani: update()
+        # azzera il tracking e il frame intero viene elaborato al prossimo tick,
+        # così nessun tick esegue MediaPipe due volte
+        results = self._process_region(frame, roi)
         
         all_hands = []
         
         if results.multi_hand_landmarks:
             for hand_landmarks, handedness in zip(results.multi_hand_landmarks, 
                                                    results.multi_handedness):
+                if roi is not None:
+                    self.roi_tracker.remap_landmarks(hand_landmarks, roi, frame.shape)
+                
                 # Estrai informazioni sulla mano
                 hand_info = {
                     'landmarks': hand_landmarks,
+                    'points': landmarks_to_array(hand_landmarks),
                     'handedness': handedness.classification[0].label,
                     'confidence': handedness.classification[0].score
                 }
                 all_hands.append(hand_info)
-                
-                # Disegna i landmark
-                if draw:
-                    self.mp_draw.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_styles.get_default_hand_landmarks_style(),
-                        self.mp_styles.get_default_hand_connections_style()
-                    )
         
-        return frame, all_hands
+        if self.roi_tracker is not None:
+            self.roi_tracker.update([hand['points'] for hand in all_hands], roi)
+        
+        return all_hands
     
-    def get_finger_states(self, hand_landmarks, frame_shape: Tuple[int, int]) -> List[bool]:
+    def draw_hands(self, frame: np.ndarray, hands: List[Dict]) -> np.ndarray:
         """
-        Determina quali dita sono estese con algoritmo rotation-invariant.
-        Funziona indipendentemente dall'orientamento della mano.
+        Disegna i landmark delle mani sul frame.
         
         Args:
-            hand_landmarks: Landmark della mano da MediaPipe
-            frame_shape: (height, width) del frame
+            frame: Frame BGR da OpenCV (modificato sul posto)
+            hands: Mani restituite da find_hands()
             
         Returns:
-            Lista di 5 booleani [pollice, indice, medio, anulare, mignolo]
+            Il frame con i landmark disegnati
         """
-        h, w = frame_shape[:2]
-        landmarks = hand_landmarks.landmark
-        
-        fingers = []
-        
-        # Pollice - usa distanza euclidea dal polso (già rotation-invariant)
-        thumb_tip = landmarks[4]
-        thumb_ip = landmarks[3]
-        thumb_mcp = landmarks[2]
-        wrist = landmarks[0]
-        
-        # Distanza punta pollice dal polso vs articolazione dal polso
-        dist_tip_wrist = self._calculate_distance(thumb_tip, wrist)
-        dist_ip_wrist = self._calculate_distance(thumb_ip, wrist)
-        
-        # Il pollice è esteso se la punta è più lontana dal polso
-        thumb_extended = dist_tip_wrist > dist_ip_wrist * 1.1  # 10% di tolleranza
-        fingers.append(thumb_extended)
-        
-        # Altri 4 dita - usa solo distanze euclidee (rotation-invariant)
-        for i, (tip_idx, pip_idx, mcp_idx) in enumerate(zip(
-            self.finger_tips[1:], 
-            self.finger_pips[1:], 
-            self.finger_mcps[1:]
-        )):
-            tip = landmarks[tip_idx]
-            pip = landmarks[pip_idx]
-            mcp = landmarks[mcp_idx]
-            
-            # Metodo 1: Confronto distanze da MCP (base del dito)
-            dist_tip_mcp = self._calculate_distance(tip, mcp)
-            dist_pip_mcp = self._calculate_distance(pip, mcp)
-            ratio = GESTURE_DETECTION.get('finger_extension_distance_ratio', 1.15)
-            dist_extended = dist_tip_mcp > dist_pip_mcp * ratio
-            
-            # Metodo 2: Confronto distanze dal polso
-            dist_tip_wrist = self._calculate_distance(tip, wrist)
-            dist_mcp_wrist = self._calculate_distance(mcp, wrist)
-            wrist_extended = dist_tip_wrist > dist_mcp_wrist * 1.3
-            
-            # Metodo 3: Verifica angolo - dito esteso ha angolo > 140°
-            angle = self._calculate_angle(tip, pip, mcp)
-            angle_extended = angle > 140
-            
-            # Dito esteso se almeno 2 metodi concordano
-            votes = sum([dist_extended, wrist_extended, angle_extended])
-            fingers.append(votes >= 2)
-        
-        return fingers
-    
-    def _calculate_distance(self, point1, point2) -> float:
-        """Calcola la distanza euclidea tra due landmark."""
-        return math.sqrt(
-            (point1.x - point2.x) ** 2 + 
-            (point1.y - point2.y) ** 2 + 
-            (point1.z - point2.z) ** 2
-        )
+        for hand_info in hands:
+            self.mp_draw.draw_landmarks(
+                frame,
+                hand_info['landmarks'],
+                self.mp_hands.HAND_CONNECTIONS,
+                self.mp_styles.get_default_hand_landmarks_style(),
+                self.mp_styles.get_default_hand_connections_style()
+            )
+        return frame
+    
+    def get_last_hands(self) -> List[Dict]:
+        """
+        Restituisce le mani dell'ultimo risultato di inferenza.
+        
+        Usato per i frame in cui l'inferenza viene saltata.
+        """
+        return list(self._last_hands)
     
-    def _calculate_angle(self, point1, point2, point3) -> float:
+    def _find_hands_worker(self, frame: np.ndarray, timestamp: float) -> List[Dict]:
         """
-        Calcola l'angolo formato da tre punti (point2 è il vertice).
-        Restituisce l'angolo in gradi.
+        Accoda il frame al worker e raccoglie l'ultimo risultato senza bloccare.
+        
+        Args:
+            frame: Frame BGR da OpenCV
+            timestamp: Istante di acquisizione del frame
+            
+        Returns:
+            Lista delle mani dell'ultimo risultato disponibile
         """
-        # Vettori
-        v1 = np.array([point1.x - point2.x, point1.y - point2.y, point1.z - point2.z])
-        v2 = np.array([point3.x - point2.x, point3.y - point2.y, point3.z - point2.z])
+        self.worker.submit(frame, timestamp)
+        result = self.worker.poll()
         
-        # Calcola l'angolo
-        cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
-        angle = np.arccos(cos_angle)
+        if result is not None:
+            from mediapipe.framework.formats import landmark_pb2
+            
+            all_hands = []
+            for points, label, score in zip(result.landmarks, result.handedness, result.scores):
+                # Ricostruisce il protobuf per compatibilità con disegno e riconoscimento
+                hand_landmarks = landmark_pb2.NormalizedLandmarkList()
+                for x, y, z in points:
+                    hand_landmarks.landmark.add(x=float(x), y=float(y), z=float(z))
+                all_hands.append({
+                    'landmarks': hand_landmarks,
+                    'points': points,
+                    'handedness': label,
+                    'confidence': score
+                })
+            
+            self._last_hands = all_hands
+            self.result_timestamp = result.timestamp
+            self.result_id += 1
         
-        return np.degrees(angle)
+        return list(self._last_hands)
+    
+    def get_finger_states(self, hand_landmarks, frame_shape: Tuple[int, int]) -> List[bool]:
+        """
+        Determina quali dita sono estese con algoritmo rotation-invariant.
+        Funziona indipendentemente dall'orientamento della mano.
+        
+        Args:
+            hand_landmarks: Landmark della mano da MediaPipe (o array (21, 3))
+            frame_shape: (height, width) del frame
+            
+        Returns:
+            Lista di 5 booleani [pollice, indice, medio, anulare, mignolo]
+        """
+        features = extract_hand_features(landmarks_to_array(hand_landmarks))
+        return features['fingers'].tolist()
     
     def _is_fist_closed(self, hand_landmarks, fingers: List[bool]) -> Tuple[bool, float]:
         """
         Verifica se la mano è chiusa a pugno - algoritmo semplificato e permissivo.
         
         Args:
-            hand_landmarks: Landmark della mano
+            hand_landmarks: Landmark della mano (o array (21, 3))
             fingers: Stato delle dita
             
         Returns:
             Tupla (is_fist, confidence)
         """
-        landmarks = hand_landmarks.landmark
+        features = extract_hand_features(landmarks_to_array(hand_landmarks))
+        return self._fist_from_features(features, fingers)
+    
+    def _fist_from_features(self, features: Dict[str, np.ndarray],
+                            fingers: List[bool]) -> Tuple[bool, float]:
+        """
+        Valuta il pugno a partire dalle feature già calcolate.
         
+        Args:
+            features: Feature restituite da extract_hand_features
+            fingers: Stato delle dita
+            
+        Returns:
+            Tupla (is_fist, confidence)
+        """
         # Se troppe dita estese, non è un pugno
         num_extended = sum(fingers)
         if num_extended >= 3:  # Massimo 2 dita "semi-estese" tollerate
             return False, 0.0
         
-        wrist = landmarks[0]
-        middle_mcp = landmarks[9]
-        hand_size = self._calculate_distance(wrist, middle_mcp)
-        
+        hand_size = float(features['hand_size'])
         scores = []
         
         # === CRITERIO 1: Compattezza (più permissivo) ===
-        all_x = [lm.x for lm in landmarks]
-        all_y = [lm.y for lm in landmarks]
-        all_z = [lm.z for lm in landmarks]
-        
-        bbox_width = max(all_x) - min(all_x)
-        bbox_height = max(all_y) - min(all_y)
-        bbox_depth = max(all_z) - min(all_z)
-        bbox_volume = bbox_width * bbox_height * bbox_depth
-        
-        natural_volume = hand_size ** 3
-        compactness_ratio = bbox_volume / (natural_volume + 1e-6)
-        
         # Più permissivo: < 35% invece di 20%
+        compactness_ratio = float(features['compactness'])
         if compactness_ratio < 0.35:
             compactness_score = min(1.0, (0.35 - compactness_ratio) / 0.35 * 1.5)
             scores.append(compactness_score)
         
         # === CRITERIO 2: Distanza Punte dal Polso (semplificato) ===
-        tip_distances = []
-        for tip_idx in self.finger_tips[1:]:  # Escludi pollice
-            dist = self._calculate_distance(landmarks[tip_idx], wrist)
-            tip_distances.append(dist)
-        
-        avg_tip_distance = np.mean(tip_distances)
-        
         # Più permissivo: < 2.0x hand_size
+        avg_tip_distance = float(features['avg_tip_distance'])
         threshold = hand_size * 2.0
         if avg_tip_distance < threshold:
             distance_score = 1.0 - (avg_tip_distance / threshold)
             scores.append(distance_score)
         
         # === CRITERIO 3: Punte Raggruppate ===
-        inter_tip_distances = []
-        for i in range(len(self.finger_tips[1:]) - 1):
-            for j in range(i + 1, len(self.finger_tips[1:])):
-                dist = self._calculate_distance(
-                    landmarks[self.finger_tips[1:][i]], 
-                    landmarks[self.finger_tips[1:][j]]
-                )
-                inter_tip_distances.append(dist)
-        
-        avg_inter_tip = np.mean(inter_tip_distances)
-        
         # Più permissivo: < 0.7x hand_size
+        avg_inter_tip = float(features['avg_inter_tip'])
         grouping_threshold = hand_size * 0.7
         if avg_inter_tip < grouping_threshold:
             grouping_score = 1.0 - (avg_inter_tip / grouping_threshold)
@@ -276,7 +670,7 @@ class HandDetector:
             return False, 0.0
         
         # Confidenza base dalla media
-        confidence = np.mean(scores)
+        confidence = sum(scores) / len(scores)
         
         # Boost se nessun dito esteso
         if num_extended == 0:
@@ -292,15 +686,18 @@ class HandDetector:
         """
         Riconosce il gesto della mano con scoring di confidenza migliorato.
         
+        I landmark vengono convertiti una sola volta in un array (21, 3) e
+        tutte le feature sono calcolate in blocco con NumPy.
+        
         Args:
-            hand_landmarks: Landmark della mano da MediaPipe
+            hand_landmarks: Landmark della mano da MediaPipe (o array (21, 3))
             frame_shape: (height, width) del frame
             
         Returns:
             Tupla (gesto, confidenza) dove confidenza è un valore tra 0.0 e 1.0
         """
-        fingers = self.get_finger_states(hand_landmarks, frame_shape)
-        landmarks = hand_landmarks.landmark
+        features = extract_hand_features(landmarks_to_array(hand_landmarks))
+        fingers = features['fingers'].tolist()
         
         # Conta le dita estese
         extended_count = sum(fingers)
@@ -308,7 +705,7 @@ class HandDetector:
         # === GESTI DI GIOCO CON CONFIDENZA ===
         
         # SASSO: Pugno chiuso - controllo multi-criterio avanzato
-        is_fist, fist_confidence = self._is_fist_closed(hand_landmarks, fingers)
+        is_fist, fist_confidence = self._fist_from_features(features, fingers)
         if is_fist:
             return 'rock', fist_confidence
         
@@ -325,19 +722,8 @@ class HandDetector:
         
         # FORBICE: Solo indice e medio estesi con geometria a V
         if fingers[1] and fingers[2] and not fingers[3] and not fingers[4]:
-            # Verifica la separazione tra indice e medio (forma a V)
-            index_tip = landmarks[8]
-            middle_tip = landmarks[12]
-            index_mcp = landmarks[5]
-            middle_mcp = landmarks[9]
-            
-            # Distanza tra le punte
-            tips_distance = self._calculate_distance(index_tip, middle_tip)
-            # Distanza tra le basi
-            mcps_distance = self._calculate_distance(index_mcp, middle_mcp)
-            
             # Le punte dovrebbero essere più distanti delle basi (forma a V)
-            v_ratio = tips_distance / (mcps_distance + 1e-6)
+            v_ratio = float(features['v_ratio'])
             
             # Confidenza basata sulla qualità della V
             excellent_ratio = GESTURE_DETECTION.get('scissors_v_ratio_excellent', 1.3)
@@ -354,21 +740,62 @@ class HandDetector:
         
         return 'none', 0.0
     
-    def _apply_temporal_smoothing(self, gesture: str, confidence: float) -> Tuple[str, float]:
+    def recognize_gestures_batch(self, landmarks: np.ndarray,
+                                 params: Optional[Dict] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Riconosce i gesti di N mani in un'unica chiamata vettoriale.
+        
+        Args:
+            landmarks: Array (N, 21, 3) di landmark normalizzati
+            params: Soglie che sovrascrivono quelle di GESTURE_DETECTION
+            
+        Returns:
+            Tupla (etichette (N,), confidenze (N,)) con le stesse etichette
+            di recognize_gesture()
+        """
+        return recognize_gestures_batch(landmarks, params)
+    
+    def _apply_temporal_smoothing(self, gesture: str, confidence: float,
+                                  timestamp: Optional[float] = None) -> Tuple[str, float]:
         """
         Applica smoothing temporale per ridurre il jitter nel riconoscimento.
         
         Args:
             gesture: Gesto riconosciuto nel frame corrente
             confidence: Confidenza del gesto corrente
+            timestamp: Istante di acquisizione del frame (default: adesso)
             
         Returns:
             Tupla (gesto_smoothed, confidenza_smoothed)
         """
+        now = time.time()
+        if timestamp is None:
+            timestamp = now
+        # Dall'acquisizione del frame all'arrivo del gesto riconosciuto
+        self.frame_latency = now - timestamp
+        
         # Aggiungi alla storia
         self.gesture_history.append(gesture)
         self.confidence_history.append(confidence)
-        
+        self.timestamp_history.append((timestamp, now))
+        
+        smoothed = self._smooth_history(gesture, confidence)
+        
+        # Quando l'uscita cambia, ricorda il primo frame della finestra con il nuovo gesto:
+        # il ritardo introdotto dallo smoothing va da lì a adesso
+        if smoothed[0] != self._smoothed_gesture:
+            self._smoothed_gesture = smoothed[0]
+            onset = next(
+                (stamps for g, stamps in zip(self.gesture_history, self.timestamp_history)
+                 if g == smoothed[0]),
+                (timestamp, now)
+            )
+            self._smoothed_onset = (smoothed[0], onset[0], onset[1], now)
+        
+        return smoothed
+    
+    def _smooth_history(self, gesture: str, confidence: float) -> Tuple[str, float]:
+        """Voto a maggioranza sulla finestra di gesti recenti."""
         # Se abbiamo pochi campioni, ritorna il gesto corrente
         if len(self.gesture_history) < 3:
             return gesture, confidence
@@ -396,34 +823,69 @@ class HandDetector:
         # Altrimenti ritorna 'none' (nessun gesto stabile)
         return 'none', 0.0
     
-    def get_confirmed_gesture(self, gesture: str, hold_time: float = 0.5) -> Optional[str]:
+    def get_confirmed_gesture(self, gesture: str, hold_time: float = 0.5,
+                              timestamp: Optional[float] = None) -> Optional[str]:
         """
         Conferma un gesto solo se mantenuto per un certo tempo.
         
+        Alla conferma, get_confirmation_latency() restituisce la latenza
+        dall'acquisizione del primo frame con il gesto fino alla decisione.
+        
         Args:
             gesture: Il gesto attualmente rilevato
             hold_time: Tempo in secondi per confermare il gesto
+            timestamp: Istante di acquisizione del frame (default: adesso)
             
         Returns:
             Il gesto confermato o None
         """
         current_time = time.time()
+        if timestamp is None:
+            timestamp = current_time
         
         if gesture != self.last_gesture:
             # Nuovo gesto, resetta il timer
             self.last_gesture = gesture
             self.gesture_start_time = current_time
             self.gesture_confirmed = False
+            # Inizio del gesto: dallo smoothing se disponibile, altrimenti questo frame
+            onset = self._smoothed_onset
+            if onset is None or onset[0] != gesture:
+                onset = (gesture, timestamp, current_time, current_time)
+            self._gesture_onset = onset
             return None
         
         # Stesso gesto, controlla il tempo
         if current_time - self.gesture_start_time >= hold_time:
             if not self.gesture_confirmed:
                 self.gesture_confirmed = True
+                self._record_confirmation_latency(current_time, hold_time)
                 return gesture
         
         return None
     
+    def _record_confirmation_latency(self, confirmed_at: float, hold_time: float):
+        """Scompone la latenza del gesto appena confermato, escluso hold_time."""
+        _, captured_at, recognized_at, smoothed_at = self._gesture_onset
+        self.confirmation_latency = {
+            'capture': recognized_at - captured_at,
+            'smoothing': smoothed_at - recognized_at,
+            'confirm': max(0.0, confirmed_at - smoothed_at - hold_time),
+            'total': max(0.0, confirmed_at - captured_at - hold_time),
+        }
+    
+    def get_confirmation_latency(self) -> Optional[Dict[str, float]]:
+        """
+        Restituisce la latenza (in secondi) dell'ultimo gesto confermato.
+        
+        Returns:
+            Dizionario con le fasi 'capture' (acquisizione + inferenza),
+            'smoothing' (ritardo del voto a maggioranza), 'confirm' (attesa
+            oltre hold_time) e 'total' (dall'acquisizione alla decisione,
+            hold_time escluso); None se nessun gesto è stato confermato
+        """
+        return self.confirmation_latency
+    
     def get_gesture_progress(self, hold_time: float = 0.5) -> float:
         """
         Restituisce il progresso della conferma del gesto (0-1).
@@ -447,79 +909,173 @@ class HandDetector:
         self.gesture_confirmed = False
         self.gesture_history.clear()
         self.confidence_history.clear()
+        self.timestamp_history.clear()
+        self._smoothed_gesture = None
+        self._smoothed_onset = None
+        self._gesture_onset = None
     
     def get_hand_center(self, hand_landmarks, frame_shape: Tuple[int, int]) -> Tuple[int, int]:
         """
         Calcola il centro della mano.
         
         Args:
-            hand_landmarks: Landmark della mano
+            hand_landmarks: Landmark della mano (o array (21, 3))
             frame_shape: (height, width) del frame
             
         Returns:
             Tuple (x, y) del centro della mano in pixel
         """
         h, w = frame_shape[:2]
-        landmarks = hand_landmarks.landmark
         
         # Usa il palmo (landmark 0) come centro
-        palm = landmarks[0]
-        return int(palm.x * w), int(palm.y * h)
+        if isinstance(hand_landmarks, np.ndarray):
+            palm_x, palm_y = hand_landmarks[WRIST, 0], hand_landmarks[WRIST, 1]
+        else:
+            palm = hand_landmarks.landmark[WRIST]
+            palm_x, palm_y = palm.x, palm.y
+        return int(palm_x * w), int(palm_y * h)
     
     def release(self):
         """Rilascia le risorse."""
-        self.hands.close()
+        # Attende un eventuale caricamento in corso per non lasciare risorse aperte
+        if self._load_thread is not None:
+            self._load_thread.join(timeout=10.0)
+        if self.worker is not None:
+            self.worker.close()
+        if self.hands is not None:
+            self.hands.close()
+        if self.roi_hands is not None:
+            self.roi_hands.close()
+
+
+# Executor condiviso per le ricerche asincrone delle camera (creato al primo uso)
+_discovery_executor: Optional[ThreadPoolExecutor] = None
+
+# Verifiche abbandonate per timeout: il loro thread resta bloccato in VideoCapture
+_stuck_probes: List[Future] = []
+_stuck_probes_lock = threading.Lock()
 
 
-class CameraManager:
+class CameraManager(FrameSource):
     """
     Gestisce l'accesso alla webcam.
     """
     
     @staticmethod
-    def get_available_cameras(max_cameras: int = 10, timeout_per_camera: float = 2.0) -> list:
+    def _probe_camera(index: int) -> Optional[Tuple[int, str]]:
+        """
+        Verifica se una camera è disponibile leggendo un frame.
+        
+        Args:
+            index: Indice della camera
+            
+        Returns:
+            Tupla (indice, nome) oppure None se la camera non funziona
+        """
+        cap = None
+        try:
+            cap = cv2.VideoCapture(index)
+            if cap is not None and cap.isOpened():
+                # Prova a leggere un frame per verificare che funzioni
+                ret, frame = cap.read()
+                if ret and frame is not None:
+                    # Ottieni il nome della camera se disponibile
+                    try:
+                        backend = cap.getBackendName()
+                    except:
+                        backend = "Unknown"
+                    return index, f"Camera {index} ({backend})"
+        except cv2.error as e:
+            # Camera non disponibile o errore OpenCV
+            pass
+        except Exception as e:
+            # Errore generico
+            print(f"Errore durante scansione camera {index}: {e}")
+        finally:
+            # Assicurati di rilasciare sempre la camera
+            if cap is not None:
+                try:
+                    cap.release()
+                except:
+                    pass
+        return None
+    
+    @staticmethod
+    def get_available_cameras(max_cameras: int = 10, timeout_per_camera: float = 2.0,
+                              indices: Optional[List[int]] = None) -> list:
         """
         Rileva tutte le camera disponibili nel sistema.
         
+        Gli indici vengono verificati in parallelo: la scansione dura al massimo
+        timeout_per_camera secondi, e le camera che non rispondono entro il
+        timeout vengono considerate non disponibili.
+        
         Args:
             max_cameras: Numero massimo di camera da controllare
-            timeout_per_camera: Timeout in secondi per ogni camera (non usato direttamente ma per ref)
+            timeout_per_camera: Timeout in secondi per ogni camera
+            indices: Indici da controllare (default: da 0 a max_cameras - 1)
             
         Returns:
             Lista di tuple (indice, nome) delle camera disponibili
         """
-        available = []
-        for i in range(max_cameras):
-            cap = None
-            try:
-                cap = cv2.VideoCapture(i)
-                if cap is not None and cap.isOpened():
-                    # Prova a leggere un frame per verificare che funzioni
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        # Ottieni il nome della camera se disponibile
-                        try:
-                            backend = cap.getBackendName()
-                        except:
-                            backend = "Unknown"
-                        name = f"Camera {i} ({backend})"
-                        available.append((i, name))
-            except cv2.error as e:
-                # Camera non disponibile o errore OpenCV, continua con la prossima
-                pass
-            except Exception as e:
-                # Errore generico, continua
-                print(f"Errore durante scansione camera {i}: {e}")
-            finally:
-                # Assicurati di rilasciare sempre la camera
-                if cap is not None:
-                    try:
-                        cap.release()
-                    except:
-                        pass
-        return available
+        if indices is None:
+            indices = list(range(max_cameras))
+        if not indices:
+            return []
+        
+        executor = ThreadPoolExecutor(max_workers=len(indices),
+                                      thread_name_prefix='camera-probe')
+        try:
+            futures = [executor.submit(CameraManager._probe_camera, i)
+                       for i in indices]
+            done, not_done = wait(futures, timeout=timeout_per_camera)
+            if not_done:
+                print(f"Timeout durante scansione di {len(not_done)} camera")
+                with _stuck_probes_lock:
+                    _stuck_probes.extend(not_done)
+        finally:
+            # Non attende le verifiche bloccate: rilasciano la camera da sole
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        available = [f.result() for f in futures if f in done and f.result() is not None]
+        return sorted(available)
+    
+    @staticmethod
+    def probes_pending() -> bool:
+        """
+        Verifica se verifiche di scansioni precedenti sono ancora bloccate.
+        
+        Una nuova ricerca aggiungerebbe altri thread bloccati sugli stessi
+        dispositivi: conviene attendere che queste terminino.
+        """
+        with _stuck_probes_lock:
+            _stuck_probes[:] = [f for f in _stuck_probes if not f.done()]
+            return bool(_stuck_probes)
+    
+    @staticmethod
+    def get_available_cameras_async(max_cameras: int = 10,
+                                    timeout_per_camera: float = 2.0,
+                                    indices: Optional[List[int]] = None) -> Future:
+        """
+        Avvia la ricerca delle camera senza bloccare il chiamante.
+        
+        Args:
+            max_cameras: Numero massimo di camera da controllare
+            timeout_per_camera: Timeout in secondi per ogni camera
+            indices: Indici da controllare (default: da 0 a max_cameras - 1)
+            
+        Returns:
+            Future il cui risultato è la lista di get_available_cameras()
+        """
+        global _discovery_executor
+        if _discovery_executor is None:
+            _discovery_executor = ThreadPoolExecutor(max_workers=1,
+                                                     thread_name_prefix='camera-discovery')
+        return _discovery_executor.submit(CameraManager.get_available_cameras,
+                                          max_cameras, timeout_per_camera, indices)
     
-    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480):
+    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480,
+                 threaded: bool = False):
         """
         Inizializza la camera.
         
@@ -527,10 +1083,13 @@ class CameraManager:
             camera_index: Indice della webcam
             width: Larghezza del frame
             height: Altezza del frame
+            threaded: Se True, acquisisce i frame in un thread dedicato
+                      e read() restituisce subito l'ultimo frame disponibile
         """
         self.camera_index = camera_index
         self.desired_width = width
         self.desired_height = height
+        self.threaded = threaded
         self.cap = cv2.VideoCapture(camera_index)
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
@@ -542,47 +1101,195 @@ class CameraManager:
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.consecutive_failures = 0
         self.max_failures = 10  # Dopo 10 frame falliti, considera la camera disconnessa
+        
+        # Slot "ultimo frame": contiene solo il frame più recente, i vecchi vengono scartati
+        self._frame_lock = threading.Lock()
+        self._latest_frame: Optional[np.ndarray] = None
+        self._latest_timestamp = 0.0
+        self._latest_seq = 0
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop: Optional[threading.Event] = None  # Arresto del thread corrente
+        self._capture_orphaned: Optional[threading.Event] = None  # Il thread rilascia la sua camera
+        
+        if self.threaded:
+            self._start_capture_thread()
+    
+    def _start_capture_thread(self):
+        """Avvia il thread di acquisizione in background."""
+        # Evita che il driver accumuli frame vecchi nel suo buffer interno
+        try:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except cv2.error:
+            pass
+        
+        with self._frame_lock:
+            self._latest_frame = None
+        # Eventi propri di ogni thread: un thread precedente ancora bloccato
+        # in cap.read() non riparte quando ne viene avviato uno nuovo
+        self._capture_stop = threading.Event()
+        self._capture_orphaned = threading.Event()
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop,
+            args=(self.cap, self._capture_stop, self._capture_orphaned),
+            name=f"camera-{self.camera_index}",
+            daemon=True
+        )
+        self._capture_thread.start()
+    
+    def _stop_capture_thread(self) -> bool:
+        """
+        Ferma il thread di acquisizione e attende la sua terminazione.
+        
+        Returns:
+            True se il thread è terminato e la camera può essere rilasciata;
+            False se è ancora bloccato in cap.read(): la camera verrà
+            rilasciata dal thread stesso appena la lettura ritorna
+        """
+        thread = self._capture_thread
+        self._capture_thread = None
+        if thread is None:
+            return True
+        self._capture_stop.set()
+        if thread is threading.current_thread():
+            return True
+        
+        thread.join(timeout=2.0)
+        if not thread.is_alive():
+            return True
+        
+        self._capture_orphaned.set()
+        if not thread.is_alive():
+            # Terminato subito dopo il controllo: rilasciare due volte è innocuo
+            return True
+        print(f"Timeout arresto acquisizione camera {self.camera_index}: "
+              f"rilascio rimandato alla fine della lettura")
+        return False
+    
+    def _release_capture(self, stopped: bool):
+        """
+        Rilascia la camera corrente, se il thread di acquisizione non la sta leggendo.
+        
+        Args:
+            stopped: Risultato di _stop_capture_thread()
+        """
+        if self.cap is None:
+            return
+        if stopped:
+            try:
+                self.cap.release()
+            except Exception:
+                pass
+        else:
+            # Appartiene ormai al thread bloccato, che la rilascerà
+            self.cap = None
+    
+    def _capture_loop(self, cap, stop: threading.Event, orphaned: threading.Event):
+        """
+        Ciclo del thread di acquisizione: legge frame continuamente nello slot.
+        
+        Args:
+            cap: Camera da leggere
+            stop: Evento di arresto del thread
+            orphaned: Se impostato all'uscita, la camera va rilasciata qui
+        """
+        while not stop.is_set():
+            try:
+                if cap is None or not cap.isOpened():
+                    self.consecutive_failures = self.max_failures
+                    break
+                ret, frame = cap.read()
+            except cv2.error as e:
+                print(f"Errore OpenCV durante lettura camera: {e}")
+                self.consecutive_failures = self.max_failures
+                break
+            except Exception as e:
+                print(f"Errore imprevisto durante lettura camera: {e}")
+                self.consecutive_failures += 1
+                time.sleep(0.01)
+                continue
+            
+            if stop.is_set():
+                # Fermato durante la lettura: il frame non va nello slot
+                break
+            
+            if ret and frame is not None:
+                timestamp = time.time()
+                with self._frame_lock:
+                    self._latest_frame = frame
+                    self._latest_timestamp = timestamp
+                    self._latest_seq += 1
+                self.consecutive_failures = 0
+            else:
+                self.consecutive_failures += 1
+                # Evita di girare a vuoto se la camera non restituisce frame
+                time.sleep(0.01)
+        
+        if orphaned.is_set() and cap is not None:
+            try:
+                cap.release()
+            except Exception:
+                pass
     
-    def read(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray]]:
+    def read_stamped(self, flip: bool = True) -> Tuple[bool, Optional[np.ndarray], float, int]:
         """
-        Legge un frame dalla camera.
+        Legge un frame dalla camera insieme al suo timestamp e numero di sequenza.
+        
+        In modalità threaded ritorna subito con l'ultimo frame acquisito: se il
+        numero di sequenza è uguale alla lettura precedente il frame non è nuovo.
         
         Args:
             flip: Se True, specchia il frame orizzontalmente
             
         Returns:
-            Tuple (success, frame)
+            Tuple (success, frame, timestamp_acquisizione, sequenza)
         """
+        if self.threaded:
+            with self._frame_lock:
+                frame = self._latest_frame
+                timestamp = self._latest_timestamp
+                seq = self._latest_seq
+            
+            if frame is None:
+                return False, None, 0.0, seq
+            
+            if flip:
+                frame = cv2.flip(frame, 1)
+            return True, frame, timestamp, seq
+        
         # Controlla prima se la camera è ancora aperta
         if not self.cap.isOpened():
             self.consecutive_failures = self.max_failures
-            return False, None
+            return False, None, 0.0, self._latest_seq
         
         try:
             ret, frame = self.cap.read()
+            timestamp = time.time()
             
             if ret and frame is not None:
                 self.consecutive_failures = 0
+                self._latest_seq += 1
+                self._latest_timestamp = timestamp
                 if flip:
                     frame = cv2.flip(frame, 1)
             else:
                 self.consecutive_failures += 1
             
-            return ret, frame
+            return ret, frame, timestamp, self._latest_seq
         except cv2.error as e:
             # Errore OpenCV durante la lettura (es. camera disconnessa)
             print(f"Errore OpenCV durante lettura camera: {e}")
             self.consecutive_failures = self.max_failures
-            return False, None
+            return False, None, 0.0, self._latest_seq
         except Exception as e:
             # Errore generico
             print(f"Errore imprevisto durante lettura camera: {e}")
             self.consecutive_failures += 1
-            return False, None
+            return False, None, 0.0, self._latest_seq
     
     def is_disconnected(self) -> bool:
         """Verifica se la camera sembra essere disconnessa."""
-        return self.consecutive_failures >= self.max_failures or not self.cap.isOpened()
+        return (self.consecutive_failures >= self.max_failures
+                or self.cap is None or not self.cap.isOpened())
     
     def switch_camera(self, new_index: int) -> bool:
         """
@@ -595,16 +1302,16 @@ class CameraManager:
             True se il cambio è riuscito, False altrimenti
         """
         try:
+            # Ferma l'acquisizione in background prima di toccare la camera
+            stopped = self._stop_capture_thread() if self.threaded else True
+            
             # Rilascia la camera attuale in modo sicuro
-            if self.cap is not None:
-                try:
-                    self.cap.release()
-                except:
-                    pass
+            self._release_capture(stopped)
             
             # Prova ad aprire la nuova camera
             self.cap = cv2.VideoCapture(new_index)
             if self.cap is None:
+                self._mark_unavailable()
                 return False
                 
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.desired_width)
@@ -618,13 +1325,28 @@ class CameraManager:
                     self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
                     self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
                     self.consecutive_failures = 0
+                    if self.threaded:
+                        self._start_capture_thread()
                     return True
             
+            self._mark_unavailable()
             return False
         except Exception as e:
             print(f"Errore durante switch camera a indice {new_index}: {e}")
+            self._mark_unavailable()
             return False
     
+    def _mark_unavailable(self):
+        """
+        Segna la camera come disconnessa dopo un cambio o una riconnessione fallita.
+        
+        Il thread di acquisizione è già fermo: senza svuotare lo slot,
+        read_stamped() continuerebbe a restituire l'ultimo frame come valido.
+        """
+        with self._frame_lock:
+            self._latest_frame = None
+        self.consecutive_failures = self.max_failures
+    
     def try_reconnect(self) -> bool:
         """
         Prova a riconnettere la camera attuale.
@@ -638,6 +1360,7 @@ class CameraManager:
             return self.switch_camera(self.camera_index)
         except Exception as e:
             print(f"Errore durante tentativo di riconnessione camera: {e}")
+            self._mark_unavailable()
             return False
     
     def get_health_status(self) -> dict:
@@ -658,8 +1381,8 @@ class CameraManager:
     def release(self):
         """Rilascia la camera in modo sicuro."""
         try:
-            if self.cap is not None:
-                self.cap.release()
+            stopped = self._stop_capture_thread() if self.threaded else True
+            self._release_capture(stopped)
         except Exception as e:
             print(f"Errore durante rilascio camera: {e}")
         finally:
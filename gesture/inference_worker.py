@@ -0,0 +1,239 @@
+"""
+Backend di inferenza MediaPipe in un processo separato.
+
+I frame vengono passati al worker tramite un ring buffer in memoria condivisa
+(multiprocessing.shared_memory), quindi i pixel non vengono mai serializzati:
+sulle code viaggiano solo l'indice dello slot e pochi metadati. I risultati
+tornano indietro come array compatti di landmark (N, 21, 3) float32.
+"""
+
+import multiprocessing
+import queue
+from collections import deque, namedtuple
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Risultato di inferenza restituito al processo principale
+InferenceResult = namedtuple(
+    'InferenceResult',
+    ['seq', 'timestamp', 'landmarks', 'handedness', 'scores']
+)
+
+
+def _worker_main(shm_name: str,
+                 slot_shape: Tuple[int, int, int],
+                 num_slots: int,
+                 request_queue,
+                 result_queue,
+                 hands_options: dict):
+    """
+    Entry point del processo worker: esegue MediaPipe Hands sui frame condivisi.
+
+    Protocollo:
+        request_queue riceve (slot, seq, timestamp) oppure None per terminare.
+        result_queue riceve ('ready', None), ('result', ...), ('skipped', slot)
+        oppure ('error', messaggio).
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = np.ndarray((num_slots, *slot_shape), dtype=np.uint8, buffer=shm.buf)
+    hands = None
+
+    try:
+        import mediapipe as mp
+        hands = mp.solutions.hands.Hands(static_image_mode=False, **hands_options)
+        result_queue.put(('ready', None))
+
+        running = True
+        while running:
+            request = request_queue.get()
+            if request is None:
+                break
+
+            # Se il worker è rimasto indietro, elabora solo il frame più recente
+            # e restituisce subito gli slot dei frame scartati
+            while True:
+                try:
+                    newer = request_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    running = False
+                    break
+                result_queue.put(('skipped', request[0]))
+                request = newer
+
+            slot, seq, timestamp = request
+            results = hands.process(frames[slot])
+
+            landmarks = np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32)
+            handedness = []
+            scores = []
+            if results.multi_hand_landmarks:
+                landmarks = np.array(
+                    [[(lm.x, lm.y, lm.z) for lm in hand.landmark]
+                     for hand in results.multi_hand_landmarks],
+                    dtype=np.float32
+                )
+                for hand_class in results.multi_handedness:
+                    handedness.append(hand_class.classification[0].label)
+                    scores.append(hand_class.classification[0].score)
+
+            result_queue.put(('result', (slot, seq, timestamp, landmarks, handedness, scores)))
+    except Exception as e:
+        result_queue.put(('error', str(e)))
+    finally:
+        if hands is not None:
+            hands.close()
+        del frames
+        shm.close()
+
+
+class InferenceWorker:
+    """
+    Gestisce il processo worker di MediaPipe e il ring buffer dei frame.
+
+    submit() e poll() non bloccano mai: se tutti gli slot sono occupati il
+    frame viene scartato, e poll() restituisce solo i risultati già pronti.
+    """
+
+    def __init__(self,
+                 frame_shape: Tuple[int, int] = (480, 640),
+                 num_slots: int = 3,
+                 max_hands: int = 1,
+                 detection_confidence: float = 0.7,
+                 tracking_confidence: float = 0.7):
+        """
+        Avvia il processo worker.
+
+        Args:
+            frame_shape: (altezza, larghezza) dei frame nel ring buffer
+            num_slots: Numero di slot del ring buffer
+            max_hands: Numero massimo di mani da rilevare
+            detection_confidence: Soglia di confidenza per il rilevamento
+            tracking_confidence: Soglia di confidenza per il tracking
+        """
+        height, width = frame_shape[:2]
+        self.slot_shape = (height, width, 3)
+        self.num_slots = num_slots
+
+        slot_size = height * width * 3
+        self._shm = shared_memory.SharedMemory(create=True, size=slot_size * num_slots)
+        self._frames = np.ndarray((num_slots, *self.slot_shape), dtype=np.uint8,
+                                  buffer=self._shm.buf)
+        self._free_slots = deque(range(num_slots))
+
+        # 'spawn' evita di duplicare nel worker lo stato di pygame e dei thread
+        ctx = multiprocessing.get_context('spawn')
+        self._requests = ctx.Queue()
+        self._results = ctx.Queue()
+
+        hands_options = {
+            'max_num_hands': max_hands,
+            'min_detection_confidence': detection_confidence,
+            'min_tracking_confidence': tracking_confidence,
+        }
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(self._shm.name, self.slot_shape, num_slots,
+                  self._requests, self._results, hands_options),
+            name='mediapipe-worker',
+            daemon=True
+        )
+        self._process.start()
+
+        self._seq = 0
+        self._pending_result: Optional[InferenceResult] = None
+        self.ready = False
+        self.error: Optional[str] = None
+
+    def _drain_results(self):
+        """Legge tutti i messaggi disponibili dal worker e libera gli slot."""
+        while True:
+            try:
+                kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'result':
+                slot, seq, timestamp, landmarks, handedness, scores = payload
+                self._free_slots.append(slot)
+                if self._pending_result is None or seq > self._pending_result.seq:
+                    self._pending_result = InferenceResult(seq, timestamp, landmarks,
+                                                           handedness, scores)
+            elif kind == 'skipped':
+                self._free_slots.append(payload)
+            elif kind == 'ready':
+                self.ready = True
+            elif kind == 'error':
+                self.error = payload
+                print(f"Errore nel worker di inferenza: {payload}")
+
+    def submit(self, frame: np.ndarray, timestamp: float) -> bool:
+        """
+        Copia un frame BGR nel ring buffer (convertendolo in RGB) e lo accoda.
+
+        Args:
+            frame: Frame BGR da OpenCV
+            timestamp: Timestamp di acquisizione del frame
+
+        Returns:
+            True se il frame è stato accodato, False se scartato
+        """
+        self._drain_results()
+        if self.error is not None or not self._free_slots:
+            return False
+
+        slot = self._free_slots.popleft()
+        target = self._frames[slot]
+
+        # Conversione colore scritta direttamente nella memoria condivisa;
+        # i landmark sono normalizzati, quindi un eventuale resize non li altera
+        if frame.shape[:2] == target.shape[:2]:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=target)
+        else:
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            cv2.resize(rgb, (self.slot_shape[1], self.slot_shape[0]), dst=target)
+
+        self._seq += 1
+        self._requests.put((slot, self._seq, timestamp))
+        return True
+
+    def poll(self) -> Optional[InferenceResult]:
+        """
+        Restituisce il risultato più recente arrivato dall'ultima chiamata.
+
+        Returns:
+            InferenceResult oppure None se non ci sono risultati nuovi
+        """
+        self._drain_results()
+        result = self._pending_result
+        self._pending_result = None
+        return result
+
+    def is_alive(self) -> bool:
+        """Verifica se il processo worker è ancora attivo."""
+        return self._process.is_alive() and self.error is None
+
+    def close(self):
+        """Ferma il worker e rilascia la memoria condivisa."""
+        try:
+            if self._process.is_alive():
+                self._requests.put(None)
+                self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout=1.0)
+        except Exception as e:
+            print(f"Errore durante chiusura worker di inferenza: {e}")
+        finally:
+            self._frames = None
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
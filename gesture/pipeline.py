@@ -0,0 +1,286 @@
+"""
+Pipeline a tre stadi: acquisizione, inferenza e rendering.
+
+Acquisizione e inferenza girano in thread dedicati, il rendering e la logica
+di gioco restano nel thread principale. Gli stadi sono collegati da code
+"ultimo valore" di capacità uno: chi produce sovrascrive il valore non ancora
+letto, quindi nessuno stadio accumula ritardo e il rendering non aspetta mai
+l'inferenza. Ogni risultato porta il timestamp del frame da cui è nato.
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+from typing import Optional, Tuple, Dict
+
+import numpy as np
+
+# Frame acquisito: immagine BGR, timestamp di acquisizione e numero di sequenza
+FramePacket = namedtuple('FramePacket', ['frame', 'timestamp', 'seq'])
+
+# Risultato dell'inferenza riferito al frame di origine
+GestureResult = namedtuple(
+    'GestureResult',
+    ['timestamp', 'hands', 'gesture', 'confidence']
+)
+
+
+class LatestValue:
+    """
+    Coda limitata a un solo elemento.
+
+    put() sostituisce il valore precedente (contando quelli mai letti),
+    take() consuma il valore più recente, peek() lo legge senza consumarlo.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value = None
+        self._version = 0
+        self._taken_version = 0
+        self.dropped = 0
+
+    def put(self, value):
+        """Pubblica un nuovo valore, scartando quello non ancora letto."""
+        with self._cond:
+            if self._version != self._taken_version:
+                self.dropped += 1
+            self._value = value
+            self._version += 1
+            self._cond.notify_all()
+
+    def take(self, timeout: Optional[float] = 0.0):
+        """
+        Consuma il valore più recente.
+
+        Args:
+            timeout: Attesa massima in secondi per un valore nuovo
+                     (0 = non bloccare, None = attesa illimitata)
+
+        Returns:
+            Il valore oppure None se non ce ne sono di nuovi
+        """
+        with self._cond:
+            if self._version == self._taken_version:
+                if timeout == 0.0:
+                    return None
+                self._cond.wait_for(lambda: self._version != self._taken_version, timeout)
+                if self._version == self._taken_version:
+                    return None
+            self._taken_version = self._version
+            return self._value
+
+    def peek(self):
+        """Restituisce il valore più recente senza consumarlo (None se vuota)."""
+        with self._cond:
+            return self._value
+
+    def clear(self):
+        """Svuota la coda."""
+        with self._cond:
+            self._value = None
+            self._taken_version = self._version
+
+
+class RateMeter:
+    """Misura la frequenza di un evento (Hz) su una finestra scorrevole."""
+
+    def __init__(self, window: float = 1.0):
+        """
+        Args:
+            window: Durata della finestra di misura in secondi
+        """
+        self.window = window
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def tick(self, now: Optional[float] = None):
+        """Registra un evento."""
+        if now is None:
+            now = time.perf_counter()
+        with self._lock:
+            self._times.append(now)
+            self._trim(now)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Restituisce gli eventi al secondo nell'ultima finestra."""
+        if now is None:
+            now = time.perf_counter()
+        with self._lock:
+            self._trim(now)
+            return len(self._times) / self.window
+
+    def _trim(self, now: float):
+        limit = now - self.window
+        while self._times and self._times[0] < limit:
+            self._times.popleft()
+
+
+class GesturePipeline:
+    """
+    Esegue acquisizione e inferenza in thread separati dal game loop.
+
+    Il thread di acquisizione legge dalla sorgente impostata con set_source()
+    e pubblica ogni frame nuovo; il thread di inferenza elabora sempre il
+    frame più recente (quelli intermedi vengono saltati) e pubblica mani e
+    gesto riconosciuto. Il game loop legge entrambi senza bloccare.
+
+    Le operazioni che modificano la sorgente (rilascio, cambio camera,
+    riconnessione) vanno eseguite dopo set_source(None), che attende la fine
+    della lettura in corso.
+    """
+
+    def __init__(self, detector, scheduler=None, profiler=None):
+        """
+        Args:
+            detector: HandDetector usato solo dal thread di inferenza
+            scheduler: InferenceScheduler opzionale che limita la frequenza di inferenza
+            profiler: StageProfiler opzionale in cui registrare find_hands e recognize_gesture
+        """
+        self.detector = detector
+        self.scheduler = scheduler
+        self.profiler = profiler
+
+        self.frames = LatestValue()
+        self.results = LatestValue()
+        self.meters: Dict[str, RateMeter] = {
+            'capture': RateMeter(),
+            'inference': RateMeter(),
+            'render': RateMeter(),
+        }
+
+        self._source = None
+        self._flip = True
+        self._source_lock = threading.Lock()
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        """Avvia i thread di acquisizione e inferenza."""
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name='pipeline-capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='pipeline-inference', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Ferma i thread e attende la loro terminazione."""
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        self.set_source(None)
+
+    def set_source(self, source, flip: bool = True):
+        """
+        Imposta la sorgente dei frame (FrameSource o None).
+
+        Attende che la lettura in corso termini, quindi al ritorno il thread
+        di acquisizione non sta usando la sorgente precedente.
+        """
+        if source is self._source and flip == self._flip:
+            return
+        with self._source_lock:
+            if source is not self._source:
+                self.frames.clear()
+            self._source = source
+            self._flip = flip
+
+    def latest_frame(self) -> Tuple[bool, Optional[np.ndarray], float, int]:
+        """
+        Restituisce l'ultimo frame acquisito senza consumarlo.
+
+        Il frame è condiviso con il thread di inferenza: va copiato prima di
+        modificarlo.
+
+        Returns:
+            Tuple (success, frame, timestamp_acquisizione, sequenza) come read_stamped()
+        """
+        packet = self.frames.peek()
+        if packet is None:
+            return False, None, 0.0, 0
+        return True, packet.frame, packet.timestamp, packet.seq
+
+    def poll_result(self) -> Optional[GestureResult]:
+        """Restituisce il risultato di inferenza più recente, o None se non ce ne sono di nuovi."""
+        return self.results.take()
+
+    def tick_render(self):
+        """Registra un frame disegnato dal game loop."""
+        self.meters['render'].tick()
+
+    def get_rates(self) -> Dict[str, float]:
+        """Restituisce la frequenza (Hz) di ogni stadio."""
+        now = time.perf_counter()
+        return {name: meter.rate(now) for name, meter in self.meters.items()}
+
+    def _capture_loop(self):
+        """Ciclo di acquisizione: pubblica ogni frame nuovo della sorgente."""
+        last_key = None
+        while self._running:
+            ok = False
+            with self._source_lock:
+                source = self._source
+                if source is not None:
+                    try:
+                        ok, frame, timestamp, seq = source.read_stamped(flip=self._flip)
+                    except Exception as e:
+                        print(f"Errore durante acquisizione frame: {e}")
+                        ok = False
+
+            if source is None:
+                time.sleep(0.05)
+                continue
+
+            # Le sorgenti threaded restituiscono lo stesso frame finché non ne arriva uno nuovo
+            key = (id(source), seq) if ok else None
+            if ok and frame is not None and key != last_key:
+                last_key = key
+                self.frames.put(FramePacket(frame, timestamp, seq))
+                self.meters['capture'].tick()
+            else:
+                time.sleep(0.002)
+
+    def _inference_loop(self):
+        """Ciclo di inferenza: elabora sempre il frame più recente."""
+        last_result_id = self.detector.result_id
+        while self._running:
+            packet = self.frames.take(timeout=0.1)
+            if packet is None:
+                continue
+            if self.scheduler is not None and not self.scheduler.should_run():
+                continue
+
+            try:
+                start = time.perf_counter()
+                _, hands = self.detector.find_hands(packet.frame, draw=False,
+                                                    timestamp=packet.timestamp)
+                self._record('find_hands', start)
+                # Backend 'process': il risultato può essere ancora quello precedente
+                if self.detector.result_id == last_result_id:
+                    continue
+                last_result_id = self.detector.result_id
+
+                gesture, confidence = 'none', 0.0
+                if hands:
+                    start = time.perf_counter()
+                    gesture, confidence = self.detector.recognize_gesture(
+                        hands[0]['points'], packet.frame.shape
+                    )
+                    self._record('recognize_gesture', start)
+            except Exception as e:
+                print(f"Errore durante inferenza: {e}")
+                continue
+
+            self.results.put(GestureResult(self.detector.result_timestamp,
+                                           hands, gesture, confidence))
+            self.meters['inference'].tick()
+
+    def _record(self, stage: str, start: float):
+        """Registra nel profiler la durata di una fase iniziata a start."""
+        if self.profiler is not None:
+            self.profiler.record(stage, time.perf_counter() - start)
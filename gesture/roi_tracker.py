@@ -0,0 +1,160 @@
+"""
+Tracking della regione della mano (ROI) per ridurre l'area elaborata da MediaPipe.
+
+Dopo che una mano è stata trovata, i frame successivi vengono convertiti ed
+elaborati solo nel riquadro attorno agli ultimi landmark (con un margine).
+Quando il tracking si perde, o periodicamente, si torna al frame intero.
+
+Il riquadro resta fermo finché la mano ci sta comodamente dentro: lo stato di
+tracking di MediaPipe è espresso in coordinate normalizzate dell'immagine
+precedente, e un ritaglio che cambia a ogni frame lo invaliderebbe.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Riquadro in pixel: (x0, y0, x1, y1), estremi superiori esclusi
+ROI = Tuple[int, int, int, int]
+
+
+class HandROITracker:
+    """
+    Calcola il ritaglio da passare a MediaPipe e rimappa i landmark.
+    """
+
+    # Il ritaglio viene ricalcolato se la mano si avvicina al bordo oltre questa
+    # frazione del lato, o se il lato ideale cambia oltre RESIZE_TOLERANCE
+    EDGE_MARGIN = 0.1
+    RESIZE_TOLERANCE = 0.25
+
+    def __init__(self,
+                 padding: float = 0.35,
+                 refresh_frames: int = 30,
+                 min_size: float = 0.3):
+        """
+        Inizializza il tracker.
+
+        Args:
+            padding: Margine aggiunto su ogni lato, in frazione del lato del riquadro
+            refresh_frames: Ogni quanti frame forzare un rilevamento sul frame intero
+            min_size: Lato minimo del ritaglio, in frazione dell'altezza del frame
+        """
+        self.padding = padding
+        self.refresh_frames = refresh_frames
+        self.min_size = min_size
+
+        # Riquadro normalizzato (x0, y0, x1, y1) delle ultime mani trovate
+        self._bbox: Optional[np.ndarray] = None
+        self._frames_since_full = 0
+        self._roi: Optional[ROI] = None  # Ritaglio in uso, mantenuto tra i frame
+
+    def get_roi(self, frame_shape: Tuple[int, ...]) -> Optional[ROI]:
+        """
+        Restituisce il ritaglio da elaborare per il prossimo frame.
+
+        Args:
+            frame_shape: Shape del frame (altezza, larghezza, ...)
+
+        Returns:
+            Riquadro in pixel, oppure None per elaborare il frame intero
+        """
+        if self._bbox is None or self._frames_since_full >= self.refresh_frames:
+            self._roi = None
+            return None
+
+        h, w = frame_shape[:2]
+        x0, y0, x1, y1 = self._bbox * (w, h, w, h)
+        ideal = self._fit_roi(x0, y0, x1, y1, w, h)
+        if ideal is None:
+            self._roi = None
+            return None
+
+        if self._roi is not None and self._can_keep(self._roi, ideal, (x0, y0, x1, y1), w, h):
+            return self._roi
+        self._roi = ideal
+        return ideal
+
+    def _fit_roi(self, x0: float, y0: float, x1: float, y1: float,
+                 w: int, h: int) -> Optional[ROI]:
+        """Ritaglio quadrato centrato sulla mano, con margine (None se non conviene)."""
+        side = max(x1 - x0, y1 - y0)
+        side = max(side * (1.0 + 2.0 * self.padding), self.min_size * h)
+        side = min(side, w, h)
+        cx = (x0 + x1) / 2.0
+        cy = (y0 + y1) / 2.0
+
+        left = int(np.clip(cx - side / 2.0, 0, w - side))
+        top = int(np.clip(cy - side / 2.0, 0, h - side))
+        size = int(side)
+
+        # Se il ritaglio copre quasi tutto il frame non conviene
+        if size * size >= 0.8 * w * h:
+            return None
+
+        return left, top, left + size, top + size
+
+    def _can_keep(self, roi: ROI, ideal: ROI, bbox: Tuple[float, float, float, float],
+                  w: int, h: int) -> bool:
+        """Verifica se il ritaglio in uso contiene ancora bene la mano."""
+        rx0, ry0, rx1, ry1 = roi
+        if rx1 > w or ry1 > h:
+            return False  # Risoluzione cambiata
+
+        size = rx1 - rx0
+        ideal_size = ideal[2] - ideal[0]
+        if abs(ideal_size - size) > self.RESIZE_TOLERANCE * size:
+            return False
+
+        margin = self.EDGE_MARGIN * size
+        x0, y0, x1, y1 = bbox
+        return (x0 >= rx0 + margin and y0 >= ry0 + margin and
+                x1 <= rx1 - margin and y1 <= ry1 - margin)
+
+    def remap_landmarks(self, hand_landmarks, roi: ROI, frame_shape: Tuple[int, ...]):
+        """
+        Riporta sul posto i landmark dal ritaglio alle coordinate del frame intero.
+
+        Args:
+            hand_landmarks: Landmark MediaPipe normalizzati rispetto al ritaglio
+            roi: Riquadro usato per il ritaglio
+            frame_shape: Shape del frame intero
+        """
+        h, w = frame_shape[:2]
+        x0, y0, x1, y1 = roi
+        crop_w = x1 - x0
+        crop_h = y1 - y0
+
+        # z ha la stessa scala di x: va riscalato con la larghezza
+        for lm in hand_landmarks.landmark:
+            lm.x = (lm.x * crop_w + x0) / w
+            lm.y = (lm.y * crop_h + y0) / h
+            lm.z = lm.z * crop_w / w
+
+    def update(self, points: List[np.ndarray], roi: Optional[ROI]):
+        """
+        Aggiorna il riquadro con le mani trovate nel frame corrente.
+
+        Args:
+            points: Array (21, 3) delle mani trovate, in coordinate del frame intero
+            roi: Riquadro elaborato (None se frame intero)
+        """
+        if roi is None:
+            self._frames_since_full = 0
+        else:
+            self._frames_since_full += 1
+
+        if not points:
+            # Tracking perso: il prossimo frame verrà elaborato per intero
+            self._bbox = None
+            self._roi = None
+            return
+
+        all_points = np.concatenate([p[:, :2] for p in points])
+        self._bbox = np.concatenate([all_points.min(axis=0), all_points.max(axis=0)])
+
+    def reset(self):
+        """Forza un rilevamento sul frame intero al prossimo frame."""
+        self._bbox = None
+        self._frames_since_full = 0
+        self._roi = None
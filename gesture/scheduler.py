@@ -0,0 +1,93 @@
+"""
+Pianificazione della frequenza di inferenza in base allo stato del gioco.
+
+Il rilevamento delle mani serve a piena frequenza solo quando il gesto viene
+effettivamente usato (partita, countdown, turno a tempo). Negli altri stati
+l'inferenza viene eseguita a frequenza ridotta o sospesa del tutto, e i frame
+saltati riutilizzano gli ultimi landmark disponibili.
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class InferenceScheduler:
+    """
+    Decide, frame per frame, se eseguire l'inferenza MediaPipe.
+
+    Ogni stato ha una frequenza obiettivo:
+        None  -> ogni frame (piena frequenza)
+        0     -> inferenza sospesa
+        x > 0 -> al massimo x inferenze al secondo
+    """
+
+    def __init__(self, rates: Dict[str, Optional[float]], default_rate: Optional[float] = None):
+        """
+        Inizializza lo scheduler.
+
+        Args:
+            rates: Frequenza obiettivo (Hz) per nome dello stato (es. 'MENU')
+            default_rate: Frequenza per gli stati non elencati
+        """
+        self.rates = dict(rates)
+        self.default_rate = default_rate
+
+        self.state_name: Optional[str] = None
+        self.rate = default_rate
+        self.last_run_time = 0.0
+
+    def get_rate(self, state_name: str) -> Optional[float]:
+        """Restituisce la frequenza obiettivo per uno stato."""
+        return self.rates.get(state_name, self.default_rate)
+
+    def set_state(self, state_name: str) -> bool:
+        """
+        Aggiorna lo stato corrente.
+
+        Al cambio di stato lo scheduler si azzera, così il primo frame del
+        nuovo stato viene sempre analizzato (se la frequenza non è zero).
+
+        Args:
+            state_name: Nome dello stato del gioco
+
+        Returns:
+            True se lo stato è cambiato
+        """
+        if state_name == self.state_name:
+            return False
+
+        self.state_name = state_name
+        self.rate = self.get_rate(state_name)
+        self.last_run_time = 0.0
+        return True
+
+    def should_run(self, now: Optional[float] = None) -> bool:
+        """
+        Verifica se il frame corrente va analizzato e, in caso, registra l'esecuzione.
+
+        Args:
+            now: Timestamp corrente (default: time.time())
+
+        Returns:
+            True se eseguire l'inferenza su questo frame
+        """
+        if self.rate is None:
+            return True
+        if self.rate <= 0:
+            return False
+
+        if now is None:
+            now = time.time()
+
+        interval = 1.0 / self.rate
+        elapsed = now - self.last_run_time
+        if elapsed < interval:
+            return False
+
+        # Avanza di un intervallo per non perdere frequenza quando il periodo
+        # non è multiplo di quello del game loop; dopo una pausa lunga riparte da now
+        if elapsed < 2 * interval:
+            self.last_run_time += interval
+        else:
+            self.last_run_time = now
+        return True
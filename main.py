@@ -12,22 +12,36 @@ Controlli:
 import pygame
 import sys
 import time
+import multiprocessing
+from contextlib import contextmanager
 from typing import Optional
 
 # Moduli del gioco
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FPS, FULLSCREEN,
-    CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FLIP,
+    CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FLIP, CAMERA_THREADED, PIPELINED_LOOP,
+    CAMERA_HOTPLUG, CAMERA_HOTPLUG_FALLBACK_INTERVAL,
+    CAMERA_REPLAY_FILE, CAMERA_REPLAY_REALTIME, CAMERA_REPLAY_LOOP, CAMERA_RECORD_FILE,
     GESTURE_HOLD_TIME, COUNTDOWN_TIME, ROUNDS_TO_WIN,
     HIGHSCORE_FILE, MAX_HIGHSCORES, DEBUG_MODE, SHOW_FPS,
-    GAME_SETTINGS, GameMode, TimedDifficulty, CPU_MOVE_TIMER
+    HIGHSCORE_ASYNC_SAVE, HIGHSCORE_BACKEND, HIGHSCORE_DB_FILE, HIGHSCORE_DB_CAPACITY,
+    GAME_JOURNAL_FILE, GAME_JOURNAL_SNAPSHOT_EVERY,
+    PROFILER_ENABLED, PROFILER_HISTORY, PROFILER_DUMP_FILE,
+    GAME_SETTINGS, GameMode, TimedDifficulty, CPU_MOVE_TIMER, GESTURE_DETECTION,
+    INFERENCE_RATES, INFERENCE_IDLE_RATE
 )
 from gesture.hand_detector import HandDetector, CameraManager
-from game.game_logic import GameLogic, Move
+from gesture.scheduler import InferenceScheduler
+from gesture.pipeline import GesturePipeline
+from gesture.camera_hotplug import CameraHotplugWatcher
+from gesture.frame_source import FileFrameSource, FrameRecorder, RecordingFrameSource
+from game.game_logic import GameLogic, Move, RoundResult
 from game.game_state import GameState, StateManager
 from game.highscore import HighScoreManager
+from game.journal import GameJournal
 from ui.renderer import Renderer
 from ui.screens import ScreenManager
+from ui.profiler import StageProfiler
 
 
 class MorraCineseGame:
@@ -48,6 +62,9 @@ class MorraCineseGame:
         self.clock = pygame.time.Clock()
         self.running = True
         
+        # Durata delle fasi del game loop (ring buffer a dimensione fissa)
+        self.profiler = StageProfiler(PROFILER_HISTORY, enabled=PROFILER_ENABLED)
+        
         # Inizializza i componenti
         self._init_camera()
         self._init_hand_detector()
@@ -56,10 +73,14 @@ class MorraCineseGame:
         
         # Variabili di stato
         self.current_frame = None
+        self.current_frame_time = 0.0  # Timestamp di acquisizione del frame corrente
+        self.current_frame_seq = 0  # Numero di sequenza del frame corrente
+        self._frame_pending = False  # True se il frame corrente non è ancora stato analizzato
         self.current_gesture = 'none'
         self.current_gesture_confidence = 0.0
         self.gesture_progress = 0.0
         self.last_confirmed_gesture = None
+        self.last_confirmed_gesture_time = 0.0  # Timestamp del frame che ha confermato il gesto
         self.last_frame_time = time.time()
         self.previous_state_before_camera_error = None  # Stato precedente prima dell'errore camera
         
@@ -75,57 +96,112 @@ class MorraCineseGame:
         self._camera_notification_time = 0
     
     def _init_camera(self):
-        """Inizializza la camera."""
-        # Rileva camera disponibili
-        print("Ricerca camera disponibili...")
-        try:
-            available_cameras = CameraManager.get_available_cameras()
-        except Exception as e:
-            print(f"Errore durante ricerca camera: {e}")
-            available_cameras = []
+        """
+        Avvia la ricerca delle camera senza bloccare l'avvio.
         
-        GAME_SETTINGS.available_cameras = available_cameras
+        La camera viene aperta da _update_camera() quando la ricerca termina;
+        nel frattempo il menu mostra l'indicatore di ricerca.
+        """
+        self.camera = None
+        self.frame_recorder = None  # Unico per sessione, condiviso tra le riconnessioni
+        self._camera_scan = None  # Future della ricerca camera in corso
+        self._camera_scan_purposes = set()  # Scopi serviti dalla ricerca in corso
+        self._pending_scans = {}  # Richieste in attesa: scopo -> (max_cameras, indici)
+        self.hotplug_watcher = None
+        
+        # Riproduzione di una registrazione al posto della camera
+        if CAMERA_REPLAY_FILE:
+            try:
+                self.camera = FileFrameSource(
+                    CAMERA_REPLAY_FILE,
+                    realtime=CAMERA_REPLAY_REALTIME,
+                    loop=CAMERA_REPLAY_LOOP
+                )
+                print(f"Riproduzione da file: {CAMERA_REPLAY_FILE} "
+                      f"({self.camera.width}x{self.camera.height})")
+                return
+            except RuntimeError as e:
+                print(f"Attenzione: riproduzione non disponibile - {e}")
         
-        if available_cameras:
-            print(f"Trovate {len(available_cameras)} camera:")
-            for idx, name in available_cameras:
-                print(f"  - {name}")
-            
-            # Usa la camera configurata o la prima disponibile
-            camera_index = GAME_SETTINGS.camera_index
-            if camera_index not in [c[0] for c in available_cameras]:
-                camera_index = available_cameras[0][0]
-                GAME_SETTINGS.camera_index = camera_index
-        else:
-            camera_index = CAMERA_INDEX
+        # Su Linux i collegamenti delle camera arrivano da /dev/video*
+        if CAMERA_HOTPLUG:
+            watcher = CameraHotplugWatcher()
+            if watcher.supported:
+                self.hotplug_watcher = watcher
         
-        try:
-            self.camera = CameraManager(
-                camera_index=camera_index,
-                width=CAMERA_WIDTH,
-                height=CAMERA_HEIGHT
-            )
-            print(f"Camera inizializzata: {self.camera.width}x{self.camera.height}")
-        except RuntimeError as e:
-            print(f"Attenzione: Camera non disponibile - {e}")
-            print("Il gioco funzionera con controlli da tastiera.")
-            self.camera = None
+        print("Ricerca camera disponibili...")
+        self._start_camera_scan('init')
     
     def _init_hand_detector(self):
         """Inizializza il rilevatore di mani."""
         self.hand_detector = HandDetector(
             max_hands=1,
             detection_confidence=0.7,
-            tracking_confidence=0.7
+            tracking_confidence=0.7,
+            backend=GESTURE_DETECTION.get('inference_backend', 'inline'),
+            frame_shape=(CAMERA_HEIGHT, CAMERA_WIDTH),
+            roi_tracking=GESTURE_DETECTION.get('roi_tracking', False),
+            background_load=True  # Il menu appare subito, il modello arriva dopo
         )
+        self._last_result_id = self.hand_detector.result_id
+        
+        # Frequenza di inferenza ridotta negli stati in cui il gesto non serve
+        self.inference_scheduler = InferenceScheduler(INFERENCE_RATES, INFERENCE_IDLE_RATE)
+        
+        # Acquisizione e inferenza in thread separati dal game loop
+        self.pipeline = None
+        if PIPELINED_LOOP:
+            self.pipeline = GesturePipeline(self.hand_detector, self.inference_scheduler,
+                                            profiler=self.profiler)
+            self.pipeline.start()
+    
+    @contextmanager
+    def _capture_paused(self):
+        """
+        Sospende la lettura della camera da parte della pipeline.
+        
+        Va usato attorno alle operazioni che rilasciano o riaprono la camera;
+        all'uscita la pipeline riprende dalla camera corrente.
+        """
+        if self.pipeline is None:
+            yield
+            return
+        self.pipeline.set_source(None)
+        try:
+            yield
+        finally:
+            self.pipeline.set_source(self.camera, GAME_SETTINGS.camera_flip)
     
     def _init_game_systems(self):
         """Inizializza i sistemi di gioco."""
         self.game_logic = GameLogic(rounds_to_win=ROUNDS_TO_WIN)
         self.state_manager = StateManager()
-        self.highscore_manager = HighScoreManager(
+        self.highscore_manager = self._create_highscore_manager()
+        self.journal = GameJournal(
+            filename=GAME_JOURNAL_FILE,
+            snapshot_every=GAME_JOURNAL_SNAPSHOT_EVERY,
+            async_save=HIGHSCORE_ASYNC_SAVE
+        )
+        self.last_game_id = None  # Partita del registro a cui associare il nome del record
+    
+    def _create_highscore_manager(self):
+        """Crea la classifica con il backend configurato (JSON se SQLite non è disponibile)."""
+        if HIGHSCORE_BACKEND == 'sqlite':
+            try:
+                from game.highscore_db import SQLiteHighScoreManager
+                return SQLiteHighScoreManager(
+                    filename=HIGHSCORE_DB_FILE,
+                    max_entries=MAX_HIGHSCORES,
+                    capacity=HIGHSCORE_DB_CAPACITY,
+                    import_json=HIGHSCORE_FILE
+                )
+            except Exception as e:
+                print(f"Attenzione: classifica SQLite non disponibile - {e}")
+        
+        return HighScoreManager(
             filename=HIGHSCORE_FILE,
-            max_entries=MAX_HIGHSCORES
+            max_entries=MAX_HIGHSCORES,
+            async_save=HIGHSCORE_ASYNC_SAVE
         )
     
     def _init_ui(self):
@@ -135,7 +211,8 @@ class MorraCineseGame:
             self.renderer,
             self.state_manager,
             self.game_logic,
-            self.highscore_manager
+            self.highscore_manager,
+            self.journal
         )
     
     def run(self):
@@ -150,14 +227,17 @@ class MorraCineseGame:
             self.last_frame_time = current_time
             
             # Gestione eventi
-            self._handle_events()
+            with self.profiler.measure('events'):
+                self._handle_events()
             
             # Aggiorna camera e gesti
-            self._update_camera()
+            with self.profiler.measure('camera'):
+                self._update_camera()
             self._update_gesture_detection()
             
             # Aggiorna logica di gioco
-            self._update_game_logic()
+            with self.profiler.measure('game_logic'):
+                self._update_game_logic()
             
             # Rendering
             self._render(dt)
@@ -180,6 +260,11 @@ class MorraCineseGame:
         """Gestisce gli eventi da tastiera."""
         current_state = self.state_manager.current_state
         
+        # F3 mostra/nasconde le statistiche del profiler
+        if event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+            return
+        
         # ESC per uscire (tranne in CAMERA_ERROR che ha gestione propria)
         if event.key == pygame.K_ESCAPE and current_state != GameState.CAMERA_ERROR:
             if current_state == GameState.MENU:
@@ -290,6 +375,10 @@ class MorraCineseGame:
                 self.screen_manager.highscore_filter_left()
             elif event.key == pygame.K_RIGHT:
                 self.screen_manager.highscore_filter_right()
+            elif event.key in (pygame.K_UP, pygame.K_PAGEUP):
+                self.screen_manager.highscore_page_up()
+            elif event.key in (pygame.K_DOWN, pygame.K_PAGEDOWN):
+                self.screen_manager.highscore_page_down()
             elif event.key == pygame.K_RETURN:
                 if current_state == GameState.GAME_OVER:
                     self._check_and_save_highscore()
@@ -304,7 +393,9 @@ class MorraCineseGame:
             camera_index: Indice della nuova camera
         """
         if self.camera:
-            if self.camera.switch_camera(camera_index):
+            with self._capture_paused():
+                switched = self.camera.switch_camera(camera_index)
+            if switched:
                 print(f"Camera cambiata a indice {camera_index}")
             else:
                 print(f"Impossibile cambiare alla camera {camera_index}")
@@ -316,30 +407,138 @@ class MorraCineseGame:
     def _refresh_cameras_in_settings(self):
         """
         Aggiorna la lista delle camera disponibili mentre si è nelle impostazioni.
-        Non rilascia la camera corrente, ma cerca nuove camera.
+        Non rilascia la camera corrente, ma cerca nuove camera in background.
         """
         print("Aggiornamento lista camera...")
+        self._start_camera_scan('settings')
+    
+    def _start_camera_scan(self, purpose: str, max_cameras: int = 10,
+                           indices: Optional[list] = None):
+        """
+        Richiede una ricerca camera in background.
         
-        # Salva la camera corrente
-        current_camera_index = GAME_SETTINGS.camera_index if self.camera else -1
+        Le richieste arrivate mentre una ricerca è in corso vengono accodate e
+        servite da una ricerca successiva: ogni scopo riceve il risultato di una
+        ricerca avviata dopo la sua richiesta, sugli indici che gli servono.
+        
+        Args:
+            purpose: 'init', 'auto', 'hotplug', 'settings' o 'error'
+            max_cameras: Numero massimo di camera da controllare
+            indices: Indici specifici da controllare (solo 'hotplug')
+        """
+        if purpose in self._pending_scans:
+            # Stessa richiesta già in coda: si uniscono gli ambiti
+            queued_max, queued_indices = self._pending_scans[purpose]
+            max_cameras = max(max_cameras, queued_max)
+            if indices is None or queued_indices is None:
+                indices = None
+            else:
+                indices = sorted(set(indices) | set(queued_indices))
+        self._pending_scans[purpose] = (max_cameras, indices)
+        self._launch_camera_scan()
+    
+    def _launch_camera_scan(self):
+        """
+        Avvia una ricerca per tutte le richieste in coda, se possibile.
+        
+        Non parte se c'è già una ricerca in corso o se verifiche precedenti
+        sono ancora bloccate (riprova a ogni frame da _poll_camera_scan).
+        """
+        if not self._pending_scans or self._camera_scan is not None:
+            return
+        if CameraManager.probes_pending():
+            return
+        
+        # Una sola ricerca serve tutti gli scopi: indici specifici solo se
+        # nessuno scopo richiede la scansione completa
+        requests = list(self._pending_scans.values())
+        max_cameras = max(m for m, _ in requests)
+        if any(indices is None for _, indices in requests):
+            indices = None
+        else:
+            indices = sorted(set().union(*(indices for _, indices in requests)))
+        
+        self._camera_scan_purposes = set(self._pending_scans)
+        self._pending_scans = {}
+        self._camera_scan = CameraManager.get_available_cameras_async(
+            max_cameras=max_cameras, indices=indices
+        )
+    
+    def _poll_camera_scan(self):
+        """Gestisce il risultato della ricerca camera, se terminata."""
+        if self._camera_scan is None:
+            self._launch_camera_scan()
+            return
+        if not self._camera_scan.done():
+            return
+        
+        future, purposes = self._camera_scan, self._camera_scan_purposes
+        self._camera_scan = None
+        self._camera_scan_purposes = set()
         
         try:
-            # Cerca tutte le camera disponibili (inclusa quella corrente)
-            available_cameras = CameraManager.get_available_cameras(max_cameras=10)
-            
-            # Aggiorna la lista globale
-            GAME_SETTINGS.available_cameras = available_cameras
-            
+            available_cameras = future.result()
+        except Exception as e:
+            print(f"Errore durante ricerca camera: {e}")
+            available_cameras = []
+        
+        # L'apertura iniziale per prima: gli altri scopi trovano la camera già aperta
+        handlers = [
+            ('init', self._on_initial_cameras_found),
+            ('auto', self._on_auto_reconnect_cameras_found),
+            ('hotplug', self._on_hotplug_cameras_found),
+            ('settings', self._on_settings_cameras_found),
+            ('error', self._on_error_cameras_found),
+        ]
+        for purpose, handler in handlers:
+            if purpose in purposes:
+                handler(available_cameras)
+        
+        # Richieste arrivate durante la ricerca
+        self._launch_camera_scan()
+    
+    def _on_initial_cameras_found(self, available_cameras: list):
+        """Apre la camera all'avvio, al termine della prima ricerca."""
+        GAME_SETTINGS.available_cameras = available_cameras
+        
+        # Una camera è già stata aperta nel frattempo (es. hotplug o riconnessione):
+        # aprirne un'altra lascerebbe la prima senza rilascio
+        if self.camera is not None:
+            return
+        
+        if available_cameras:
             print(f"Trovate {len(available_cameras)} camera:")
             for idx, name in available_cameras:
-                current_marker = " (in uso)" if idx == current_camera_index else ""
-                print(f"  - {name}{current_marker}")
-            
-            # Notifica l'UI che le camera sono state aggiornate
-            self.screen_manager.notify_cameras_refreshed()
+                print(f"  - {name}")
             
-        except Exception as e:
-            print(f"Errore durante aggiornamento lista camera: {e}")
+            # Usa la camera configurata o la prima disponibile
+            camera_index = GAME_SETTINGS.camera_index
+            if camera_index not in [c[0] for c in available_cameras]:
+                camera_index = available_cameras[0][0]
+                GAME_SETTINGS.camera_index = camera_index
+        else:
+            camera_index = CAMERA_INDEX
+        
+        if self._try_connect_camera(camera_index):
+            print(f"Camera inizializzata: {self.camera.width}x{self.camera.height}")
+        else:
+            print("Il gioco funzionera con controlli da tastiera.")
+        self.last_camera_check_time = time.time()
+    
+    def _on_settings_cameras_found(self, available_cameras: list):
+        """Aggiorna la lista camera delle impostazioni."""
+        current_camera_index = GAME_SETTINGS.camera_index if self.camera else -1
+        
+        # Aggiorna la lista globale
+        GAME_SETTINGS.available_cameras = available_cameras
+        
+        print(f"Trovate {len(available_cameras)} camera:")
+        for idx, name in available_cameras:
+            current_marker = " (in uso)" if idx == current_camera_index else ""
+            print(f"  - {name}{current_marker}")
+        
+        # Notifica l'UI che le camera sono state aggiornate
+        self.screen_manager.notify_cameras_refreshed()
     
     def _handle_menu_selection(self):
         """Gestisce la selezione del menu."""
@@ -408,9 +607,19 @@ class MorraCineseGame:
         """Aggiorna il frame della camera con gestione robusta degli errori."""
         current_time = time.time()
         
-        # Se non abbiamo una camera, prova periodicamente a riconnettersi
+        # Risultato di un'eventuale ricerca camera in background
+        self._poll_camera_scan()
+        self._poll_camera_hotplug()
+        
+        # Se non abbiamo una camera, prova periodicamente a riconnettersi;
+        # con l'hotplug attivo è solo un controllo di sicurezza poco frequente
         if self.camera is None:
-            if current_time - self.last_camera_check_time >= self.camera_check_interval:
+            if self.pipeline is not None:
+                self.pipeline.set_source(None)
+            check_interval = self.camera_check_interval
+            if self.hotplug_watcher is not None:
+                check_interval = CAMERA_HOTPLUG_FALLBACK_INTERVAL
+            if current_time - self.last_camera_check_time >= check_interval:
                 self.last_camera_check_time = current_time
                 self._try_auto_reconnect()
             return
@@ -421,11 +630,25 @@ class MorraCineseGame:
             return
         
         try:
-            ret, frame = self.camera.read(flip=GAME_SETTINGS.camera_flip)
+            if self.pipeline is not None:
+                # Il frame arriva dal thread di acquisizione senza attese
+                self.pipeline.set_source(self.camera, GAME_SETTINGS.camera_flip)
+                ret, frame, frame_time, frame_seq = self.pipeline.latest_frame()
+            else:
+                ret, frame, frame_time, frame_seq = self.camera.read_stamped(flip=GAME_SETTINGS.camera_flip)
             
             if ret and frame is not None:
-                self.current_frame = frame
-                self.last_known_frame = frame.copy()  # Salva copia dell'ultimo frame valido
+                # In modalità threaded lo stesso frame può essere restituito più volte:
+                # si mantiene quello già analizzato (con i landmark disegnati)
+                if frame_seq != self.current_frame_seq or self.current_frame is None:
+                    if self.pipeline is not None:
+                        # Il frame è condiviso con il thread di inferenza
+                        frame = frame.copy()
+                    self.current_frame = frame
+                    self.current_frame_time = frame_time
+                    self.current_frame_seq = frame_seq
+                    self._frame_pending = True
+                    self.last_known_frame = frame.copy()  # Salva copia dell'ultimo frame valido
                 self.camera_reconnect_attempts = 0  # Reset tentativi se tutto ok
             else:
                 # Frame non valido, usa l'ultimo frame conosciuto
@@ -445,19 +668,47 @@ class MorraCineseGame:
         Tenta di riconnettere automaticamente la camera.
         Questo metodo viene chiamato periodicamente quando la camera non è disponibile.
         Funziona sia per riconnessione dopo disconnessione che per nuove camera collegate.
+        La ricerca avviene in background: il risultato arriva a
+        _on_auto_reconnect_cameras_found().
         """
         if self.state_manager.current_state == GameState.CAMERA_ERROR:
             # Non fare auto-reconnect se siamo nella schermata di errore (l'utente gestisce)
             return
         
+        if self._camera_scan is not None or self._pending_scans:
+            # Una ricerca è già in corso o in attesa (es. quella iniziale)
+            return
+        
         # Cerca camera disponibili
+        self._start_camera_scan('auto', max_cameras=5)
+    
+    def _on_auto_reconnect_cameras_found(self, available_cameras: list):
+        """Si connette alla camera trovata dalla ricerca automatica."""
+        if available_cameras:
+            # Aggiorna la lista globale
+            GAME_SETTINGS.available_cameras = available_cameras
+        self._auto_connect(available_cameras)
+    
+    def _on_hotplug_cameras_found(self, found_cameras: list):
+        """Aggiunge le camera appena collegate e, se serve, si connette."""
+        # La ricerca ha controllato solo i nuovi dispositivi: si uniscono alla lista
+        known = dict(GAME_SETTINGS.available_cameras)
+        known.update(found_cameras)
+        GAME_SETTINGS.available_cameras = sorted(known.items())
+        self._auto_connect(found_cameras)
+    
+    def _auto_connect(self, available_cameras: list):
+        """
+        Si connette alla camera preferita o alla prima disponibile, se non c'è già una camera.
+        
+        Args:
+            available_cameras: Camera trovate dalla ricerca
+        """
+        if self.camera is not None or self.state_manager.current_state == GameState.CAMERA_ERROR:
+            return
+        
         try:
-            available_cameras = CameraManager.get_available_cameras(max_cameras=5)
-            
             if available_cameras:
-                # Aggiorna la lista globale
-                GAME_SETTINGS.available_cameras = available_cameras
-                
                 # Prova a connettersi alla camera preferita o alla prima disponibile
                 preferred_index = GAME_SETTINGS.camera_index
                 camera_indices = [c[0] for c in available_cameras]
@@ -478,6 +729,36 @@ class MorraCineseGame:
         except Exception as e:
             print(f"Errore durante auto-reconnect: {e}")
     
+    def _poll_camera_hotplug(self):
+        """
+        Reagisce al collegamento o scollegamento di dispositivi video (solo Linux).
+        
+        Le camera vengono aperte solo quando l'insieme dei dispositivi cambia,
+        e solo per gli indici appena comparsi.
+        """
+        if self.hotplug_watcher is None:
+            return
+        
+        added, removed = self.hotplug_watcher.poll()
+        if not added and not removed:
+            return
+        
+        print(f"Dispositivi video cambiati - collegati: {added}, scollegati: {removed}")
+        
+        if removed:
+            GAME_SETTINGS.available_cameras = [
+                c for c in GAME_SETTINGS.available_cameras if c[0] not in removed
+            ]
+        
+        if self.state_manager.current_state == GameState.CAMERA_ERROR:
+            # Aggiorna subito la lista mostrata nella schermata di errore
+            self._start_camera_scan('error')
+        elif self.camera is not None and GAME_SETTINGS.camera_index in removed:
+            # La camera in uso è stata scollegata
+            self._handle_camera_disconnection()
+        elif self.camera is None and added:
+            self._start_camera_scan('hotplug', indices=added)
+    
     def _handle_camera_disconnection(self):
         """
         Gestisce la disconnessione della camera con logica di retry.
@@ -487,7 +768,11 @@ class MorraCineseGame:
         
         # Prova a riconnettere automaticamente prima di mostrare l'errore
         if self.camera_reconnect_attempts <= self.max_reconnect_attempts:
-            if self.camera and self.camera.try_reconnect():
+            reconnected = False
+            if self.camera:
+                with self._capture_paused():
+                    reconnected = self.camera.try_reconnect()
+            if reconnected:
                 print("Camera riconnessa con successo!")
                 self.camera_reconnect_attempts = 0
                 return
@@ -574,19 +859,19 @@ class MorraCineseGame:
         # Rilascia la camera attuale se esiste
         if self.camera:
             try:
-                self.camera.release()
+                with self._capture_paused():
+                    self.camera.release()
+                    self.camera = None
             except Exception as e:
                 print(f"Errore durante rilascio camera: {e}")
             finally:
                 self.camera = None
         
-        # Cerca nuove camera
-        try:
-            available_cameras = CameraManager.get_available_cameras()
-        except Exception as e:
-            print(f"Errore durante scansione camera: {e}")
-            available_cameras = []
-            
+        # Cerca nuove camera in background
+        self._start_camera_scan('error')
+    
+    def _on_error_cameras_found(self, available_cameras: list):
+        """Aggiorna la lista camera della schermata di errore."""
         GAME_SETTINGS.available_cameras = available_cameras
         self.screen_manager.set_available_cameras(available_cameras)
         
@@ -608,9 +893,19 @@ class MorraCineseGame:
             self.camera = CameraManager(
                 camera_index=camera_index,
                 width=CAMERA_WIDTH,
-                height=CAMERA_HEIGHT
+                height=CAMERA_HEIGHT,
+                threaded=CAMERA_THREADED
             )
+            if CAMERA_RECORD_FILE:
+                # Registra i frame grezzi per riprodurli in seguito
+                # (un solo file per sessione: riconnessioni e cambi camera lo proseguono)
+                if self.frame_recorder is None:
+                    self.frame_recorder = FrameRecorder(CAMERA_RECORD_FILE)
+                    print(f"Registrazione camera su {CAMERA_RECORD_FILE}")
+                self.camera = RecordingFrameSource(self.camera, self.frame_recorder,
+                                                   close_recorder=False)
             GAME_SETTINGS.camera_index = camera_index
+            self.current_frame_seq = 0  # La nuova camera riparte da sequenza 1
             print(f"Camera {camera_index} connessa con successo!")
             return True
         except RuntimeError as e:
@@ -620,27 +915,84 @@ class MorraCineseGame:
     
     def _update_gesture_detection(self):
         """Aggiorna il rilevamento dei gesti."""
-        if self.current_frame is None:
+        if self.pipeline is not None:
+            self._update_gesture_from_pipeline()
+            return
+        
+        if self.current_frame is None or not self._frame_pending:
+            return
+        self._frame_pending = False
+        
+        # Negli stati in cui il gesto non serve l'inferenza gira più lentamente:
+        # sui frame saltati vengono ridisegnati gli ultimi landmark
+        self.inference_scheduler.set_state(self.state_manager.current_state.name)
+        if not self.inference_scheduler.should_run():
+            self.hand_detector.draw_hands(self.current_frame,
+                                          self.hand_detector.get_last_hands())
             return
         
         # Rileva le mani nel frame
-        processed_frame, hands = self.hand_detector.find_hands(
-            self.current_frame, 
-            draw=True
-        )
+        with self.profiler.measure('find_hands'):
+            # Il timestamp di acquisizione accompagna il frame (anche verso il
+            # worker del backend 'process'): le latenze partono dalla camera
+            processed_frame, hands = self.hand_detector.find_hands(
+                self.current_frame, 
+                draw=True,
+                timestamp=self.current_frame_time or None
+            )
         self.current_frame = processed_frame
         
+        # Con il backend 'process' il risultato può essere ancora quello precedente
+        if self.hand_detector.result_id == self._last_result_id:
+            return
+        self._last_result_id = self.hand_detector.result_id
+        
+        gesture, confidence = 'none', 0.0
         if hands:
-            hand = hands[0]
             # Riconosci il gesto con confidenza
-            gesture, confidence = self.hand_detector.recognize_gesture(
-                hand['landmarks'],
-                self.current_frame.shape
-            )
-            
+            with self.profiler.measure('recognize_gesture'):
+                gesture, confidence = self.hand_detector.recognize_gesture(
+                    hands[0]['points'],
+                    self.current_frame.shape
+                )
+        self._apply_gesture_result(hands, gesture, confidence,
+                                   self.hand_detector.result_timestamp)
+    
+    def _update_gesture_from_pipeline(self):
+        """
+        Applica l'ultimo risultato del thread di inferenza, se ce n'è uno nuovo.
+        
+        Il rendering non attende mai l'inferenza: sul frame corrente vengono
+        disegnati gli ultimi landmark disponibili.
+        """
+        self.inference_scheduler.set_state(self.state_manager.current_state.name)
+        
+        if self.current_frame is not None and self._frame_pending:
+            self._frame_pending = False
+            self.hand_detector.draw_hands(self.current_frame,
+                                          self.hand_detector.get_last_hands())
+        
+        result = self.pipeline.poll_result()
+        if result is not None:
+            self._apply_gesture_result(result.hands, result.gesture,
+                                       result.confidence, result.timestamp)
+    
+    def _apply_gesture_result(self, hands: list, gesture: str, confidence: float,
+                              frame_time: float):
+        """
+        Aggiorna gesto corrente e conferma a partire da un risultato di inferenza.
+        
+        Args:
+            hands: Mani rilevate nel frame
+            gesture: Gesto riconosciuto sulla prima mano
+            confidence: Confidenza del gesto
+            frame_time: Timestamp di acquisizione del frame analizzato
+        """
+        if hands:
             # Applica smoothing temporale per ridurre jitter
             self.current_gesture, self.current_gesture_confidence = \
-                self.hand_detector._apply_temporal_smoothing(gesture, confidence)
+                self.hand_detector._apply_temporal_smoothing(gesture, confidence, frame_time)
+            self.profiler.record('latency_capture', self.hand_detector.frame_latency)
             
             # Durante il countdown, aggiorna la mossa immediatamente senza richiedere conferma
             if self.state_manager.current_state == GameState.COUNTDOWN:
@@ -660,21 +1012,35 @@ class MorraCineseGame:
             hold_time = GAME_SETTINGS.gesture_hold_time
             confirmed = self.hand_detector.get_confirmed_gesture(
                 self.current_gesture, 
-                hold_time
+                hold_time,
+                frame_time
             )
             
             self.gesture_progress = self.hand_detector.get_gesture_progress(hold_time)
             
             if confirmed:
-                self._handle_confirmed_gesture(confirmed)
+                self._handle_confirmed_gesture(confirmed, frame_time)
+                # Latenza dalla comparsa del gesto alla decisione (hold_time escluso);
+                # 'capture' è già registrata a ogni frame
+                for stage, value in self.hand_detector.get_confirmation_latency().items():
+                    if stage != 'capture':
+                        self.profiler.record(f'latency_{stage}', value)
         else:
             self.current_gesture = 'none'
             self.current_gesture_confidence = 0.0
             self.gesture_progress = 0.0
             self.hand_detector.reset_gesture_tracking()
     
-    def _handle_confirmed_gesture(self, gesture: str):
-        """Gestisce un gesto confermato."""
+    def _handle_confirmed_gesture(self, gesture: str, frame_time: Optional[float] = None):
+        """
+        Gestisce un gesto confermato.
+        
+        Args:
+            gesture: Gesto confermato
+            frame_time: Timestamp di acquisizione del frame che lo ha confermato
+        """
+        self.last_confirmed_gesture = gesture
+        self.last_confirmed_gesture_time = frame_time if frame_time is not None else time.time()
         current_state = self.state_manager.current_state
         
         # Gioco
@@ -736,6 +1102,8 @@ class MorraCineseGame:
         elif current_state == GameState.SHOWING_RESULT:
             if self.state_manager.is_state_timed_out():
                 if self.game_logic.is_game_over():
+                    game_mode, difficulty = GAME_SETTINGS.get_highscore_board()
+                    self.last_game_id = self.journal.record_game(self.game_logic, game_mode, difficulty)
                     self.state_manager.change_state(GameState.GAME_OVER)
                 else:
                     # Continua con la modalità corretta
@@ -749,9 +1117,8 @@ class MorraCineseGame:
         # Il giocatore non ha fatto la mossa in tempo - conta come sconfitta
         cpu_gesture = self.state_manager.get_data('cpu_move')
         
-        # Incrementa il punteggio della CPU (il giocatore perde)
-        self.game_logic.cpu_score += 1
-        self.game_logic.round_count += 1
+        # Il round conta come vinto dalla CPU (il giocatore perde)
+        self.game_logic.record_round(None, Move.from_gesture(cpu_gesture), RoundResult.CPU_WIN)
         
         self.state_manager.change_state(
             GameState.SHOWING_RESULT,
@@ -771,17 +1138,9 @@ class MorraCineseGame:
         cpu_move = Move.from_gesture(cpu_gesture)
         
         if player_move and cpu_move:
-            # Determina il risultato
+            # Determina il risultato e aggiorna i punteggi
             result = self.game_logic.determine_winner(player_move, cpu_move)
-            
-            # Aggiorna i punteggi
-            if result.value == 'player':
-                self.game_logic.player_score += 1
-            elif result.value == 'cpu':
-                self.game_logic.cpu_score += 1
-            
-            self.game_logic.round_count += 1
-            self.game_logic.history.append((player_move, cpu_move, result))
+            self.game_logic.record_round(player_move, cpu_move, result)
             
             self.state_manager.change_state(
                 GameState.SHOWING_RESULT,
@@ -811,11 +1170,17 @@ class MorraCineseGame:
         """Controlla e salva il punteggio."""
         player_score, _ = self.game_logic.get_score()
         
-        if self.highscore_manager.is_high_score(player_score):
+        game_mode, difficulty = GAME_SETTINGS.get_highscore_board()
+        is_record = self.highscore_manager.is_high_score(player_score, game_mode, difficulty)
+        
+        # Il backend SQLite conserva ogni partita (fino alla capacità della classifica):
+        # il nome viene chiesto sempre, "record" indica solo l'ingresso tra le voci mostrate
+        if is_record or self.highscore_manager.records_all_games:
             self.screen_manager.reset_name_input()
             self.state_manager.change_state(
                 GameState.ENTER_NAME,
-                score=player_score
+                score=player_score,
+                record=is_record
             )
         else:
             self.state_manager.change_state(GameState.MENU)
@@ -826,28 +1191,35 @@ class MorraCineseGame:
         stats = self.game_logic.get_stats()
         
         # Determina modalità e difficoltà
-        game_mode = 'classic' if GAME_SETTINGS.game_mode == GameMode.CLASSIC else 'timed'
-        difficulty = None
-        if GAME_SETTINGS.game_mode == GameMode.TIMED:
-            difficulty = GAME_SETTINGS.timed_difficulty.value
+        game_mode, difficulty = GAME_SETTINGS.get_highscore_board()
         
         position = self.highscore_manager.add_score(name, score, stats, game_mode, difficulty)
-        print(f"Nuovo record! {name}: {score} punti (posizione {position})")
+        if self.state_manager.get_data('record', True):
+            print(f"Nuovo record! {name}: {score} punti (posizione {position})")
+        else:
+            print(f"Punteggio registrato: {name}: {score} punti (posizione {position})")
+        if self.last_game_id is not None:
+            self.journal.record_name(self.last_game_id, name, score)
         
         self.state_manager.change_state(GameState.HIGHSCORE)
     
     def _render(self, dt: float):
         """Renderizza il frame corrente."""
+        if self.pipeline is not None:
+            self.pipeline.tick_render()
+        
         # Aggiorna animazioni
         self.screen_manager.update(dt)
+        self.screen_manager.model_loading = self.hand_detector.is_loading()
         
         # Renderizza la schermata corrente
-        self.screen_manager.render(
-            self.state_manager.current_state,
-            self.current_frame,
-            self.current_gesture,
-            self.gesture_progress
-        )
+        with self.profiler.measure('render'):
+            self.screen_manager.render(
+                self.state_manager.current_state,
+                self.current_frame,
+                self.current_gesture,
+                self.gesture_progress
+            )
         
         # Notifica camera connessa
         if self._show_camera_connected_notification:
@@ -855,25 +1227,44 @@ class MorraCineseGame:
             if elapsed < 3.0:  # Mostra per 3 secondi
                 # Calcola alpha per fade out
                 alpha = 1.0 if elapsed < 2.0 else (3.0 - elapsed)
-                self._render_camera_notification(alpha)
+                self.screen_manager.mark_dirty(self._render_camera_notification(alpha))
             else:
                 self._show_camera_connected_notification = False
         
         # Debug info
         if DEBUG_MODE or GAME_SETTINGS.show_fps:
             fps = self.clock.get_fps()
-            self.renderer.draw_text(
-                f"FPS: {fps:.0f}",
+            fps_text = f"FPS: {fps:.0f}"
+            if self.pipeline is not None:
+                rates = self.pipeline.get_rates()
+                fps_text += f"  CAM: {rates['capture']:.0f}  AI: {rates['inference']:.0f}"
+            fps_rect = self.renderer.draw_text(
+                fps_text,
                 (10, 10),
                 'tiny',
                 (100, 100, 100)
             )
+            self.screen_manager.mark_dirty(fps_rect)
+        
+        profiler_rect = self.profiler.draw_overlay(self.renderer)
+        if profiler_rect is not None:
+            self.screen_manager.mark_dirty(profiler_rect)
         
-        # Aggiorna display
-        pygame.display.flip()
+        # Aggiorna display (solo le zone cambiate nelle schermate quasi statiche)
+        with self.profiler.measure('flip'):
+            dirty_rects = self.screen_manager.get_dirty_rects()
+            if dirty_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty_rects)
     
-    def _render_camera_notification(self, alpha: float):
-        """Mostra una notifica che la camera è stata connessa."""
+    def _render_camera_notification(self, alpha: float) -> pygame.Rect:
+        """
+        Mostra una notifica che la camera è stata connessa.
+        
+        Returns:
+            Rettangolo occupato dalla notifica
+        """
         # Crea superficie semi-trasparente per la notifica
         notif_width, notif_height = 350, 50
         notif_surface = pygame.Surface((notif_width, notif_height), pygame.SRCALPHA)
@@ -896,16 +1287,34 @@ class MorraCineseGame:
         # Posiziona in alto al centro
         x = (SCREEN_WIDTH - notif_width) // 2
         y = 10
-        self.screen.blit(notif_surface, (x, y))
+        return self.screen.blit(notif_surface, (x, y))
     
     def _cleanup(self):
         """Pulisce le risorse."""
         print("Chiusura del gioco...")
         
+        self._pending_scans = {}
+        if self._camera_scan is not None:
+            self._camera_scan.cancel()
+        
+        # La pipeline va fermata prima di rilasciare camera e rilevatore
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        
+        if self.profiler.enabled and PROFILER_DUMP_FILE:
+            if self.profiler.dump(PROFILER_DUMP_FILE):
+                print(f"Profilo delle fasi salvato in {PROFILER_DUMP_FILE}")
+        
         if self.camera:
             self.camera.release()
+        if self.frame_recorder is not None:
+            self.frame_recorder.close()
         
         self.hand_detector.release()
+        
+        # Scrive su disco la classifica ancora in coda
+        self.highscore_manager.release()
+        self.journal.release()
         pygame.quit()
 
 
@@ -930,4 +1339,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necessario per il worker di inferenza negli eseguibili PyInstaller
+    multiprocessing.freeze_support()
     main()
@@ -4,10 +4,32 @@ Esegui questo script per testare i miglioramenti senza avviare il gioco completo
 """
 
 import cv2
+import sys
 import time
 from gesture.hand_detector import HandDetector, CameraManager
+from gesture.frame_source import FileFrameSource
 
-def test_gesture_recognition():
+
+def open_frame_source(source_path: str = None, realtime: bool = False):
+    """
+    Apre la sorgente dei frame: camera dal vivo o registrazione.
+    
+    Args:
+        source_path: Video o .npz registrato (None = webcam)
+        realtime: Riproduce coi tempi originali saltando i frame in ritardo;
+                  di default ogni frame viene elaborato (risultati ripetibili)
+    """
+    if source_path:
+        source = FileFrameSource(source_path, realtime=realtime, loop=False)
+        print(f"✓ Riproduzione da {source_path} ({source.frame_count} frame)")
+        return source
+    
+    camera = CameraManager(camera_index=0, width=640, height=480)
+    print("✓ Camera inizializzata")
+    return camera
+
+
+def test_gesture_recognition(source_path: str = None, realtime: bool = False):
     """Test interattivo del riconoscimento gesti."""
     print("=" * 60)
     print("  TEST SISTEMA RICONOSCIMENTO GESTI MIGLIORATO")
@@ -24,9 +46,8 @@ def test_gesture_recognition():
     print("-" * 60)
     
     try:
-        # Inizializza camera
-        camera = CameraManager(camera_index=0, width=640, height=480)
-        print("✓ Camera inizializzata")
+        # Inizializza camera (o la registrazione)
+        camera = open_frame_source(source_path, realtime)
         
         # Inizializza hand detector con parametri migliorati
         hand_detector = HandDetector(
@@ -59,7 +80,10 @@ def test_gesture_recognition():
         while True:
             ret, frame = camera.read(flip=True)
             if not ret:
-                print("Errore nella lettura del frame")
+                if source_path:
+                    print("Fine della registrazione")
+                else:
+                    print("Errore nella lettura del frame")
                 break
             
             frame_count += 1
@@ -250,21 +274,24 @@ def test_gesture_recognition():
         traceback.print_exc()
 
 
-def test_specific_gesture(gesture_name: str):
+def test_specific_gesture(gesture_name: str, source_path: str = None, realtime: bool = False):
     """Test focalizzato su un gesto specifico."""
     print(f"Test specifico per gesto: {gesture_name}")
     print("Mantieni il gesto per 5 secondi...")
     
     try:
-        camera = CameraManager(camera_index=0, width=640, height=480)
+        camera = open_frame_source(source_path, realtime)
         hand_detector = HandDetector(max_hands=1)
         
         start_time = time.time()
         samples = []
         
-        while time.time() - start_time < 5.0:
+        # Una registrazione viene analizzata per intero
+        while source_path or time.time() - start_time < 5.0:
             ret, frame = camera.read(flip=True)
             if not ret:
+                if source_path and camera.finished:
+                    break
                 continue
             
             processed_frame, hands = hand_detector.find_hands(frame, draw=True)
@@ -299,6 +326,11 @@ def test_specific_gesture(gesture_name: str):
 
 
 if __name__ == "__main__":
+    # Uso: python test_gestures.py [registrazione.mp4|registrazione.npz] [--realtime]
+    args = [arg for arg in sys.argv[1:] if arg != '--realtime']
+    realtime = '--realtime' in sys.argv[1:]
+    source_path = args[0] if args else None
+    
     print()
     print("Seleziona modalità test:")
     print("1. Test interattivo completo")
@@ -310,12 +342,12 @@ if __name__ == "__main__":
     choice = input("Scelta (1-4): ").strip()
     
     if choice == '1':
-        test_gesture_recognition()
+        test_gesture_recognition(source_path, realtime)
     elif choice == '2':
-        test_specific_gesture('rock')
+        test_specific_gesture('rock', source_path, realtime)
     elif choice == '3':
-        test_specific_gesture('paper')
+        test_specific_gesture('paper', source_path, realtime)
     elif choice == '4':
-        test_specific_gesture('scissors')
+        test_specific_gesture('scissors', source_path, realtime)
     else:
         print("Scelta non valida")
@@ -0,0 +1,269 @@
+"""
+Profiler delle fasi del game loop.
+
+Ogni fase (eventi, camera, inferenza, logica, rendering, flip) registra la
+propria durata in un buffer circolare di dimensione fissa: la memoria resta
+costante e le statistiche (p50/p95/p99) si riferiscono sempre agli ultimi
+campioni. Nello stesso modo vengono raccolte le latenze end-to-end dei gesti,
+dall'acquisizione del frame alla conferma. L'overlay mostra i percentili a
+schermo, dump() li salva su file in uscita per confrontare dispositivi diversi.
+"""
+
+import csv
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from config import COLORS
+
+# Fasi strumentate, nell'ordine in cui compaiono nell'overlay
+PROFILER_STAGES = [
+    'events',
+    'camera',
+    'find_hands',
+    'recognize_gesture',
+    'game_logic',
+    'render',
+    'flip',
+]
+
+# Latenze dall'acquisizione del frame alla decisione sul gesto (hold_time escluso),
+# con i nomi delle fasi di HandDetector.get_confirmation_latency(): 'capture' è
+# misurata a ogni frame, le altre a ogni gesto confermato
+LATENCY_STAGES = [
+    'latency_capture',
+    'latency_smoothing',
+    'latency_confirm',
+    'latency_total',
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+class RingBuffer:
+    """Buffer circolare di campioni numerici a capacità fissa."""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Numero massimo di campioni conservati
+        """
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.count = 0  # Campioni registrati in totale (anche quelli sovrascritti)
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.values))
+
+    def append(self, value: float):
+        """Aggiunge un campione, sovrascrivendo il più vecchio se pieno."""
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def samples(self) -> np.ndarray:
+        """Restituisce una copia dei campioni in ordine cronologico."""
+        capacity = len(self.values)
+        if self.count <= capacity:
+            return self.values[:self.count].copy()
+        start = self.count % capacity
+        return np.concatenate((self.values[start:], self.values[:start]))
+
+    def clear(self):
+        """Svuota il buffer."""
+        self.count = 0
+
+
+def summarize(samples: np.ndarray) -> Dict[str, float]:
+    """
+    Calcola le statistiche di una serie di durate.
+
+    Args:
+        samples: Durate in secondi
+
+    Returns:
+        Dizionario con count, mean, p50, p95, p99 e max (in millisecondi)
+    """
+    if len(samples) == 0:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    ms = samples * 1000.0
+    p50, p95, p99 = np.percentile(ms, PERCENTILES)
+    return {
+        'count': int(len(ms)),
+        'mean': float(ms.mean()),
+        'p50': float(p50),
+        'p95': float(p95),
+        'p99': float(p99),
+        'max': float(ms.max()),
+    }
+
+
+class _StageTimer:
+    """Context manager riutilizzabile che misura una fase."""
+
+    __slots__ = ('buffer', 'start')
+
+    def __init__(self, buffer: RingBuffer):
+        self.buffer = buffer
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.buffer.append(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """Context manager vuoto usato quando il profiler è disattivato."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class StageProfiler:
+    """
+    Raccoglie le durate delle fasi del game loop.
+
+    Uso:
+        with profiler.measure('render'):
+            screen_manager.render(...)
+
+    Ogni fase ha un solo thread che la misura (le fasi di inferenza possono
+    girare nel thread della pipeline), quindi i buffer non richiedono lock.
+    """
+
+    OVERLAY_REFRESH = 0.5  # Secondi tra due aggiornamenti del testo dell'overlay
+    OVERLAY_COLUMNS = (0, 155, 210, 265)  # Ascissa delle colonne fase/p50/p95/p99
+    OVERLAY_LINE_HEIGHT = 18
+    OVERLAY_WIDTH = 335
+
+    def __init__(self, capacity: int = 600, enabled: bool = True,
+                 stages: Optional[List[str]] = None):
+        """
+        Args:
+            capacity: Campioni conservati per ogni fase
+            enabled: Se False, measure() non registra nulla
+            stages: Fasi note in anticipo (ordine dell'overlay)
+        """
+        self.capacity = capacity
+        self.enabled = enabled
+        self.buffers: Dict[str, RingBuffer] = {}
+        self._timers: Dict[str, _StageTimer] = {}
+        for stage in (stages if stages is not None else PROFILER_STAGES + LATENCY_STAGES):
+            self._get_timer(stage)
+
+        self.overlay_visible = False
+        self._overlay_rows: List[Tuple[str, ...]] = []
+        self._overlay_time = 0.0
+
+    def _get_timer(self, stage: str) -> _StageTimer:
+        timer = self._timers.get(stage)
+        if timer is None:
+            self.buffers[stage] = RingBuffer(self.capacity)
+            timer = _StageTimer(self.buffers[stage])
+            self._timers[stage] = timer
+        return timer
+
+    def measure(self, stage: str):
+        """Restituisce un context manager che misura la fase indicata."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._get_timer(stage)
+
+    def record(self, stage: str, duration: float):
+        """Registra una durata (in secondi) misurata esternamente."""
+        if self.enabled:
+            self._get_timer(stage).buffer.append(duration)
+
+    def get_summary(self) -> Dict[str, Dict[str, float]]:
+        """Restituisce le statistiche di ogni fase (in millisecondi)."""
+        return {stage: summarize(buffer.samples()) for stage, buffer in self.buffers.items()}
+
+    def reset(self):
+        """Azzera tutti i campioni."""
+        for buffer in self.buffers.values():
+            buffer.clear()
+
+    def toggle_overlay(self):
+        """Mostra o nasconde l'overlay delle statistiche."""
+        self.overlay_visible = not self.overlay_visible
+        self._overlay_time = 0.0
+
+    def draw_overlay(self, renderer, pos: Tuple[int, int] = (10, 30)) -> Optional[pygame.Rect]:
+        """
+        Disegna p50/p95/p99 di ogni fase.
+
+        Il testo viene ricalcolato ogni OVERLAY_REFRESH secondi, così le
+        etichette restano nella cache del renderer tra un aggiornamento e
+        l'altro.
+
+        Returns:
+            Rettangolo occupato dall'overlay, None se nascosto
+        """
+        if not self.overlay_visible or not self.enabled:
+            return None
+
+        now = time.perf_counter()
+        if now - self._overlay_time >= self.OVERLAY_REFRESH:
+            self._overlay_time = now
+            self._overlay_rows = [('fase', 'p50', 'p95', 'p99 ms')]
+            for stage, stats in self.get_summary().items():
+                if stats['count'] == 0:
+                    continue
+                self._overlay_rows.append((stage, f"{stats['p50']:.1f}",
+                                           f"{stats['p95']:.1f}", f"{stats['p99']:.1f}"))
+
+        x, y = pos
+        rect = pygame.Rect(x - 6, y - 4, self.OVERLAY_WIDTH,
+                           self.OVERLAY_LINE_HEIGHT * len(self._overlay_rows) + 8)
+        pygame.draw.rect(renderer.screen, COLORS['card_bg'], rect)
+        for i, row in enumerate(self._overlay_rows):
+            row_y = y + i * self.OVERLAY_LINE_HEIGHT
+            color = COLORS['muted'] if i == 0 else COLORS['white']
+            for column_x, text in zip(self.OVERLAY_COLUMNS, row):
+                renderer.draw_text(text, (x + column_x, row_y), 'tiny', color)
+        return rect
+
+    def dump(self, filename: str) -> bool:
+        """
+        Salva statistiche e campioni su file.
+
+        Il formato dipende dall'estensione: '.csv' scrive un campione per riga
+        (fase, indice, durata in ms), altrimenti JSON con statistiche e campioni.
+
+        Returns:
+            True se il salvataggio è riuscito
+        """
+        try:
+            if filename.lower().endswith('.csv'):
+                with open(filename, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['stage', 'sample', 'duration_ms'])
+                    for stage, buffer in self.buffers.items():
+                        for i, value in enumerate(buffer.samples()):
+                            writer.writerow([stage, i, f"{value * 1000.0:.4f}"])
+            else:
+                stages = {}
+                for stage, buffer in self.buffers.items():
+                    samples = buffer.samples()
+                    stages[stage] = summarize(samples)
+                    stages[stage]['samples_ms'] = [round(v * 1000.0, 4) for v in samples]
+                data = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'stages': stages}
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+            return True
+        except IOError as e:
+            print(f"Errore salvataggio profilo: {e}")
+            return False
@@ -5,46 +5,256 @@ Modulo di rendering grafico per il gioco - Design Moderno Gaming
 import pygame
 import numpy as np
 import cv2
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Hashable
+from collections import OrderedDict
+from contextlib import contextmanager
 import math
-import random
 
-from config import COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, UI_SYMBOLS
+from config import (COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, UI_SYMBOLS, TEXT_CACHE_SIZE, GLOW_CACHE_SIZE,
+                    PARTICLE_CAPACITY)
+from game.highscore import format_score_date
 
 
-class Particle:
-    """Classe per gestire particelle di effetto."""
-    def __init__(self, x: float, y: float, vx: float, vy: float, 
-                 lifetime: float, color: Tuple[int, int, int], size: int = 4,
-                 particle_type: str = 'circle'):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.color = color
-        self.size = size
-        self.gravity = 0.15
-        self.particle_type = particle_type
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-5, 5)
+class ParticleSystem:
+    """
+    Pool di particelle a capacità fissa, memorizzato come struttura di array.
+    
+    Posizione, velocità, vita, colore e dimensione stanno in array NumPy:
+    integrazione ed eliminazione delle particelle morte sono vettoriali e il
+    disegno usa sprite pre-renderizzati con un solo Surface.blits().
+    """
+    
+    TYPES = ('circle', 'rect')
+    ALPHA_LEVELS = 16  # Livelli di dissolvenza con cui vengono pre-renderizzati gli sprite
+    MAX_SIZE = 16  # Dimensione massima (px) di una particella
+    
+    def __init__(self, capacity: int = 4096):
+        """
+        Args:
+            capacity: Numero massimo di particelle attive contemporaneamente
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)  # Indice nella palette
+        self.kind = np.zeros(capacity, dtype=np.int8)  # Indice in TYPES
+        
+        self._palette: List[Tuple[int, int, int]] = []
+        self._palette_index = {}
+        # Sprite per (colore, tipo, livello di alpha, dimensione), creati al primo uso
+        self._sprites = np.empty(0, dtype=object)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _arrays(self) -> tuple:
+        return (self.pos, self.vel, self.life, self.max_life,
+                self.gravity, self.size, self.color, self.kind)
+    
+    def _color_index(self, color: Tuple[int, int, int]) -> int:
+        """Restituisce l'indice del colore nella palette, aggiungendolo se manca."""
+        color = tuple(int(c) for c in color)
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self._palette)
+            self._palette.append(color)
+            self._palette_index[color] = index
+            per_color = len(self.TYPES) * self.ALPHA_LEVELS * (self.MAX_SIZE + 1)
+            self._sprites = np.concatenate([self._sprites, np.full(per_color, None, dtype=object)])
+        return index
+    
+    def emit(self,
+             x: float, y: float,
+             vx: np.ndarray, vy: np.ndarray,
+             lifetime: float,
+             colors: List[Tuple[int, int, int]],
+             sizes: np.ndarray,
+             color_choice: Optional[np.ndarray] = None,
+             particle_type: str = 'circle',
+             gravity: float = 0.15) -> int:
+        """
+        Aggiunge un gruppo di particelle che partono dallo stesso punto.
+        
+        Args:
+            x, y: Punto di emissione
+            vx, vy: Velocità iniziali (una per particella)
+            lifetime: Durata in secondi
+            colors: Colori RGB disponibili
+            sizes: Dimensioni in pixel (una per particella)
+            color_choice: Indice in colors per ogni particella (None = primo colore)
+            particle_type: 'circle' o 'rect'
+            gravity: Accelerazione verticale per frame
+        
+        Returns:
+            Numero di particelle effettivamente aggiunte (le eccedenti la
+            capacità vengono scartate)
+        """
+        n = min(len(vx), self.capacity - self.count)
+        if n <= 0:
+            return 0
+        start, end = self.count, self.count + n
+        
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = vx[:n]
+        self.vel[start:end, 1] = vy[:n]
+        self.life[start:end] = lifetime
+        self.max_life[start:end] = lifetime
+        self.gravity[start:end] = gravity
+        self.size[start:end] = np.clip(sizes[:n], 1, self.MAX_SIZE)
+        self.kind[start:end] = self.TYPES.index(particle_type)
+        palette = np.array([self._color_index(c) for c in colors], dtype=np.int16)
+        self.color[start:end] = palette[color_choice[:n]] if color_choice is not None else palette[0]
+        
+        self.count = end
+        return n
     
     def update(self, dt: float):
-        """Aggiorna la particella."""
-        self.x += self.vx * dt * 60
-        self.y += self.vy * dt * 60
-        self.vy += self.gravity
-        self.lifetime -= dt
-        self.rotation += self.rotation_speed
-    
-    def is_alive(self) -> bool:
-        """Verifica se la particella e' ancora viva."""
-        return self.lifetime > 0
-    
-    def get_alpha(self) -> float:
-        """Restituisce l'alpha (opacita') basato sulla vita rimanente."""
-        return max(0, min(1, self.lifetime / self.max_lifetime))
+        """Integra tutte le particelle e compatta gli array scartando quelle morte."""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * (dt * 60)
+        self.vel[:n, 1] += self.gravity[:n]
+        self.life[:n] -= dt
+        
+        alive = self.life[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            for array in self._arrays():
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+    
+    def clear(self):
+        """Elimina tutte le particelle."""
+        self.count = 0
+    
+    def _make_sprite(self, key: int) -> pygame.Surface:
+        """Crea lo sprite corrispondente a un indice della tabella degli sprite."""
+        key, size = divmod(key, self.MAX_SIZE + 1)
+        key, level = divmod(key, self.ALPHA_LEVELS)
+        color_index, kind = divmod(key, len(self.TYPES))
+        
+        fade = level / (self.ALPHA_LEVELS - 1)
+        color = tuple(int(c * fade) for c in self._palette[color_index])
+        size = max(1, size)
+        
+        if self.TYPES[kind] == 'rect':
+            sprite = pygame.Surface((size, size))
+            sprite.fill(color)
+        else:
+            # Colorkey diverso dal colore della particella
+            key_color = (255, 0, 255) if color != (255, 0, 255) else (0, 255, 0)
+            sprite = pygame.Surface((size * 2 + 1, size * 2 + 1))
+            sprite.fill(key_color)
+            sprite.set_colorkey(key_color, pygame.RLEACCEL)
+            pygame.draw.circle(sprite, color, (size, size), size)
+        return sprite
+    
+    def draw(self, surface: pygame.Surface):
+        """Disegna le particelle attive, sfumando colore e dimensione con la vita residua."""
+        n = self.count
+        if n == 0:
+            return
+        
+        alpha = np.clip(self.life[:n] / self.max_life[:n], 0.0, 1.0)
+        sizes = np.maximum(1, (self.size[:n] * alpha).astype(np.int32))
+        levels = np.rint(alpha * (self.ALPHA_LEVELS - 1)).astype(np.int32)
+        kinds = self.kind[:n].astype(np.int32)
+        
+        keys = ((self.color[:n].astype(np.int32) * len(self.TYPES) + kinds)
+                * self.ALPHA_LEVELS + levels) * (self.MAX_SIZE + 1) + sizes
+        sprites = self._sprites[keys]
+        missing = sprites == None  # noqa: E711 - confronto elemento per elemento
+        if missing.any():
+            for key in np.unique(keys[missing]).tolist():
+                self._sprites[key] = self._make_sprite(key)
+            sprites = self._sprites[keys]
+        
+        # I quadrati sono centrati su size // 2, i cerchi hanno raggio size
+        offsets = np.where(kinds == self.TYPES.index('rect'), sizes // 2, sizes)
+        xs = self.pos[:n, 0].astype(np.int32) - offsets
+        ys = self.pos[:n, 1].astype(np.int32) - offsets
+        surface.blits(zip(sprites.tolist(), zip(xs.tolist(), ys.tolist())), doreturn=False)
+    
+    def get_bounds(self) -> Optional[pygame.Rect]:
+        """
+        Restituisce il rettangolo che contiene tutte le particelle attive.
+        
+        Returns:
+            Rettangolo sullo schermo o None se non ci sono particelle
+        """
+        n = self.count
+        if n == 0:
+            return None
+        pad = int(self.size[:n].max()) + 2
+        left, top = self.pos[:n].min(axis=0)
+        right, bottom = self.pos[:n].max(axis=0)
+        return pygame.Rect(int(left) - pad, int(top) - pad,
+                           int(right - left) + 2 * pad + 1, int(bottom - top) + 2 * pad + 1)
+
+
+class SurfaceCache:
+    """
+    Cache LRU di superfici pre-renderizzate.
+    
+    Tiene al massimo max_size elementi, scartando quelli usati meno di recente,
+    e conta hit e miss per poterne valutare la dimensione.
+    """
+    
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: Numero massimo di elementi conservati
+        """
+        self.max_size = max_size
+        self._items: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable):
+        """Restituisce l'elemento in cache (o None) aggiornando le statistiche."""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item
+    
+    def put(self, key: Hashable, item):
+        """Inserisce un elemento, scartando il meno recente se la cache è piena."""
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+    
+    def clear(self):
+        """Svuota la cache (le statistiche restano)."""
+        self._items.clear()
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def get_stats(self) -> dict:
+        """
+        Restituisce le statistiche della cache.
+        
+        Returns:
+            Dizionario con hits, misses, hit_rate, size e max_size
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._items),
+            'max_size': self.max_size,
+        }
 
 
 class Renderer:
@@ -53,6 +263,15 @@ class Renderer:
     Design moderno con effetti gaming.
     """
     
+    # Raggio dei bagliori animati agli angoli dello sfondo
+    BG_GLOW_MIN_RADIUS = 80
+    BG_GLOW_MAX_RADIUS = 100
+    
+    # Quantizzazione degli sprite di glow: alpha e raggi animati vengono
+    # arrotondati a questi passi, così le animazioni riusano pochi sprite
+    GLOW_ALPHA_STEP = 4
+    GLOW_RADIUS_STEP = 2
+    
     def __init__(self, screen: pygame.Surface):
         """
         Inizializza il renderer.
@@ -85,8 +304,23 @@ class Renderer:
         # Cache per superfici pre-renderizzate
         self._cache = {}
         
+        # Cache LRU dei testi già composti (glow e ombra inclusi)
+        self.text_cache = SurfaceCache(TEXT_CACHE_SIZE)
+        
+        # Cache LRU degli sprite di glow condivisa dalle primitive
+        self.glow_cache = SurfaceCache(GLOW_CACHE_SIZE)
+        
+        # Texture della camera per dimensione: buffer RGB preallocato avvolto
+        # da una superficie che ne condivide la memoria
+        self._camera_textures = {}
+        
+        # Overlay a schermo intero riusato da apply_screen_overlay
+        self._overlay_surface: Optional[pygame.Surface] = None
+        self._overlay_color: Optional[Tuple[int, int, int]] = None
+        
         # Sistema di particelle
-        self.particles: List[Particle] = []
+        self.particles = ParticleSystem(PARTICLE_CAPACITY)
+        self._rng = np.random.default_rng()
         
         # Effetti schermo
         self.screen_overlay_alpha = 0
@@ -103,6 +337,10 @@ class Renderer:
         # Superficie per glow effect
         self.glow_surface = pygame.Surface((200, 200), pygame.SRCALPHA)
         
+        # Sfondo: gradiente statico e fotogrammi dei bagliori d'angolo
+        self._get_background_gradient()
+        self._init_bg_glow_keyframes()
+        
     def update_time(self, dt: float):
         """Aggiorna il tempo globale per animazioni."""
         self.global_time += dt
@@ -114,43 +352,221 @@ class Renderer:
         else:
             self.screen.fill(color)
     
+    def draw_background_static(self):
+        """
+        Disegna lo sfondo con i bagliori d'angolo fermi a metà pulsazione.
+        
+        Usato dai livelli statici del rendering a rettangoli sporchi, che
+        vengono renderizzati una volta sola e non possono animare lo sfondo.
+        """
+        self.screen.blit(self._get_background_gradient(), (0, 0))
+        radius = (self.BG_GLOW_MIN_RADIUS + self.BG_GLOW_MAX_RADIUS) // 2
+        for x, y, color, alpha in self._get_bg_patterns():
+            self.screen.blit(self._get_bg_glow(color, alpha, radius), (x - radius, y - radius))
+    
+    @contextmanager
+    def target(self, surface: pygame.Surface):
+        """
+        Reindirizza temporaneamente il disegno su un'altra superficie.
+        
+        Args:
+            surface: Superficie su cui disegnare dentro il blocco with
+        """
+        screen = self.screen
+        self.screen = surface
+        try:
+            yield surface
+        finally:
+            self.screen = screen
+    
     def draw_background_gradient(self):
         """Disegna lo sfondo con gradiente moderno."""
+        self.screen.blit(self._get_background_gradient(), (0, 0))
+        
+        # Aggiungi pattern decorativo sottile
+        self._draw_bg_pattern()
+    
+    def _get_background_gradient(self) -> pygame.Surface:
+        """
+        Restituisce il gradiente di sfondo, renderizzato una sola volta per risoluzione.
+        
+        Returns:
+            Superficie opaca con il gradiente a schermo intero
+        """
+        width, height = self.screen.get_size()
+        key = ('bg_gradient', width, height)
+        surface = self._cache.get(key)
+        if surface is not None:
+            return surface
+        
         top = COLORS['bg_gradient_top']
         bottom = COLORS['bg_gradient_bottom']
         
-        for y in range(self.height):
-            ratio = y / self.height
+        surface = pygame.Surface((width, height))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        for y in range(height):
+            ratio = y / height
             # Ease in-out per transizione più smooth
             ratio = ratio * ratio * (3 - 2 * ratio)
             r = int(top[0] * (1 - ratio) + bottom[0] * ratio)
             g = int(top[1] * (1 - ratio) + bottom[1] * ratio)
             b = int(top[2] * (1 - ratio) + bottom[2] * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (self.width, y))
+            pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
         
-        # Aggiungi pattern decorativo sottile
-        self._draw_bg_pattern()
+        self._cache[key] = surface
+        return surface
     
-    def _draw_bg_pattern(self):
-        """Disegna pattern decorativo sullo sfondo."""
-        # Cerchi decorativi sfumati agli angoli
-        patterns = [
+    def _get_bg_glow(self, color: Tuple[int, int, int], alpha: float, radius: int) -> pygame.Surface:
+        """
+        Restituisce il fotogramma del bagliore d'angolo per un dato raggio.
+        
+        Il raggio varia solo tra BG_GLOW_MIN_RADIUS e BG_GLOW_MAX_RADIUS, quindi
+        i fotogrammi possibili sono pochi e vengono creati una volta sola.
+        """
+        key = ('bg_glow', color, alpha, radius)
+        surf = self._cache.get(key)
+        if surf is None:
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            for r in range(radius, 0, -2):
+                a = int(255 * alpha * (r / radius))
+                pygame.draw.circle(surf, (*color, a), (radius, radius), r)
+            self._cache[key] = surf
+        return surf
+    
+    def _get_bg_patterns(self) -> list:
+        """Cerchi decorativi sfumati agli angoli: (x, y, colore, alpha)."""
+        return [
             (50, 50, COLORS['primary'], 0.03),
             (self.width - 50, 50, COLORS['accent'], 0.02),
             (50, self.height - 50, COLORS['secondary'], 0.02),
             (self.width - 50, self.height - 50, COLORS['primary'], 0.03),
         ]
+    
+    def _init_bg_glow_keyframes(self):
+        """Pre-renderizza tutti i fotogrammi dei bagliori d'angolo."""
+        for _, _, color, alpha in self._get_bg_patterns():
+            for radius in range(self.BG_GLOW_MIN_RADIUS, self.BG_GLOW_MAX_RADIUS + 1):
+                self._get_bg_glow(color, alpha, radius)
+    
+    def _draw_bg_pattern(self):
+        """Disegna pattern decorativo sullo sfondo."""
+        amplitude = self.BG_GLOW_MAX_RADIUS - self.BG_GLOW_MIN_RADIUS
         
-        for x, y, color, alpha in patterns:
+        for x, y, color, alpha in self._get_bg_patterns():
             pulse = 0.5 + 0.5 * math.sin(self.global_time * 0.5 + x * 0.01)
-            radius = int(80 + 20 * pulse)
-            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            for r in range(radius, 0, -2):
-                a = int(255 * alpha * (r / radius))
-                pygame.draw.circle(surf, (*color, a), (radius, radius), r)
+            radius = int(self.BG_GLOW_MIN_RADIUS + amplitude * pulse)
+            surf = self._get_bg_glow(color, alpha, radius)
             self.screen.blit(surf, (x - radius, y - radius))
+
+    def _quantize(self, value: float, step: int) -> int:
+        """Arrotonda un valore al multiplo di step più vicino."""
+        return int(round(value / step)) * step
+    
+    def get_glow_sprite(self,
+                        shape: str,
+                        size,
+                        color: Tuple[int, int, int],
+                        alpha: int,
+                        border_radius: int = 0) -> pygame.Surface:
+        """
+        Restituisce uno sprite di glow dalla cache, creandolo se manca.
     
-    def draw_text(self, 
+        Args:
+            shape: 'rect', 'circle' o 'hexagon'
+            size: (larghezza, altezza) per 'rect', raggio per le altre forme
+            color: Colore RGB del bagliore
+            alpha: Opacità (0-255)
+            border_radius: Arrotondamento degli angoli (solo 'rect')
+    
+        Returns:
+            Superficie SRCALPHA con la forma piena
+        """
+        key = (shape, size, color, alpha, border_radius)
+        sprite = self.glow_cache.get(key)
+        if sprite is not None:
+            return sprite
+    
+        if shape == 'rect':
+            sprite = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(sprite, (*color, alpha), sprite.get_rect(), border_radius=border_radius)
+        elif shape == 'circle':
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (size, size), size)
+        elif shape == 'hexagon':
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            angles = [i * math.pi / 3 - math.pi / 6 for i in range(6)]
+            points = [(size + size * math.cos(a), size + size * math.sin(a)) for a in angles]
+            pygame.draw.polygon(sprite, (*color, alpha), points)
+        else:
+            raise ValueError(f"Forma di glow sconosciuta: {shape}")
+    
+        self.glow_cache.put(key, sprite)
+        return sprite
+    
+    def draw_glow_rect(self,
+                       rect: pygame.Rect,
+                       color: Tuple[int, int, int],
+                       alpha: float,
+                       border_radius: int = 0):
+        """
+        Disegna un rettangolo di glow semitrasparente usando sprite in cache.
+    
+        La larghezza viene arrotondata per eccesso a un multiplo di 64 px: lo
+        sprite si disegna in due parti (corpo e angoli di destra), così le
+        barre di larghezza variabile riusano lo stesso sprite.
+        """
+        alpha = min(255, self._quantize(alpha, self.GLOW_ALPHA_STEP))
+        if alpha <= 0 or rect.width <= 0 or rect.height <= 0:
+            return
+        color = tuple(color)
+    
+        # Raggio effettivo: pygame lo limita a metà del lato minore
+        cap = min(border_radius, rect.height // 2)
+        if rect.width < 2 * cap:
+            sprite = self.get_glow_sprite('rect', rect.size, color, alpha, border_radius)
+            self.screen.blit(sprite, rect)
+            return
+    
+        bucket_width = -(-rect.width // 64) * 64
+        sprite = self.get_glow_sprite('rect', (bucket_width, rect.height), color, alpha, border_radius)
+        if rect.width == bucket_width:
+            self.screen.blit(sprite, rect)
+            return
+    
+        body = pygame.Rect(0, 0, rect.width - cap, rect.height)
+        self.screen.blit(sprite, rect.topleft, body)
+        if cap > 0:
+            right = pygame.Rect(bucket_width - cap, 0, cap, rect.height)
+            self.screen.blit(sprite, (rect.right - cap, rect.top), right)
+    
+    def draw_glow_circle(self,
+                         center: Tuple[float, float],
+                         radius: float,
+                         color: Tuple[int, int, int],
+                         alpha: float):
+        """Disegna un alone circolare, con raggio e alpha quantizzati."""
+        radius = self._quantize(radius, self.GLOW_RADIUS_STEP)
+        alpha = min(255, self._quantize(alpha, self.GLOW_ALPHA_STEP))
+        if radius <= 0 or alpha <= 0:
+            return
+        sprite = self.get_glow_sprite('circle', radius, tuple(color), alpha)
+        self.screen.blit(sprite, (int(center[0]) - radius, int(center[1]) - radius))
+    
+    def draw_glow_hexagon(self,
+                          center: Tuple[float, float],
+                          radius: float,
+                          color: Tuple[int, int, int],
+                          alpha: float):
+        """Disegna un alone esagonale, con raggio e alpha quantizzati."""
+        radius = self._quantize(radius, self.GLOW_RADIUS_STEP)
+        alpha = min(255, self._quantize(alpha, self.GLOW_ALPHA_STEP))
+        if radius <= 0 or alpha <= 0:
+            return
+        sprite = self.get_glow_sprite('hexagon', radius, tuple(color), alpha)
+        self.screen.blit(sprite, (int(center[0]) - radius, int(center[1]) - radius))
+
+    def draw_text(self,
                   text: str, 
                   pos: Tuple[int, int], 
                   font_size: str = 'medium',
@@ -161,48 +577,90 @@ class Renderer:
                   glow_color: Tuple[int, int, int] = None) -> pygame.Rect:
         """
         Disegna testo con effetti moderni.
+        
+        Il testo composto (glow e ombra inclusi) viene conservato in una cache
+        LRU: le etichette uguali da un frame all'altro costano un solo blit.
         """
         if color is None:
             color = COLORS['white']
         
-        font = self.fonts.get(font_size, self.fonts['medium'])
+        color = tuple(color)
+        gc = tuple(glow_color if glow_color else color) if glow else None
+        key = (text, font_size, color, gc, shadow)
         
-        # Effetto glow
-        if glow:
-            gc = glow_color if glow_color else color
-            glow_surf = font.render(text, True, gc)
-            for offset in [(2, 0), (-2, 0), (0, 2), (0, -2), (1, 1), (-1, -1), (1, -1), (-1, 1)]:
-                glow_rect = glow_surf.get_rect()
-                if center:
-                    glow_rect.center = (pos[0] + offset[0], pos[1] + offset[1])
-                else:
-                    glow_rect.topleft = (pos[0] + offset[0], pos[1] + offset[1])
-                glow_surf.set_alpha(60)
-                self.screen.blit(glow_surf, glow_rect)
-        
-        # Ombra
-        if shadow:
-            shadow_surf = font.render(text, True, (0, 0, 0))
-            shadow_rect = shadow_surf.get_rect()
-            if center:
-                shadow_rect.center = (pos[0] + 3, pos[1] + 3)
-            else:
-                shadow_rect.topleft = (pos[0] + 3, pos[1] + 3)
-            shadow_surf.set_alpha(100)
-            self.screen.blit(shadow_surf, shadow_rect)
-        
-        # Testo principale
-        text_surf = font.render(text, True, color)
-        text_rect = text_surf.get_rect()
+        entry = self.text_cache.get(key)
+        if entry is None:
+            font = self.fonts.get(font_size, self.fonts['medium'])
+            entry = self._compose_text(text, font, color, gc, shadow)
+            self.text_cache.put(key, entry)
+        surface, (pad_x, pad_y), size = entry
         
+        text_rect = pygame.Rect((0, 0), size)
         if center:
             text_rect.center = pos
         else:
             text_rect.topleft = pos
         
-        self.screen.blit(text_surf, text_rect)
+        if glow or shadow:
+            self.screen.blit(surface, (text_rect.x - pad_x, text_rect.y - pad_y),
+                             special_flags=pygame.BLEND_PREMULTIPLIED)
+        else:
+            self.screen.blit(surface, text_rect)
         return text_rect
     
+    def _compose_text(self, text: str, font: pygame.font.Font,
+                      color: Tuple[int, int, int],
+                      glow_color: Optional[Tuple[int, int, int]],
+                      shadow: bool) -> Tuple[pygame.Surface, Tuple[int, int], Tuple[int, int]]:
+        """
+        Renderizza il testo con i suoi effetti in un'unica superficie.
+        
+        Con glow o ombra i livelli vengono fusi in alpha premoltiplicato, così
+        la superficie finale equivale ai blit separati sullo schermo.
+        
+        Returns:
+            Tupla (superficie, posizione del testo nella superficie, dimensione del testo)
+        """
+        text_surf = font.render(text, True, color)
+        width, height = text_surf.get_size()
+        if glow_color is None and not shadow:
+            return text_surf, (0, 0), (width, height)
+        
+        # Margini per gli offset del glow (±2 px) e dell'ombra (+3 px)
+        pad = 2 if glow_color is not None else 0
+        extra = max(pad, 3 if shadow else 0)
+        composed = pygame.Surface((width + pad + extra, height + pad + extra), pygame.SRCALPHA)
+        
+        def premultiplied(surf: pygame.Surface, alpha: int = 255) -> pygame.Surface:
+            # Premoltiplica a mano: le superfici di font.render() non sempre
+            # hanno un formato che premul_alpha() gestisce correttamente
+            surf = surf.copy()
+            rgb = pygame.surfarray.pixels3d(surf)
+            pixel_alpha = pygame.surfarray.pixels_alpha(surf)
+            scaled_alpha = pixel_alpha.astype(np.uint16) * alpha // 255
+            rgb[...] = (rgb * scaled_alpha[..., None] + 127) // 255
+            pixel_alpha[...] = scaled_alpha
+            del rgb, pixel_alpha  # Sblocca la superficie
+            return surf
+        
+        # Effetto glow
+        if glow_color is not None:
+            glow_surf = premultiplied(font.render(text, True, glow_color), 60)
+            for dx, dy in [(2, 0), (-2, 0), (0, 2), (0, -2), (1, 1), (-1, -1), (1, -1), (-1, 1)]:
+                composed.blit(glow_surf, (pad + dx, pad + dy),
+                              special_flags=pygame.BLEND_PREMULTIPLIED)
+        
+        # Ombra
+        if shadow:
+            shadow_surf = premultiplied(font.render(text, True, (0, 0, 0)), 100)
+            composed.blit(shadow_surf, (pad + 3, pad + 3),
+                          special_flags=pygame.BLEND_PREMULTIPLIED)
+        
+        # Testo principale
+        composed.blit(premultiplied(text_surf), (pad, pad),
+                      special_flags=pygame.BLEND_PREMULTIPLIED)
+        return composed, (pad, pad), (width, height)
+    
     def draw_card(self,
                   pos: Tuple[int, int],
                   size: Tuple[int, int],
@@ -217,12 +675,9 @@ class Renderer:
         
         # Glow effect se selezionato
         if selected and glow_color:
-            glow_rect = rect.inflate(10, 10)
-            glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
             pulse = 0.6 + 0.4 * math.sin(self.global_time * 4)
-            pygame.draw.rect(glow_surf, (*glow_color, int(80 * pulse)), 
-                           glow_surf.get_rect(), border_radius=border_radius + 5)
-            self.screen.blit(glow_surf, glow_rect)
+            self.draw_glow_rect(rect.inflate(10, 10), glow_color, 80 * pulse,
+                                border_radius=border_radius + 5)
         
         # Sfondo card
         bg_color = COLORS['card_bg_light'] if selected else COLORS['card_bg']
@@ -258,11 +713,7 @@ class Renderer:
         # Effetto glow quando selezionato
         if selected:
             pulse = 0.5 + 0.5 * math.sin(self.global_time * 5)
-            glow_rect = rect.inflate(12, 12)
-            glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surf, (*color, int(100 * pulse)), 
-                           glow_surf.get_rect(), border_radius=18)
-            self.screen.blit(glow_surf, glow_rect)
+            self.draw_glow_rect(rect.inflate(12, 12), color, 100 * pulse, border_radius=18)
         
         # Sfondo gradiente
         if selected:
@@ -324,14 +775,7 @@ class Renderer:
             self._draw_camera_placeholder(pos, size)
             return
         
-        # Ridimensiona il frame
-        frame_resized = cv2.resize(frame, size)
-        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-        frame_rotated = np.rot90(frame_rgb)
-        frame_rotated = np.flipud(frame_rotated)
-        
-        # Crea superficie Pygame
-        surf = pygame.surfarray.make_surface(frame_rotated)
+        surf = self._get_camera_surface(frame, size)
         rect = surf.get_rect(center=pos)
         
         # Sfondo con padding
@@ -349,6 +793,44 @@ class Renderer:
         
         self.screen.blit(surf, rect)
     
+    def _get_camera_surface(self, frame: np.ndarray, size: Tuple[int, int]) -> pygame.Surface:
+        """
+        Restituisce il frame ridimensionato come superficie, senza copie intermedie.
+        
+        Ridimensionamento e conversione BGR->RGB scrivono direttamente in un
+        buffer preallocato per dimensione, che pygame.image.frombuffer avvolge
+        senza copiarlo. Se lo stesso frame viene ridisegnato alla stessa
+        dimensione nello stesso fotogramma, la superficie viene riusata così com'è.
+        
+        Args:
+            frame: Frame BGR della camera
+            size: Dimensione (larghezza, altezza) desiderata
+        
+        Returns:
+            Superficie che condivide la memoria del buffer: resta valida solo
+            fino al prossimo frame disegnato alla stessa dimensione
+        """
+        size = (int(size[0]), int(size[1]))
+        texture = self._camera_textures.get(size)
+        if texture is None:
+            buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            texture = {
+                'buffer': buffer,
+                'surface': pygame.image.frombuffer(buffer, size, 'RGB'),
+                'frame': None,
+                'time': None,
+            }
+            self._camera_textures[size] = texture
+        elif texture['frame'] is frame and texture['time'] == self.global_time:
+            return texture['surface']
+        
+        buffer = texture['buffer']
+        cv2.resize(frame, size, dst=buffer)
+        cv2.cvtColor(buffer, cv2.COLOR_BGR2RGB, dst=buffer)
+        texture['frame'] = frame
+        texture['time'] = self.global_time
+        return texture['surface']
+    
     def _draw_camera_placeholder(self, pos: Tuple[int, int], size: Tuple[int, int]):
         """Disegna placeholder quando la camera non è disponibile."""
         rect = pygame.Rect(0, 0, size[0], size[1])
@@ -416,21 +898,15 @@ class Renderer:
             
             # Glow effect
             if show_glow:
-                glow_rect = progress_rect.inflate(4, 4)
-                glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surf, (*color, 80), glow_surf.get_rect(), 
-                               border_radius=(size[1] - 4) // 2)
-                self.screen.blit(glow_surf, glow_rect)
+                self.draw_glow_rect(progress_rect.inflate(4, 4), color, 80,
+                                    border_radius=(size[1] - 4) // 2)
             
             pygame.draw.rect(self.screen, color, progress_rect, border_radius=(size[1] - 4) // 2)
             
             # Shine effect
             shine_rect = pygame.Rect(progress_rect.left, progress_rect.top, 
                                     progress_rect.width, progress_rect.height // 3)
-            shine_surf = pygame.Surface((shine_rect.width, shine_rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(shine_surf, (*COLORS['white'], 40), shine_surf.get_rect(), 
-                           border_radius=2)
-            self.screen.blit(shine_surf, shine_rect)
+            self.draw_glow_rect(shine_rect, COLORS['white'], 40, border_radius=2)
     
     def draw_timer_bar(self,
                        pos: Tuple[int, int],
@@ -479,10 +955,7 @@ class Renderer:
                 glow_radius = size // 2
             
             # Glow esterno
-            glow_surf = pygame.Surface((size + 20, size + 20), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (*move_color, 40), 
-                             (size // 2 + 10, size // 2 + 10), glow_radius)
-            self.screen.blit(glow_surf, (pos[0] - size // 2 - 10, pos[1] - size // 2 - 10))
+            self.draw_glow_circle(pos, glow_radius, move_color, 40)
             
             # Cerchio sfondo
             pygame.draw.circle(self.screen, data['bg'], pos, size // 2)
@@ -545,10 +1018,7 @@ class Renderer:
         radius = int(70 * pulse)
         
         # Glow
-        glow_surf = pygame.Surface((radius * 3, radius * 3), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surf, (*COLORS['secondary'], 60), 
-                         (radius * 1.5, radius * 1.5), radius * 1.2)
-        self.screen.blit(glow_surf, (pos[0] - radius * 1.5, pos[1] - radius * 1.5))
+        self.draw_glow_circle(pos, radius * 1.2, COLORS['secondary'], 60)
         
         # Cerchio principale
         pygame.draw.circle(self.screen, COLORS['secondary'], pos, radius)
@@ -590,10 +1060,7 @@ class Renderer:
         banner_rect = pygame.Rect(50, center_y - 40, self.width - 100, 80)
         
         # Sfondo con glow
-        glow_rect = banner_rect.inflate(10, 10)
-        glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surf, (*bg_color, 100), glow_surf.get_rect(), border_radius=20)
-        self.screen.blit(glow_surf, glow_rect)
+        self.draw_glow_rect(banner_rect.inflate(10, 10), bg_color, 100, border_radius=20)
         pygame.draw.rect(self.screen, bg_color, banner_rect, border_radius=15)
         pygame.draw.rect(self.screen, COLORS['white'], banner_rect, width=2, border_radius=15)
         
@@ -664,12 +1131,13 @@ class Renderer:
                 row_rect = pygame.Rect(center_x - table_width // 2 + 8, y - 10, table_width - 16, row_height - 4)
                 pygame.draw.rect(self.screen, COLORS['success'], row_rect, border_radius=8)
             
-            # Posizione con medaglia
-            if i < 3:
-                rank_text = medals[i]
-                rank_color = medal_colors[i]
+            # Posizione con medaglia (le pagine successive alla prima portano la propria)
+            rank = score.get('rank', i + 1)
+            if rank <= 3:
+                rank_text = medals[rank - 1]
+                rank_color = medal_colors[rank - 1]
             else:
-                rank_text = f"{i + 1}."
+                rank_text = f"{rank}."
                 rank_color = COLORS['white']
             
             self.draw_text(rank_text, (center_x - 180, y), 'small', rank_color, center=True)
@@ -682,17 +1150,10 @@ class Renderer:
             score_val = score.get('score', 0)
             self.draw_text(str(score_val), (center_x + 80, y), 'medium', COLORS['success'], center=True)
             
-            # Data
-            date_str = score.get('date', '')
-            if date_str:
-                try:
-                    from datetime import datetime
-                    date_obj = datetime.fromisoformat(date_str)
-                    date_display = date_obj.strftime("%d/%m")
-                except:
-                    date_display = "-"
-            else:
-                date_display = "-"
+            # Data (già formattata nelle viste della classifica)
+            date_display = score.get('date_display')
+            if date_display is None:
+                date_display = format_score_date(score.get('date', ''))
             self.draw_text(date_display, (center_x + 180, y), 'tiny', COLORS['muted'], center=True)
             
             y += row_height
@@ -772,55 +1233,47 @@ class Renderer:
         if color is None:
             color = COLORS['primary']
         
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            velocity = random.uniform(1, velocity_range)
-            vx = velocity * math.cos(angle)
-            vy = velocity * math.sin(angle) - 2  # Bias verso l'alto
-            
-            size = random.randint(3, 8)
-            particle = Particle(x, y, vx, vy, lifetime, color, size)
-            self.particles.append(particle)
+        rng = self._rng
+        angle = rng.uniform(0, 2 * math.pi, count)
+        velocity = rng.uniform(1, velocity_range, count)
+        vx = velocity * np.cos(angle)
+        vy = velocity * np.sin(angle) - 2  # Bias verso l'alto
+        
+        sizes = rng.integers(3, 9, count)
+        self.particles.emit(x, y, vx, vy, lifetime, [color], sizes)
     
     def emit_confetti(self, x: float, y: float, count: int = 30):
         """Emette coriandoli per celebrazioni."""
         colors = [COLORS['success'], COLORS['warning'], COLORS['primary'], 
                  COLORS['secondary'], COLORS['accent']]
         
-        for _ in range(count):
-            color = random.choice(colors)
-            angle = random.uniform(-math.pi, 0)
-            velocity = random.uniform(3, 8)
-            vx = velocity * math.cos(angle)
-            vy = velocity * math.sin(angle) - 3
-            
-            particle = Particle(x, y, vx, vy, 2.0, color, random.randint(4, 10), 'rect')
-            particle.gravity = 0.1
-            self.particles.append(particle)
+        rng = self._rng
+        angle = rng.uniform(-math.pi, 0, count)
+        velocity = rng.uniform(3, 8, count)
+        vx = velocity * np.cos(angle)
+        vy = velocity * np.sin(angle) - 3
+        
+        self.particles.emit(x, y, vx, vy, 2.0, colors, rng.integers(4, 11, count),
+                            color_choice=rng.integers(0, len(colors), count),
+                            particle_type='rect', gravity=0.1)
     
     def update_particles(self, dt: float):
         """Aggiorna tutte le particelle."""
         self.update_time(dt)
-        for particle in self.particles[:]:
-            particle.update(dt)
-            if not particle.is_alive():
-                self.particles.remove(particle)
+        self.particles.update(dt)
     
     def draw_particles(self):
         """Disegna tutte le particelle attive."""
-        for particle in self.particles:
-            if particle.is_alive():
-                alpha = particle.get_alpha()
-                size = max(1, int(particle.size * alpha))
-                color = tuple(int(c * alpha) for c in particle.color)
-                
-                if particle.particle_type == 'rect':
-                    rect = pygame.Rect(int(particle.x) - size // 2, 
-                                      int(particle.y) - size // 2, size, size)
-                    pygame.draw.rect(self.screen, color, rect)
-                else:
-                    pygame.draw.circle(self.screen, color, 
-                                     (int(particle.x), int(particle.y)), size)
+        self.particles.draw(self.screen)
+    
+    def get_particles_rect(self) -> Optional[pygame.Rect]:
+        """
+        Restituisce il rettangolo che contiene tutte le particelle attive.
+        
+        Returns:
+            Rettangolo sullo schermo o None se non ci sono particelle
+        """
+        return self.particles.get_bounds()
     
     def draw_gradient_rect(self,
                           rect: pygame.Rect,
@@ -850,18 +1303,22 @@ class Renderer:
         actual_radius = int(radius * pulsation)
         
         # Glow esterno
-        glow_surf = pygame.Surface((actual_radius * 3, actual_radius * 3), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surf, (*color, 40), 
-                         (actual_radius * 1.5, actual_radius * 1.5), actual_radius * 1.3)
-        self.screen.blit(glow_surf, (pos[0] - actual_radius * 1.5, pos[1] - actual_radius * 1.5))
+        self.draw_glow_circle(pos, actual_radius * 1.3, color, 40)
         
         pygame.draw.circle(self.screen, color, pos, actual_radius)
     
     def apply_screen_overlay(self, dt: float):
         """Applica overlay e aggiorna alpha."""
         if self.screen_overlay_alpha > 0:
-            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            overlay.fill((*self.screen_overlay_color, int(self.screen_overlay_alpha)))
+            # Superficie opaca riusata: l'opacità passa da set_alpha
+            overlay = self._overlay_surface
+            if overlay is None or overlay.get_size() != (self.width, self.height):
+                overlay = self._overlay_surface = pygame.Surface((self.width, self.height))
+                self._overlay_color = None
+            if self._overlay_color != self.screen_overlay_color:
+                overlay.fill(self.screen_overlay_color)
+                self._overlay_color = self.screen_overlay_color
+            overlay.set_alpha(int(self.screen_overlay_alpha))
             self.screen.blit(overlay, (0, 0))
             self.screen_overlay_alpha = max(0, self.screen_overlay_alpha - 400 * dt)
     
@@ -917,11 +1374,7 @@ class Renderer:
                  for a in angles]
         
         # Glow
-        glow_surf = pygame.Surface((radius * 3, radius * 3), pygame.SRCALPHA)
-        glow_points = [(radius * 1.5 + radius * 1.2 * math.cos(a), 
-                       radius * 1.5 + radius * 1.2 * math.sin(a)) for a in angles]
-        pygame.draw.polygon(glow_surf, (*color, 40), glow_points)
-        self.screen.blit(glow_surf, (pos[0] - radius * 1.5, pos[1] - radius * 1.5))
+        self.draw_glow_hexagon(pos, radius * 1.2, color, 40)
         
         pygame.draw.polygon(self.screen, color, points)
         pygame.draw.polygon(self.screen, COLORS['white'], points, width=2)
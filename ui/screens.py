@@ -7,20 +7,26 @@ Interfaccia utente riprogettata con stile professionale e carino.
 import pygame
 import math
 import random
-from typing import Optional
+from typing import Optional, List, Callable, Tuple, Hashable
 import time
 
 from game.game_state import GameState, StateManager
 from game.game_logic import GameLogic, Move, RoundResult
 from game.highscore import HighScoreManager
+from game.journal import GameJournal
 from ui.renderer import Renderer
 from config import (
     COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, ROUNDS_TO_WIN, COUNTDOWN_TIME, 
     GAME_SETTINGS, GameMode, TimedDifficulty, DIFFICULTY_NAMES, 
-    CPU_MOVE_TIMER, PLAYER_RESPONSE_TIMES, UI_SYMBOLS
+    CPU_MOVE_TIMER, PLAYER_RESPONSE_TIMES, UI_SYMBOLS, RETAINED_RENDERING,
+    HIGHSCORE_PAGE_SIZE
 )
 
 
+# Zona animata di una schermata: rettangolo da ridisegnare e funzione che la disegna
+DynamicRegion = Tuple[pygame.Rect, Callable[[], None]]
+
+
 class ScreenManager:
     """
     Gestisce il rendering delle diverse schermate del gioco.
@@ -31,7 +37,8 @@ class ScreenManager:
                  renderer: Renderer,
                  state_manager: StateManager,
                  game_logic: GameLogic,
-                 highscore_manager: HighScoreManager):
+                 highscore_manager: HighScoreManager,
+                 journal: Optional[GameJournal] = None):
         """
         Inizializza il gestore delle schermate.
         """
@@ -39,14 +46,19 @@ class ScreenManager:
         self.state = state_manager
         self.game = game_logic
         self.highscore = highscore_manager
+        self.journal = journal
         
         # Input nome
         self.input_name = ""
         self.cursor_blink_time = 0
         self._name_input_particles = False
         
-        # Filtro highscore
+        # Filtro e pagina highscore (solo la pagina visibile resta in memoria)
         self.highscore_filter = 'all'
+        self.highscore_page = 0
+        self._highscore_page_key = None
+        self._highscore_page_rows: List[dict] = []
+        self._highscore_page_total = 0
         
         # Animazioni
         self.animation_time = 0
@@ -86,12 +98,25 @@ class ScreenManager:
         # Camera error
         self.camera_error_selection = 0
         self.available_cameras = []
+        
+        # Modello di riconoscimento ancora in caricamento (aggiornato dal gioco)
+        self.model_loading = False
+        
+        # Rendering a rettangoli sporchi (solo schermate quasi statiche)
+        self.retained = RETAINED_RENDERING
+        self._static_layers = {}  # stato -> (chiave, superficie del livello statico)
+        self._retained_state = None  # Stato disegnato nell'ultimo frame in modalità retained
+        self._restore_rects: List[pygame.Rect] = []  # Zone disegnate fuori dalle regioni dinamiche
+        self._dirty_rects: Optional[List[pygame.Rect]] = None  # None = aggiorna tutto lo schermo
+        self._overlay_drawn = False
     
     def update(self, dt: float):
         """Aggiorna le animazioni."""
         self.animation_time += dt
         self.cursor_blink_time += dt
         self.renderer.update_particles(dt)
+        if self.renderer.screen_overlay_alpha > 0:
+            self._overlay_drawn = True
         self.renderer.apply_screen_overlay(dt)
     
     def _draw_no_camera_indicator(self, position: tuple, size: tuple):
@@ -111,16 +136,37 @@ class ScreenManager:
         dots = "." * (int(self.animation_time * 2) % 4)
         self.renderer.draw_text(f"Ricerca{dots}", (x, y + 25), 'tiny', COLORS['warning'], center=True)
     
+    def _draw_model_loading_indicator(self, position: tuple):
+        """Disegna l'indicatore di caricamento del modello di riconoscimento."""
+        dots = "." * (int(self.animation_time * 2) % 4)
+        pulse = 0.5 + 0.5 * math.sin(self.animation_time * 3)
+        color = tuple(int(c * (0.6 + 0.4 * pulse)) for c in COLORS['warning'])
+        self.renderer.draw_text(f"Caricamento modello{dots}", position, 'tiny', color, center=True)
+    
     def render(self, 
                current_state: GameState,
                frame = None,
                detected_gesture: str = 'none',
                gesture_progress: float = 0.0):
-        """Renderizza la schermata corrente."""
+        """
+        Renderizza la schermata corrente.
+        
+        In modalità retained le schermate quasi statiche ridisegnano solo le
+        regioni dinamiche sopra il loro livello statico; le zone da aggiornare
+        si leggono poi con get_dirty_rects().
+        """
+        layers = self._get_layers(current_state, frame, detected_gesture)
+        if layers is not None and self.retained:
+            self._render_retained(current_state, *layers)
+            return
+        
+        self._retained_state = None
+        self._dirty_rects = None
+        self._restore_rects = []  # Schermata ridisegnata per intero a ogni frame
         self.renderer.clear()
         
-        if current_state == GameState.MENU:
-            self._render_menu(frame, detected_gesture)
+        if layers is not None:
+            self._draw_layers(layers)
         elif current_state == GameState.MODE_SELECT:
             self._render_mode_select(frame, detected_gesture)
         elif current_state == GameState.PLAYING:
@@ -135,39 +181,211 @@ class ScreenManager:
             self._render_result(frame)
         elif current_state == GameState.GAME_OVER:
             self._render_game_over(frame)
-        elif current_state == GameState.HIGHSCORE:
-            self._render_highscore(frame, detected_gesture)
         elif current_state == GameState.ENTER_NAME:
             self._render_enter_name(frame)
-        elif current_state == GameState.SETTINGS:
-            self._render_settings(frame, detected_gesture)
-        elif current_state == GameState.CAMERA_ERROR:
-            self._render_camera_error()
         
         self.renderer.draw_particles()
         self.renderer.apply_screen_overlay(0)
     
+    def get_dirty_rects(self) -> Optional[List[pygame.Rect]]:
+        """
+        Restituisce le zone dello schermo cambiate nell'ultimo render.
+        
+        Returns:
+            Lista di rettangoli per pygame.display.update, o None se va
+            aggiornato tutto lo schermo
+        """
+        return self._dirty_rects
+    
+    def mark_dirty(self, rect: pygame.Rect):
+        """
+        Segnala una zona disegnata sopra la schermata dopo render().
+        
+        La zona viene aggiornata in questo frame e ripristinata dal livello
+        statico nel successivo (anche se questo frame aggiorna tutto lo schermo).
+        """
+        self._restore_rects.append(rect)
+        if self._dirty_rects is not None:
+            self._dirty_rects.append(rect)
+    
+    def _get_layers(self, state: GameState, frame, gesture: str
+                    ) -> Optional[Tuple[Hashable, Callable[[], None], List[DynamicRegion]]]:
+        """
+        Restituisce i livelli delle schermate quasi statiche.
+        
+        Returns:
+            Tupla (chiave del livello statico, funzione che lo disegna, regioni
+            dinamiche) oppure None per le schermate sempre ridisegnate
+        """
+        if state == GameState.MENU:
+            return self._menu_layers(frame, gesture)
+        if state == GameState.HIGHSCORE:
+            return self._highscore_layers(frame, gesture)
+        if state == GameState.SETTINGS:
+            return self._settings_layers(frame, gesture)
+        if state == GameState.CAMERA_ERROR:
+            return self._camera_error_layers()
+        return None
+    
+    def _draw_layers(self, layers: Tuple[Hashable, Callable[[], None], List[DynamicRegion]]):
+        """Disegna per intero livello statico e regioni dinamiche di una schermata."""
+        static_key, draw_static, regions = layers
+        draw_static()
+        for _, draw in regions:
+            draw()
+    
+    def _render_retained(self, state: GameState, static_key: Hashable,
+                         draw_static: Callable[[], None], regions: List[DynamicRegion]):
+        """
+        Disegna una schermata a rettangoli sporchi.
+        
+        Il livello statico viene renderizzato solo quando cambia la sua chiave;
+        negli altri frame si ripristinano dal livello le zone modificate e si
+        ridisegnano soltanto le regioni dinamiche.
+        """
+        screen = self.renderer.screen
+        screen_rect = screen.get_rect()
+        
+        layer = self._static_layers.get(state)
+        full = (layer is None or layer[0] != static_key or self._retained_state != state
+                or self._overlay_drawn or self.renderer.screen_overlay_alpha > 0)
+        if layer is None or layer[0] != static_key:
+            surface = layer[1] if layer is not None else pygame.Surface(screen.get_size(), 0, screen)
+            with self.renderer.target(surface):
+                self.renderer.draw_background_static()
+                draw_static()
+            layer = (static_key, surface)
+            self._static_layers[state] = layer
+        static = layer[1]
+        
+        if full:
+            screen.blit(static, (0, 0))
+            dirty = None
+        else:
+            dirty = [rect.clip(screen_rect) for rect in self._restore_rects]
+            for rect in dirty:
+                screen.blit(static, rect, rect)
+        
+        # Prima si ripristinano tutte le regioni, poi si disegnano: così le
+        # regioni sovrapposte non si cancellano a vicenda
+        regions = [(rect.clip(screen_rect), draw) for rect, draw in regions]
+        if not full:
+            for rect, _ in regions:
+                screen.blit(static, rect, rect)
+                dirty.append(rect)
+        for rect, draw in regions:
+            screen.set_clip(rect)
+            draw()
+            screen.set_clip(None)
+        
+        self.renderer.draw_particles()
+        self.renderer.apply_screen_overlay(0)
+        
+        particles_rect = self.renderer.get_particles_rect()
+        self._restore_rects = [particles_rect] if particles_rect is not None else []
+        if dirty is not None:
+            dirty.extend(self._restore_rects)
+        
+        self._dirty_rects = dirty
+        self._retained_state = state
+        self._overlay_drawn = False
+    
+    def _text_region(self, text: str, font_size: str, center: Tuple[int, int],
+                     bob: int = 0) -> pygame.Rect:
+        """Rettangolo che contiene un testo centrato con glow, ombra e oscillazione verticale."""
+        width, height = self.renderer.fonts[font_size].size(text)
+        rect = pygame.Rect(0, 0, width + 10, height + 10 + 2 * bob)
+        rect.center = center
+        return rect
+    
+    def _camera_region(self, pos: Tuple[int, int], size: Tuple[int, int]) -> pygame.Rect:
+        """Rettangolo del feed camera con cornice e decorazioni."""
+        rect = pygame.Rect(0, 0, size[0] + 12, size[1] + 12)
+        rect.center = pos
+        return rect
+    
+    def _gesture_indicator_region(self, pos: Tuple[int, int]) -> pygame.Rect:
+        """Rettangolo dell'indicatore del gesto."""
+        return pygame.Rect(pos[0] - 62, pos[1] - 17, 124, 34)
+    
+    def _pulse_circle_region(self, pos: Tuple[int, int], radius: int) -> pygame.Rect:
+        """Rettangolo di un cerchio pulsante, alone compreso."""
+        extent = int(radius * 1.2 * 1.3) + Renderer.GLOW_RADIUS_STEP + 2
+        return pygame.Rect(pos[0] - extent, pos[1] - extent, 2 * extent, 2 * extent)
+    
     # =========================================================================
     # MENU PRINCIPALE
     # =========================================================================
     
     def _render_menu(self, frame, gesture: str):
         """Renderizza il menu principale."""
-        # Titolo con animazione
-        y_offset = int(8 * math.sin(self.animation_time * 1.5))
-        
-        # Logo/Titolo principale
-        self.renderer.draw_text(
-            "MORRA CINESE",
-            (SCREEN_WIDTH // 2, 80 + y_offset),
-            'hero',
-            COLORS['primary'],
-            center=True,
-            shadow=True,
-            glow=True,
-            glow_color=COLORS['primary_light']
-        )
+        self._draw_layers(self._menu_layers(frame, gesture))
+    
+    def _menu_items(self) -> list:
+        """Voci del menu principale: (etichetta, chiave, colore)."""
+        return [
+            ('GIOCA', 'play', COLORS['success']),
+            ('CLASSIFICA', 'trophy', COLORS['warning']),
+            ('IMPOSTAZIONI', 'settings', COLORS['accent']),
+            ('ESCI', 'exit', COLORS['danger'])
+        ]
+    
+    def _menu_button_pos(self, index: int) -> Tuple[int, int]:
+        """Centro del pulsante del menu in posizione index."""
+        return (SCREEN_WIDTH // 2, 220 + index * 70)
+    
+    def _menu_layers(self, frame, gesture: str):
+        """Livelli del menu: titolo, decorazioni, camera e voce selezionata sono animati."""
+        selection = self.state.menu_selection
+        camera_pos, camera_size = (SCREEN_WIDTH - 100, 90), (140, 105)
+        loading_pos = (SCREEN_WIDTH - 100, 165)
+        gesture_pos = (SCREEN_WIDTH - 100, SCREEN_HEIGHT - 70)
+        
+        def draw_title():
+            # Titolo con animazione
+            y_offset = int(8 * math.sin(self.animation_time * 1.5))
+            self.renderer.draw_text(
+                "MORRA CINESE",
+                (SCREEN_WIDTH // 2, 80 + y_offset),
+                'hero',
+                COLORS['primary'],
+                center=True,
+                shadow=True,
+                glow=True,
+                glow_color=COLORS['primary_light']
+            )
         
+        def draw_camera():
+            if frame is not None:
+                self.renderer.draw_camera_feed(frame, camera_pos, camera_size, COLORS['primary'])
+            else:
+                self._draw_no_camera_indicator(camera_pos, camera_size)
+        
+        def draw_loading():
+            if self.model_loading:
+                self._draw_model_loading_indicator(loading_pos)
+        
+        def draw_selected_button():
+            label, _, accent_color = self._menu_items()[selection]
+            self.renderer.draw_modern_button(label, self._menu_button_pos(selection),
+                                             (280, 55), True, accent_color)
+        
+        selected_rect = pygame.Rect(0, 0, 280, 55).inflate(16, 16)
+        selected_rect.center = self._menu_button_pos(selection)
+        
+        regions = [
+            (self._text_region("MORRA CINESE", 'hero', (SCREEN_WIDTH // 2, 80), bob=8), draw_title),
+            *self._menu_decoration_regions(),
+            (self._camera_region(camera_pos, camera_size), draw_camera),
+            (self._text_region("Caricamento modello...", 'tiny', loading_pos), draw_loading),
+            (selected_rect, draw_selected_button),
+            (self._gesture_indicator_region(gesture_pos),
+             lambda: self.renderer.draw_gesture_indicator(gesture, 1.0, gesture_pos)),
+        ]
+        return (selection,), self._draw_menu_static, regions
+    
+    def _draw_menu_static(self):
+        """Disegna le parti fisse del menu principale."""
         # Sottotitolo
         self.renderer.draw_text(
             "Portatile Interattiva",
@@ -177,35 +395,10 @@ class ScreenManager:
             center=True
         )
         
-        # Decorazioni laterali animate
-        self._draw_menu_decorations()
-        
-        # Feed camera
-        if frame is not None:
-            self.renderer.draw_camera_feed(frame, (SCREEN_WIDTH - 100, 90), (140, 105), COLORS['primary'])
-        else:
-            self._draw_no_camera_indicator((SCREEN_WIDTH - 100, 90), (140, 105))
-        
-        # Menu items
-        menu_items = [
-            ('GIOCA', 'play', COLORS['success']),
-            ('CLASSIFICA', 'trophy', COLORS['warning']),
-            ('IMPOSTAZIONI', 'settings', COLORS['accent']),
-            ('ESCI', 'exit', COLORS['danger'])
-        ]
-        
-        start_y = 220
-        for i, (label, key, accent_color) in enumerate(menu_items):
-            selected = i == self.state.menu_selection
-            y = start_y + i * 70
-            
-            self.renderer.draw_modern_button(
-                label,
-                (SCREEN_WIDTH // 2, y),
-                (280, 55),
-                selected,
-                accent_color if selected else None
-            )
+        # Menu items (la voce selezionata pulsa ed è una regione dinamica)
+        for i, (label, key, accent_color) in enumerate(self._menu_items()):
+            if i != self.state.menu_selection:
+                self.renderer.draw_modern_button(label, self._menu_button_pos(i), (280, 55), False, None)
         
         # Istruzioni
         self.renderer.draw_text(
@@ -215,30 +408,30 @@ class ScreenManager:
             COLORS['muted'],
             center=True
         )
-        
-        # Indicatore gesto
-        self.renderer.draw_gesture_indicator(gesture, 1.0, (SCREEN_WIDTH - 100, SCREEN_HEIGHT - 70))
+    
+    def _menu_decorations(self) -> list:
+        """Cerchi pulsanti decorativi del menu: (posizione, raggio, colore, sfasamento)."""
+        return [
+            # Sinistra
+            ((60, 80), 25, COLORS['primary'], 0.0),
+            ((100, 120), 15, COLORS['secondary'], 0.5),
+            # Destra (sotto camera)
+            ((SCREEN_WIDTH - 50, SCREEN_HEIGHT - 100), 20, COLORS['accent'], 1.0),
+        ]
     
     def _draw_menu_decorations(self):
         """Disegna decorazioni animate per il menu."""
-        # Cerchi pulsanti decorativi
-        pulse = self.animation_time
-        
-        # Sinistra
-        self.renderer.draw_pulse_circle(
-            (60, 80),
-            25, COLORS['primary'], pulse
-        )
-        self.renderer.draw_pulse_circle(
-            (100, 120),
-            15, COLORS['secondary'], pulse + 0.5
-        )
-        
-        # Destra (sotto camera)
-        self.renderer.draw_pulse_circle(
-            (SCREEN_WIDTH - 50, SCREEN_HEIGHT - 100),
-            20, COLORS['accent'], pulse + 1.0
-        )
+        for _, draw in self._menu_decoration_regions():
+            draw()
+    
+    def _menu_decoration_regions(self) -> List[DynamicRegion]:
+        """Regioni dinamiche dei cerchi pulsanti del menu."""
+        regions = []
+        for pos, radius, color, phase in self._menu_decorations():
+            def draw(pos=pos, radius=radius, color=color, phase=phase):
+                self.renderer.draw_pulse_circle(pos, radius, color, self.animation_time + phase)
+            regions.append((self._pulse_circle_region(pos, radius), draw))
+        return regions
     
     # =========================================================================
     # SELEZIONE MODALITA'
@@ -335,9 +528,7 @@ class ScreenManager:
             
             if selected:
                 # Glow
-                glow_surf = pygame.Surface((box_width + 10, 70), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surf, (*diff['color'], 60), glow_surf.get_rect(), border_radius=12)
-                self.renderer.screen.blit(glow_surf, (box_rect.left - 5, box_rect.top - 5))
+                self.renderer.draw_glow_rect(box_rect.inflate(10, 10), diff['color'], 60, border_radius=12)
                 
                 pygame.draw.rect(self.renderer.screen, diff['color'], box_rect, border_radius=10)
             else:
@@ -654,8 +845,16 @@ class ScreenManager:
         self.renderer.draw_text(f"Tasso vittoria: {win_rate:.1f}%", (SCREEN_WIDTH // 2, 375), 
                                'small', win_color, center=True)
         
+        # Statistiche di sempre (aggregati del registro, nessuna scansione delle partite)
+        if self.journal is not None:
+            totals = self.journal.get_stats()
+            self.renderer.draw_text(
+                f"Partite giocate: {totals['total_games']}  •  Serie media: {totals['average_streak']:.1f}"
+                f"  •  Migliore: {totals['best_streak']}",
+                (SCREEN_WIDTH // 2, 420), 'tiny', COLORS['muted'], center=True)
+        
         # Highscore
-        if self.highscore.is_high_score(player_score):
+        if self.highscore.is_high_score(player_score, *GAME_SETTINGS.get_highscore_board()):
             pulse = 0.5 + 0.5 * math.sin(self.animation_time * 5)
             glow_color = tuple(int(c * pulse) for c in COLORS['success'])
             self.renderer.draw_text("★ NUOVO RECORD! ★", (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100), 
@@ -671,6 +870,48 @@ class ScreenManager:
     
     def _render_highscore(self, frame, gesture: str):
         """Renderizza la classifica."""
+        self._draw_layers(self._highscore_layers(frame, gesture))
+    
+    def _highscore_layers(self, frame, gesture: str):
+        """Livelli della classifica: solo camera e indicatore del gesto sono dinamici."""
+        camera_pos, camera_size = (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 80), (110, 80)
+        gesture_pos = (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 130)
+        
+        def draw_camera():
+            if frame is not None:
+                self.renderer.draw_camera_feed(frame, camera_pos, camera_size, COLORS['primary'])
+        
+        regions = [
+            (self._camera_region(camera_pos, camera_size), draw_camera),
+            (self._gesture_indicator_region(gesture_pos),
+             lambda: self.renderer.draw_gesture_indicator(gesture, 1.0, gesture_pos)),
+        ]
+        # Carica (e se serve corregge) la pagina prima di calcolare la chiave del livello
+        self._get_highscore_page()
+        static_key = (self.highscore_filter, self.highscore_page, self.highscore.revision)
+        return static_key, self._draw_highscore_static, regions
+    
+    def _get_highscore_page(self) -> Tuple[List[dict], int]:
+        """
+        Righe della pagina visibile e totale delle voci del filtro.
+        
+        La pagina viene chiesta alla classifica solo quando cambiano filtro,
+        pagina o punteggi: sfogliare legge HIGHSCORE_PAGE_SIZE righe.
+        """
+        key = (self.highscore_filter, self.highscore_page, self.highscore.revision)
+        if key != self._highscore_page_key:
+            self._highscore_page_total = self.highscore.count_scores(self.highscore_filter)
+            # Dopo una cancellazione la pagina può non esistere più: si torna all'ultima
+            last_page = max(0, (self._highscore_page_total - 1) // HIGHSCORE_PAGE_SIZE)
+            self.highscore_page = min(self.highscore_page, last_page)
+            key = (self.highscore_filter, self.highscore_page, self.highscore.revision)
+            self._highscore_page_key = key
+            self._highscore_page_rows = self.highscore.get_page(
+                self.highscore_filter, self.highscore_page * HIGHSCORE_PAGE_SIZE, HIGHSCORE_PAGE_SIZE)
+        return self._highscore_page_rows, self._highscore_page_total
+    
+    def _draw_highscore_static(self):
+        """Disegna titolo, filtri e tabella della classifica."""
         # Titolo
         self.renderer.draw_text("CLASSIFICA", (SCREEN_WIDTH // 2, 35), 
                                'title', COLORS['primary'], center=True, shadow=True)
@@ -701,23 +942,16 @@ class ScreenManager:
             self.renderer.draw_text(label, (x, tab_y), 'tiny', 
                                    COLORS['white'] if selected else COLORS['muted'], center=True)
         
-        # Filtra punteggi
-        if self.highscore_filter == 'all':
-            scores = self.highscore.get_scores()
-        elif self.highscore_filter == 'classic':
-            scores = self.highscore.get_scores(mode='classic')
-        elif self.highscore_filter == 'timed_easy':
-            scores = self.highscore.get_scores(mode='timed', difficulty='easy')
-        elif self.highscore_filter == 'timed_medium':
-            scores = self.highscore.get_scores(mode='timed', difficulty='medium')
-        elif self.highscore_filter == 'timed_hard':
-            scores = self.highscore.get_scores(mode='timed', difficulty='hard')
-        else:
-            scores = self.highscore.get_scores()
+        # Righe già filtrate e formattate della pagina visibile
+        scores, total = self._get_highscore_page()
         
         # Tabella
         if scores:
             self.renderer.draw_highscore_table_improved(scores, (SCREEN_WIDTH // 2, 120))
+            pages = (total + HIGHSCORE_PAGE_SIZE - 1) // HIGHSCORE_PAGE_SIZE
+            if pages > 1:
+                self.renderer.draw_text(f"Pagina {self.highscore_page + 1}/{pages}  •  {total} punteggi",
+                                       (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 62), 'tiny', COLORS['muted'], center=True)
         else:
             empty_box = pygame.Rect(SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2 - 50, 300, 100)
             pygame.draw.rect(self.renderer.screen, COLORS['card_bg'], empty_box, border_radius=15)
@@ -728,15 +962,8 @@ class ScreenManager:
             self.renderer.draw_text("in questa modalità", (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20), 
                                    'small', COLORS['secondary'], center=True)
         
-        # Camera
-        if frame is not None:
-            self.renderer.draw_camera_feed(frame, (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 80), 
-                                          (110, 80), COLORS['primary'])
-        
-        self.renderer.draw_gesture_indicator(gesture, 1.0, (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 130))
-        
         # Istruzioni
-        self.renderer.draw_text("←→ Filtro  •  INVIO Torna", (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30), 
+        self.renderer.draw_text("←→ Filtro  •  ↑↓ Pagina  •  INVIO Torna", (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30), 
                                'small', COLORS['muted'], center=True)
     
     # =========================================================================
@@ -749,9 +976,13 @@ class ScreenManager:
             self.renderer.emit_confetti(SCREEN_WIDTH // 2, 100, 30)
             self._name_input_particles = True
         
-        # Titolo
-        self.renderer.draw_text("★ NUOVO RECORD! ★", (SCREEN_WIDTH // 2, 80), 
-                               'title', COLORS['success'], center=True, shadow=True, glow=True)
+        # Titolo (con il backend SQLite si registrano anche i punteggi fuori dal podio)
+        if self.state.get_data('record', True):
+            self.renderer.draw_text("★ NUOVO RECORD! ★", (SCREEN_WIDTH // 2, 80), 
+                                   'title', COLORS['success'], center=True, shadow=True, glow=True)
+        else:
+            self.renderer.draw_text("PARTITA REGISTRATA", (SCREEN_WIDTH // 2, 80), 
+                                   'title', COLORS['primary'], center=True, shadow=True)
         
         self.renderer.draw_text("Inserisci il tuo nome (max 5 caratteri)", 
                                (SCREEN_WIDTH // 2, 140), 'medium', COLORS['white'], center=True)
@@ -777,6 +1008,28 @@ class ScreenManager:
     
     def _render_settings(self, frame, gesture: str):
         """Renderizza le impostazioni."""
+        self._draw_layers(self._settings_layers(frame, gesture))
+    
+    def _settings_layers(self, frame, gesture: str):
+        """Livelli delle impostazioni: solo camera e indicatore del gesto sono dinamici."""
+        camera_pos, camera_size = (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 80), (110, 80)
+        gesture_pos = (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 130)
+        
+        def draw_camera():
+            if frame is not None:
+                self.renderer.draw_camera_feed(frame, camera_pos, camera_size, COLORS['primary'])
+        
+        regions = [
+            (self._camera_region(camera_pos, camera_size), draw_camera),
+            (self._gesture_indicator_region(gesture_pos),
+             lambda: self.renderer.draw_gesture_indicator(gesture, 1.0, gesture_pos)),
+        ]
+        values = tuple(getattr(GAME_SETTINGS, option['key'], None) for option in self.settings_options)
+        static_key = (self.settings_selection, values, GAME_SETTINGS.get_camera_name())
+        return static_key, self._draw_settings_static, regions
+    
+    def _draw_settings_static(self):
+        """Disegna titolo e voci delle impostazioni."""
         # Titolo
         self.renderer.draw_text("IMPOSTAZIONI", (SCREEN_WIDTH // 2, 45), 
                                'title', COLORS['primary'], center=True, shadow=True)
@@ -838,13 +1091,6 @@ class ScreenManager:
             
             y += 48
         
-        # Camera
-        if frame is not None:
-            self.renderer.draw_camera_feed(frame, (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 80), 
-                                          (110, 80), COLORS['primary'])
-        
-        self.renderer.draw_gesture_indicator(gesture, 1.0, (SCREEN_WIDTH - 80, SCREEN_HEIGHT - 130))
-        
         # Istruzioni
         self.renderer.draw_text("↑↓ Scorri  •  ←→ Modifica  •  INVIO Conferma  •  R Aggiorna camera", 
                                (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30), 'tiny', COLORS['muted'], center=True)
@@ -855,13 +1101,22 @@ class ScreenManager:
     
     def _render_camera_error(self):
         """Renderizza errore camera."""
-        # Titolo
-        pulse = 0.7 + 0.3 * math.sin(self.animation_time * 4)
-        error_color = tuple(int(c * pulse) for c in COLORS['danger'])
-        
-        self.renderer.draw_text("ERRORE CAMERA", (SCREEN_WIDTH // 2, 70), 
-                               'title', error_color, center=True, shadow=True)
-        
+        self._draw_layers(self._camera_error_layers())
+    
+    def _camera_error_layers(self):
+        """Livelli dell'errore camera: solo il titolo pulsante è dinamico."""
+        def draw_title():
+            pulse = 0.7 + 0.3 * math.sin(self.animation_time * 4)
+            error_color = tuple(int(c * pulse) for c in COLORS['danger'])
+            self.renderer.draw_text("ERRORE CAMERA", (SCREEN_WIDTH // 2, 70), 
+                                   'title', error_color, center=True, shadow=True)
+        
+        regions = [(self._text_region("ERRORE CAMERA", 'title', (SCREEN_WIDTH // 2, 70)), draw_title)]
+        static_key = (self.camera_error_selection, tuple(self.available_cameras))
+        return static_key, self._draw_camera_error_static, regions
+    
+    def _draw_camera_error_static(self):
+        """Disegna il messaggio e la lista delle camera disponibili."""
         self.renderer.draw_text("Camera disconnessa o non disponibile", 
                                (SCREEN_WIDTH // 2, 120), 'medium', COLORS['white'], center=True)
         
@@ -1012,11 +1267,23 @@ class ScreenManager:
         filters = ['all', 'classic', 'timed_easy', 'timed_medium', 'timed_hard']
         current_idx = filters.index(self.highscore_filter)
         self.highscore_filter = filters[(current_idx - 1) % len(filters)]
+        self.highscore_page = 0
     
     def highscore_filter_right(self):
         filters = ['all', 'classic', 'timed_easy', 'timed_medium', 'timed_hard']
         current_idx = filters.index(self.highscore_filter)
         self.highscore_filter = filters[(current_idx + 1) % len(filters)]
+        self.highscore_page = 0
+    
+    def highscore_page_up(self):
+        if self.highscore_page > 0:
+            self.highscore_page -= 1
+    
+    def highscore_page_down(self):
+        # Pagine in sequenza: la classifica riparte dall'ultima riga letta
+        _, total = self._get_highscore_page()
+        if (self.highscore_page + 1) * HIGHSCORE_PAGE_SIZE < total:
+            self.highscore_page += 1
     
     def set_available_cameras(self, cameras: list):
         self.available_cameras = cameras